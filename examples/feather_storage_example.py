@@ -0,0 +1,11 @@
+from nba_api_wrapper.generator import GameStorer
+from nba_api_wrapper.storer.file_storer import FileStorer
+
+
+
+storer = FileStorer(base_path="data", pickle=False)
+game_storer = GameStorer(storer=storer, store_frequency=25, newest_games_only=True)
+game_storer.generate(min_date="2019-10-16",
+                     max_date='2021-11-29')
+
+possessions = storer.load_possessions(min_date="2021-11-01", columns=["game_id", "team_id_offense", "points"])
@@ -0,0 +1,8 @@
+from nba_api_wrapper.generator import GameStorer
+from nba_api_wrapper.storer.parquet_storer import ParquetStorer
+
+
+
+game_storer = GameStorer(storer=ParquetStorer(base_path="data"), store_frequency=25, newest_games_only=True)
+game_storer.generate(min_date="2019-10-16",
+                     max_date='2021-11-29')
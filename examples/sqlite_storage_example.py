@@ -0,0 +1,11 @@
+from nba_api_wrapper.generator import GameStorer
+from nba_api_wrapper.storer.sql_scorer import SQLiteStorer
+
+
+
+storer = SQLiteStorer(database_path="nba.db")
+game_storer = GameStorer(storer=storer, store_frequency=25, newest_games_only=True)
+game_storer.generate(min_date="2019-10-16",
+                     max_date='2021-11-29')
+
+game_players = storer.load_game_players(player_ids=[201939], min_date="2021-10-19")
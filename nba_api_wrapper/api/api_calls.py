@@ -1,14 +1,17 @@
-import time
 from dataclasses import dataclass
+from typing import Optional
 
 import pandas as pd
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP
 from nba_api.stats.endpoints import LeagueGameFinder, BoxScoreTraditionalV2, PlayByPlayV2, GameRotation, \
     BoxScoreAdvancedV2
 
 from nba_api_wrapper.api.api_throttle import APIThrottle
-from nba_api_wrapper.api.decorators import retry_on_error
-
-api_throttle = APIThrottle(interval_seconds=60, max_calls_per_interval=10)
+from nba_api_wrapper.api.decorators import retry_on_error, throttled, cached
+from nba_api_wrapper.api.http_session import create_session, install_retryable_status_hook
+from nba_api_wrapper.api.response_cache import ResponseCache
+from nba_api_wrapper.api.retry import RetryPolicy, CircuitBreaker
 
 @dataclass
 class BoxscoreData:
@@ -24,71 +27,87 @@ class BoxscoreAdvancedV2Data:
 class NBAApi:
 
     def __init__(self,
-                 max_calls_per_interval: int = 8,
-                 interval_seconds: int = 20,
+                 max_calls_per_interval: int = 10,
+                 interval_seconds: int = 60,
+                 burst: Optional[int] = None,
+                 throttle_state_path: Optional[str] = None,
+                 api_throttle: Optional[APIThrottle] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 session: Optional[requests.Session] = None,
+                 pool_maxsize: int = 10,
+                 connect_timeout: float = 10,
+                 read_timeout: float = 30,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
                  ):
         self.max_calls_per_interval = max_calls_per_interval
         self.interval_seconds = interval_seconds
+        self.api_throttle = api_throttle or APIThrottle(interval_seconds=interval_seconds,
+                                                        max_calls_per_interval=max_calls_per_interval,
+                                                        burst=burst,
+                                                        state_path=throttle_state_path)
+        self.response_cache = response_cache
+        self.session = install_retryable_status_hook(session or create_session(pool_maxsize=pool_maxsize))
+        self._session_installed = False
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
         self._game_ids = None
-        self._interval_begin_time = None
-        self._interval_counts = 0
 
-    @retry_on_error
-    @api_throttle
+    @cached(endpoint="LeagueGameFinder")
+    @retry_on_error(endpoint="LeagueGameFinder")
+    @throttled
     def get_league_game_finder_data(self, min_date: str, max_date: str) -> pd.DataFrame:
-        self._api_calls_counter()
-
-        league_game_finder_data = LeagueGameFinder(
+        league_game_finder_data = self._request(
+            LeagueGameFinder,
             date_from_nullable=min_date,
             date_to_nullable=max_date)
 
         return league_game_finder_data.get_data_frames()[0]
 
-    @retry_on_error
-    @api_throttle
+    @cached(endpoint="PlayByPlayV2")
+    @retry_on_error(endpoint="PlayByPlayV2")
+    @throttled
     def get_play_by_play_by_game_id(self, game_id: int) -> pd.DataFrame:
-        play_by_play_data = PlayByPlayV2(game_id=game_id)
+        play_by_play_data = self._request(PlayByPlayV2, game_id=game_id)
         return play_by_play_data.get_data_frames()[0]
 
-    @retry_on_error
-    @api_throttle
+    @cached(endpoint="GameRotation")
+    @retry_on_error(endpoint="GameRotation")
+    @throttled
     def get_rotations_by_game_id(self, game_id: int) -> list[pd.DataFrame]:
-        rotation_data = GameRotation(game_id=game_id)
+        rotation_data = self._request(GameRotation, game_id=game_id)
         return rotation_data.get_data_frames()
 
-    @retry_on_error
-    @api_throttle
+    @cached(endpoint="BoxScoreTraditionalV2")
+    @retry_on_error(endpoint="BoxScoreTraditionalV2")
+    @throttled
     def get_boxscore_by_game_id(self, game_id: int) -> BoxscoreData:
-        boxscore_traditional_v2_data = BoxScoreTraditionalV2(game_id=game_id)
+        boxscore_traditional_v2_data = self._request(BoxScoreTraditionalV2, game_id=game_id)
         box_score_trad_dfs = boxscore_traditional_v2_data.get_data_frames()
         return BoxscoreData(player_data=box_score_trad_dfs[0].fillna(0), team_data=box_score_trad_dfs[1].fillna(0))
 
 
-    @retry_on_error
-    @api_throttle
+    @cached(endpoint="BoxScoreAdvancedV2")
+    @retry_on_error(endpoint="BoxScoreAdvancedV2")
+    @throttled
     def boxscore_advanced_v2_by_game_id(self, game_id: int) -> BoxscoreAdvancedV2Data:
-        boxscore_advanced_v2_data = BoxScoreAdvancedV2(game_id=game_id)
+        boxscore_advanced_v2_data = self._request(BoxScoreAdvancedV2, game_id=game_id)
         box_score_adv_dfs = boxscore_advanced_v2_data.get_data_frames()
 
         return BoxscoreAdvancedV2Data(player_data=box_score_adv_dfs[0].fillna(0), team_data=box_score_adv_dfs[1].fillna(0))
 
 
+    def _request(self, endpoint_class, **parameters):
+        if not self._session_installed:
+            # nba_api endpoints can not take a session per request, they all share one class-wide session. Installing
+            # it replaces the session (and its retryable status hook) for every nba_api caller in the process, so it
+            # is only done once this instance actually sends a request, and the last NBAApi to do so is the one used.
+            NBAStatsHTTP.set_session(self.session)
+            self._session_installed = True
+        return endpoint_class(timeout=(self.connect_timeout, self.read_timeout), **parameters)
+
     @property
     def game_ids(self) -> list[int]:
         return self._game_ids
-
-    def _api_calls_counter(self):
-
-        current_time = time.time()
-
-        if self._interval_begin_time is None:
-            self._interval_counts = 1
-            self._interval_begin_time = current_time
-            return
-        if current_time - self._interval_begin_time < self.interval_seconds:
-            self._interval_counts += 1
-            if self._interval_counts > self.max_calls_per_interval:
-                sleep_seconds = 60 - (current_time - self._interval_begin_time)
-                time.sleep(sleep_seconds)
-                self._interval_counts = 0
-                self._interval_begin_time = time.time()
@@ -1,31 +1,86 @@
+import sqlite3
+import threading
 import time
+from typing import Optional
+
 
 class APIThrottle:
-    def __init__(self, interval_seconds, max_calls_per_interval):
+
+    def __init__(self,
+                 interval_seconds: float,
+                 max_calls_per_interval: int,
+                 burst: Optional[int] = None,
+                 state_path: Optional[str] = None,
+                 name: str = "nba_stats",
+                 ):
         self.interval_seconds = interval_seconds
         self.max_calls_per_interval = max_calls_per_interval
-        self._interval_begin_time = None
-        self._interval_counts = 0
+        self.burst = burst if burst is not None else max_calls_per_interval
+        self.state_path = state_path
+        self.name = name
+        self._refill_rate = max_calls_per_interval / interval_seconds
+        self._tokens = float(self.burst)
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+        if self.state_path is not None:
+            self._create_state_table()
 
-    def __call__(self, func):
-        def wrapper(instance, *args, **kwargs):
-            self._api_calls_counter()
-            return func(instance, *args, **kwargs)
+    def acquire(self) -> None:
+        with self._lock:
+            if self.state_path is None:
+                wait_seconds = self._reserve_token_in_memory()
+            else:
+                wait_seconds = self._reserve_token_in_state_file()
 
-        return wrapper
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
 
-    def _api_calls_counter(self):
+    def _reserve_token(self, tokens: float, updated_at: float, current_time: float) -> tuple[float, float]:
+        tokens = min(float(self.burst), tokens + max(0.0, current_time - updated_at) * self._refill_rate)
+        tokens -= 1
+        wait_seconds = -tokens / self._refill_rate if tokens < 0 else 0
+        return tokens, wait_seconds
+
+    def _reserve_token_in_memory(self) -> float:
         current_time = time.time()
+        self._tokens, wait_seconds = self._reserve_token(tokens=self._tokens, updated_at=self._updated_at,
+                                                         current_time=current_time)
+        self._updated_at = current_time
+        return wait_seconds
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.state_path, timeout=60, isolation_level=None)
+
+    def _create_state_table(self) -> None:
+        connection = self._connect()
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS token_bucket (name TEXT PRIMARY KEY, tokens REAL, updated_at REAL)")
+        finally:
+            connection.close()
+
+    def _reserve_token_in_state_file(self) -> float:
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            current_time = time.time()
+            row = connection.execute("SELECT tokens, updated_at FROM token_bucket WHERE name = ?",
+                                     (self.name,)).fetchone()
+            if row is None:
+                tokens, updated_at = float(self.burst), current_time
+            else:
+                tokens, updated_at = row
+
+            tokens, wait_seconds = self._reserve_token(tokens=tokens, updated_at=updated_at,
+                                                       current_time=current_time)
+            connection.execute("INSERT OR REPLACE INTO token_bucket (name, tokens, updated_at) VALUES (?, ?, ?)",
+                               (self.name, tokens, current_time))
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
 
-        if self._interval_begin_time is None:
-            self._interval_counts = 1
-            self._interval_begin_time = current_time
-            return
-
-        if current_time - self._interval_begin_time < self.interval_seconds:
-            self._interval_counts += 1
-            if self._interval_counts > self.max_calls_per_interval:
-                sleep_seconds = 60 - (current_time - self._interval_begin_time)
-                time.sleep(sleep_seconds)
-                self._interval_counts = 0
-                self._interval_begin_time = time.time()
\ No newline at end of file
+        return wait_seconds
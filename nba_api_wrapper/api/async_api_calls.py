@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import itertools
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Iterator, Optional
+
+import pandas as pd
+
+from nba_api_wrapper.api.api_calls import NBAApi, BoxscoreData, BoxscoreAdvancedV2Data
+from nba_api_wrapper.datastructures import RawGameData
+
+
+class AsyncNBAApi:
+
+    def __init__(self,
+                 nba_api: Optional[NBAApi] = None,
+                 max_concurrent_requests: int = 8,
+                 ):
+        self.nba_api = nba_api or NBAApi()
+        self.max_concurrent_requests = max_concurrent_requests
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_requests)
+
+    async def _run(self, func: Callable, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, **kwargs))
+
+    async def get_play_by_play_by_game_id(self, game_id: int) -> pd.DataFrame:
+        return await self._run(self.nba_api.get_play_by_play_by_game_id, game_id=game_id)
+
+    async def get_rotations_by_game_id(self, game_id: int) -> list[pd.DataFrame]:
+        return await self._run(self.nba_api.get_rotations_by_game_id, game_id=game_id)
+
+    async def get_boxscore_by_game_id(self, game_id: int) -> BoxscoreData:
+        return await self._run(self.nba_api.get_boxscore_by_game_id, game_id=game_id)
+
+    async def boxscore_advanced_v2_by_game_id(self, game_id: int) -> BoxscoreAdvancedV2Data:
+        return await self._run(self.nba_api.boxscore_advanced_v2_by_game_id, game_id=game_id)
+
+    async def get_game_data(self, game_id: int) -> RawGameData:
+        boxscore, boxscore_adv, play_by_plays, team_rotations = await asyncio.gather(
+            self.get_boxscore_by_game_id(game_id=game_id),
+            self.boxscore_advanced_v2_by_game_id(game_id=game_id),
+            self.get_play_by_play_by_game_id(game_id=game_id),
+            self.get_rotations_by_game_id(game_id=game_id),
+        )
+        return RawGameData(
+            game_id=game_id,
+            boxscore=boxscore,
+            boxscore_adv=boxscore_adv,
+            play_by_plays=play_by_plays,
+            team_rotations=team_rotations,
+        )
+
+    async def get_games_data(self, game_ids: list[int]) -> list[RawGameData]:
+        games_data = await asyncio.gather(*[self.get_game_data(game_id=game_id) for game_id in game_ids],
+                                          return_exceptions=True)
+        raw_games = []
+        for game_id, game_data in zip(game_ids, games_data):
+            if isinstance(game_data, Exception):
+                logging.warning(f"gameid {game_id} failed to fetch, error: {game_data}")
+                continue
+            raw_games.append(game_data)
+        return raw_games
+
+    def iter_games_data(self, game_ids: list[int], max_pending_games: int) -> Iterator[RawGameData]:
+        # requests are queued game by game on the shared executor, so earlier games are fetched first and each game is
+        # yielded as soon as its own requests are done
+        unsubmitted_game_ids = iter(game_ids)
+        pending_games = deque()
+        try:
+            for game_id in itertools.islice(unsubmitted_game_ids, max_pending_games):
+                pending_games.append((game_id, self._submit_game_requests(game_id=game_id)))
+
+            while pending_games:
+                game_id, game_requests = pending_games.popleft()
+                for next_game_id in itertools.islice(unsubmitted_game_ids, 1):
+                    pending_games.append((next_game_id, self._submit_game_requests(game_id=next_game_id)))
+                try:
+                    boxscore, boxscore_adv, play_by_plays, team_rotations = [request.result()
+                                                                             for request in game_requests]
+                except Exception as e:
+                    logging.warning(f"gameid {game_id} failed to fetch, error: {e}")
+                    continue
+                yield RawGameData(
+                    game_id=game_id,
+                    boxscore=boxscore,
+                    boxscore_adv=boxscore_adv,
+                    play_by_plays=play_by_plays,
+                    team_rotations=team_rotations,
+                )
+        finally:
+            for _, game_requests in pending_games:
+                for request in game_requests:
+                    request.cancel()
+
+    def _submit_game_requests(self, game_id: int) -> list[Future]:
+        return [self._executor.submit(request, game_id=game_id) for request in (
+            self.nba_api.get_boxscore_by_game_id,
+            self.nba_api.boxscore_advanced_v2_by_game_id,
+            self.nba_api.get_play_by_play_by_game_id,
+            self.nba_api.get_rotations_by_game_id,
+        )]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def run_sync(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
@@ -1,33 +1,82 @@
-import json
+import functools
+import inspect
+import logging
 import time
 
-import requests
+from nba_api_wrapper.api.retry import is_retryable_error, is_upstream_response_error
 
 
+def cached(endpoint: str):
+    def decorator(func):
+        signature = inspect.signature(func)
 
+        @functools.wraps(func)
+        def wrapper(instance, *args, **kwargs):
+            if instance.response_cache is None:
+                return func(instance, *args, **kwargs)
 
-def retry_on_error(func):
-    def wrapper(*args, **kwargs):
-        json_decode_delay = 20
-        read_time_out_delay = 60
-        retry_attempts = 1
-        attempts = 0
-        while attempts <= retry_attempts:
-            try:
-                return func(*args, **kwargs)
+            parameters = signature.bind(instance, *args, **kwargs).arguments
+            parameters.pop(next(iter(signature.parameters)))
+            response = instance.response_cache.get(endpoint=endpoint, parameters=parameters)
+            if response is not None:
+                return response
 
-            except requests.exceptions.ReadTimeout:
-                if attempts < retry_attempts:
-                    print(f"Read Timeout encountered. Retrying attempt {attempts + 1} in {read_time_out_delay} seconds...")
-                    time.sleep(read_time_out_delay)
-                    attempts += 1
+            response = func(instance, *args, **kwargs)
+            if response is not None:
+                instance.response_cache.set(endpoint=endpoint, parameters=parameters, value=response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def throttled(func):
+    @functools.wraps(func)
+    def wrapper(instance, *args, **kwargs):
+        instance.api_throttle.acquire()
+        return func(instance, *args, **kwargs)
 
-            except json.decoder.JSONDecodeError:
-                if attempts < retry_attempts:
-                    print(f"Json Decode encountered. Retrying attempt {attempts + 1} in {json_decode_delay} seconds...")
-                    time.sleep(json_decode_delay)
-                    attempts += 1
-                else:
-                    print(f"Max retry attempts reached. Failing after {retry_attempts} attempts.")
-                    raise
     return wrapper
+
+
+def retry_on_error(endpoint: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(instance, *args, **kwargs):
+            retry_policy = instance.retry_policy
+            circuit_breaker = instance.circuit_breaker
+            attempt = 1
+            while True:
+                circuit_breaker.before_call()
+                try:
+                    response = func(instance, *args, **kwargs)
+                except Exception as e:
+                    if not is_retryable_error(e):
+                        # only an actual upstream response says anything about its health, other errors (parsing,
+                        # bugs in the caller) leave the failure count alone and just hand a half-open trial back
+                        if is_upstream_response_error(e):
+                            circuit_breaker.record_success()
+                        else:
+                            circuit_breaker.release_trial()
+                        raise
+                    circuit_breaker.record_failure()
+                    if attempt >= retry_policy.max_attempts:
+                        logging.warning(f"{endpoint} failed after {attempt} attempts, error: {e}")
+                        raise
+                    if not retry_policy.consume_retry_budget(endpoint=endpoint):
+                        logging.warning(f"{endpoint} retry budget exhausted, error: {e}")
+                        raise
+
+                    delay_seconds = retry_policy.get_delay_seconds(attempt=attempt, error=e)
+                    logging.info(f"{endpoint} {type(e).__name__} encountered. "
+                                 f"Retrying attempt {attempt} in {delay_seconds:.1f} seconds...")
+                    time.sleep(delay_seconds)
+                    attempt += 1
+                else:
+                    circuit_breaker.record_success()
+                    return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,24 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from nba_api_wrapper.api.retry import RETRYABLE_STATUS_CODES
+
+
+def _raise_for_retryable_status(response: requests.Response, *args, **kwargs) -> None:
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        response.raise_for_status()
+
+
+def install_retryable_status_hook(session: requests.Session) -> requests.Session:
+    if _raise_for_retryable_status not in session.hooks["response"]:
+        session.hooks["response"].append(_raise_for_retryable_status)
+    return session
+
+
+def create_session(pool_connections: int = 1, pool_maxsize: int = 10) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0,
+                          pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return install_retryable_status_hook(session)
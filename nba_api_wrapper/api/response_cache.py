@@ -0,0 +1,128 @@
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import uuid
+import zlib
+from typing import Any, Optional
+
+import pandas as pd
+
+DEFAULT_TTL_SECONDS = {
+    "LeagueGameFinder": 6 * 60 * 60,
+}
+
+
+class ResponseCache:
+
+    def __init__(self,
+                 base_path: str = "nba_api_cache",
+                 max_size_bytes: Optional[int] = 2 * 1024 ** 3,
+                 ttl_seconds: Optional[dict[str, Optional[float]]] = None,
+                 ):
+        self.base_path = base_path
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = DEFAULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        os.makedirs(self.base_path, exist_ok=True)
+        self._index_path = os.path.join(self.base_path, "index.sqlite")
+        self._create_index_table()
+
+    @staticmethod
+    def key(endpoint: str, parameters: dict[str, Any]) -> str:
+        serialized_parameters = json.dumps(parameters, sort_keys=True, default=str)
+        return hashlib.sha1(f"{endpoint}:{serialized_parameters}".encode()).hexdigest()
+
+    def get(self, endpoint: str, parameters: dict[str, Any]) -> Optional[Any]:
+        key = self.key(endpoint=endpoint, parameters=parameters)
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT file_name, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            file_name, created_at = row
+            ttl = self.ttl_seconds.get(endpoint)
+            current_time = time.time()
+            if ttl is not None and current_time - created_at > ttl:
+                self._delete_entry(connection=connection, key=key, file_name=file_name)
+                return None
+
+            try:
+                value = pd.read_pickle(os.path.join(self.base_path, file_name), compression="gzip")
+            except (FileNotFoundError, EOFError, gzip.BadGzipFile, zlib.error, pickle.UnpicklingError):
+                self._delete_entry(connection=connection, key=key, file_name=file_name)
+                return None
+
+            connection.execute("UPDATE entries SET last_accessed_at = ? WHERE key = ?", (current_time, key))
+            return value
+        finally:
+            connection.close()
+
+    def set(self, endpoint: str, parameters: dict[str, Any], value: Any) -> None:
+        key = self.key(endpoint=endpoint, parameters=parameters)
+        file_name = f"{key}.pickle.gz"
+        tmp_path = os.path.join(self.base_path, f"{file_name}.{uuid.uuid4().hex}.tmp")
+        pd.to_pickle(value, tmp_path, compression={"method": "gzip", "compresslevel": 1})
+        os.replace(tmp_path, os.path.join(self.base_path, file_name))
+        size_bytes = os.path.getsize(os.path.join(self.base_path, file_name))
+
+        current_time = time.time()
+        connection = self._connect()
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, endpoint, file_name, size_bytes, created_at, last_accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, file_name, size_bytes, current_time, current_time))
+            self._evict(connection=connection)
+        finally:
+            connection.close()
+
+    def clear(self, endpoint: Optional[str] = None) -> None:
+        connection = self._connect()
+        try:
+            if endpoint is None:
+                rows = connection.execute("SELECT key, file_name FROM entries").fetchall()
+            else:
+                rows = connection.execute("SELECT key, file_name FROM entries WHERE endpoint = ?",
+                                          (endpoint,)).fetchall()
+            for key, file_name in rows:
+                self._delete_entry(connection=connection, key=key, file_name=file_name)
+        finally:
+            connection.close()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        if self.max_size_bytes is None:
+            return
+        total_size_bytes = connection.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+        if total_size_bytes <= self.max_size_bytes:
+            return
+
+        rows = connection.execute(
+            "SELECT key, file_name, size_bytes FROM entries ORDER BY last_accessed_at ASC").fetchall()
+        for key, file_name, size_bytes in rows:
+            if total_size_bytes <= self.max_size_bytes:
+                break
+            self._delete_entry(connection=connection, key=key, file_name=file_name)
+            total_size_bytes -= size_bytes
+
+    def _delete_entry(self, connection: sqlite3.Connection, key: str, file_name: str) -> None:
+        connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(os.path.join(self.base_path, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._index_path, timeout=60, isolation_level=None)
+
+    def _create_index_table(self) -> None:
+        connection = self._connect()
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, endpoint TEXT, file_name TEXT, size_bytes INTEGER, "
+                "created_at REAL, last_accessed_at REAL)")
+        finally:
+            connection.close()
@@ -0,0 +1,136 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+import requests
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def is_retryable_error(error: Exception) -> bool:
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.Timeout,
+                              requests.exceptions.ConnectionError,
+                              json.decoder.JSONDecodeError))
+
+
+def is_upstream_response_error(error: Exception) -> bool:
+    return isinstance(error, requests.exceptions.HTTPError) and error.response is not None
+
+
+def get_retry_after_seconds(error: Exception) -> Optional[float]:
+    if not isinstance(error, requests.exceptions.HTTPError) or error.response is None:
+        return None
+    retry_after = error.response.headers.get("Retry-After")
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay_seconds: float = 2
+    max_delay_seconds: float = 120
+    multiplier: float = 2
+    jitter: float = 0.5
+    retry_budgets: dict[str, int] = field(default_factory=dict)
+    retry_budget_window_seconds: float = 600
+    _retry_times: dict[str, deque] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def get_delay_seconds(self, attempt: int, error: Optional[Exception] = None) -> float:
+        delay_seconds = min(self.max_delay_seconds, self.base_delay_seconds * self.multiplier ** (attempt - 1))
+        delay_seconds *= 1 - self.jitter * random.random()
+        retry_after_seconds = get_retry_after_seconds(error) if error is not None else None
+        if retry_after_seconds is not None:
+            delay_seconds = max(delay_seconds, retry_after_seconds)
+        return delay_seconds
+
+    def consume_retry_budget(self, endpoint: str) -> bool:
+        if endpoint not in self.retry_budgets:
+            return True
+
+        with self._lock:
+            current_time = time.time()
+            retry_times = self._retry_times.setdefault(endpoint, deque())
+            while retry_times and current_time - retry_times[0] > self.retry_budget_window_seconds:
+                retry_times.popleft()
+            if len(retry_times) >= self.retry_budgets[endpoint]:
+                return False
+            retry_times.append(current_time)
+            return True
+
+
+class CircuitBreaker:
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 cooldown_seconds: float = 120,
+                 max_cooldown_seconds: float = 900,
+                 pause_when_open: bool = True,
+                 ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.pause_when_open = pause_when_open
+        self._consecutive_failures = 0
+        self._current_cooldown_seconds = cooldown_seconds
+        self._opened_at: Optional[float] = None
+        self._trial_in_progress = False
+        self._condition = threading.Condition()
+
+    @property
+    def is_open(self) -> bool:
+        with self._condition:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        with self._condition:
+            while self._opened_at is not None:
+                remaining_seconds = self._opened_at + self._current_cooldown_seconds - time.time()
+                if remaining_seconds <= 0 and not self._trial_in_progress:
+                    self._trial_in_progress = True
+                    return
+                if not self.pause_when_open:
+                    raise CircuitOpenError(f"circuit open, upstream unavailable for "
+                                           f"{max(remaining_seconds, 0):.0f}s more")
+                self._condition.wait(timeout=remaining_seconds if remaining_seconds > 0 else None)
+
+    def record_success(self) -> None:
+        with self._condition:
+            self._consecutive_failures = 0
+            self._current_cooldown_seconds = self.cooldown_seconds
+            self._opened_at = None
+            self._trial_in_progress = False
+            self._condition.notify_all()
+
+    def release_trial(self) -> None:
+        with self._condition:
+            self._trial_in_progress = False
+            self._condition.notify_all()
+
+    def record_failure(self) -> None:
+        with self._condition:
+            self._consecutive_failures += 1
+            if self._trial_in_progress:
+                self._current_cooldown_seconds = min(self.max_cooldown_seconds, self._current_cooldown_seconds * 2)
+                self._opened_at = time.time()
+                self._trial_in_progress = False
+                logging.warning(f"upstream still failing, pausing requests for {self._current_cooldown_seconds}s")
+            elif self._opened_at is None and self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = time.time()
+                logging.warning(f"{self._consecutive_failures} consecutive failed requests, "
+                                f"pausing requests for {self._current_cooldown_seconds}s")
+            self._condition.notify_all()
@@ -113,6 +113,8 @@ class PlayByPlay2Names:
     HOMEDESCRIPTION = "HOMEDESCRIPTION"
     VISITORDESCRIPTION = "VISITORDESCRIPTION"
     NEUTRALDESCRIPTION = "NEUTRALDESCRIPTION"
+    PERIOD = "PERIOD"
+    PCTIMESTRING = "PCTIMESTRING"
     SECONDS_PLAYED = "SECONDS_PLAYED"
     SCORE = "SCORE"
     PLAYER1_ID = "PLAYER1_ID"
@@ -127,6 +129,10 @@ class PlayByPlay2Names:
     EVENTNUM = "EVENTNUM"
     POSSESSION_ID = "possession_id"
     POSSESSION_ATTEMPT_ID = "possession_attempt_id"
+    DESCRIPTION = "description"
+    PLAY_TYPE = "play_type"
+    HOME_PLAY_TYPE = "home_play_type"
+    VISITOR_PLAY_TYPE = "visitor_play_type"
 
 
 @dataclass
@@ -137,8 +143,8 @@ class ShotPlaysNames:
     SCORE_OPPONENT = "SCORE_OPPONENT"
     TEAM_ID = "TEAM_ID"
     PLAYER_ID = "PLAYER_ID"
-    LINEUP = "LINEUP"
-    LINEUP_OPPONENT = "LINEUP_OPPONENT"
+    LINEUP_ID = "LINEUP_ID"
+    LINEUP_ID_OPPONENT = "LINEUP_ID_OPPONENT"
     SHOT_DISTANCE = "DISTANCE"
     SUCCESS = "SUCCESS"
     SHOT_TYPE = "SHOT_TYPE"
@@ -189,8 +195,6 @@ class TeamInPlayLineupNames:
     LINEUP_ID = "lineup_id"
     LINEUP_ID_OPPONENT = "lineup_id_opponent"
     SECONDS_PLAYED_END = "seconds_played_end"
-    LINEUP = "lineup"
-    LINEUP_OPPONENT = "lineup_opponent"
     INPLAY_ID = "inplay_id"
 
 
@@ -213,6 +217,8 @@ class LineupPlayByPlaysNames:
     INPLAY_ID = "inplay_id"
     PLAY_END_REASON = "play_end_reason"
 
+    PRIMARY_KEY = (GAME_ID, POSSESSION_ID, TEAM_ID_OFFENSE)
+
 
 
 @dataclass
@@ -250,6 +256,8 @@ class PlayerOffensePlayByPlaysNames:
     FREE_THROWS_ATTEMPTED = "player_free_throws_attempted"
     FREE_THROWS_MADE = "player_free_throws_made"
 
+    PRIMARY_KEY = (GAME_ID, POSSESSION_ID, TEAM_ID, PLAYER_ID)
+
 
 @dataclass
 class PlayerDefensePlayByPlaysNames:
@@ -262,6 +270,8 @@ class PlayerDefensePlayByPlaysNames:
     STEALS = "player_steals"
     FOULS = "player_fouls"
 
+    PRIMARY_KEY = (GAME_ID, POSSESSION_ID, TEAM_ID, PLAYER_ID)
+
 
 @dataclass
 class GamePlayerNames:
@@ -298,6 +308,8 @@ class GamePlayerNames:
     AST_TOV = "ast_tov"
     AST_RATIO = "ast_ratio"
 
+    PRIMARY_KEY = (GAME_ID, PLAYER_ID)
+
 
 @dataclass
 class GameTeamNames:
@@ -321,6 +333,8 @@ class GameTeamNames:
     POSS = "possessions"
     PIE = "pie"
 
+    PRIMARY_KEY = (GAME_ID, TEAM_ID)
+
 
 
 @dataclass
@@ -330,8 +344,13 @@ class GameNames:
     MINUTES = "minutes"
     SEASON_ID = "season_id"
 
+    PRIMARY_KEY = (GAME_ID,)
+
 
 @dataclass
 class LineupNames:
     LINEUP_ID = "lineup_id"
-    LINEUP = "lineup"
\ No newline at end of file
+    LINEUP = "lineup"
+    PLAYER_ID = "player_id"
+
+    PRIMARY_KEY = (LINEUP_ID,)
\ No newline at end of file
@@ -4,6 +4,8 @@ from typing import Optional, Literal
 
 import pandas as pd
 
+from nba_api_wrapper.api.api_calls import BoxscoreData, BoxscoreAdvancedV2Data
+
 
 @dataclass
 class GamePlayer:
@@ -41,6 +43,24 @@ class TransformedBoxscore:
     game: pd.DataFrame
 
 
+@dataclass
+class RawGameData:
+    game_id: str
+    boxscore: BoxscoreData
+    boxscore_adv: BoxscoreAdvancedV2Data
+    play_by_plays: pd.DataFrame
+    team_rotations: list[pd.DataFrame]
+
+
+@dataclass
+class RawGamesData:
+    game_ids: list[str]
+    boxscore: BoxscoreData
+    boxscore_adv: BoxscoreAdvancedV2Data
+    play_by_plays: pd.DataFrame
+    team_rotations: pd.DataFrame
+
+
 @dataclass
 class PlayByPlay:
     play_by_plays: pd.DataFrame
@@ -56,6 +76,7 @@ class PlayByPlay:
 @dataclass
 class CollectedData:
     possession_attempts: pd.DataFrame
+    shot_plays: pd.DataFrame
     offense_player_play_by_plays: pd.DataFrame
     defense_player_play_by_plays: pd.DataFrame
     possessions: pd.DataFrame
@@ -1,20 +1,29 @@
 import datetime
+import itertools
 import logging
-from dataclasses import dataclass
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional, Iterable, Iterator
 
-import numpy as np
 import pandas as pd
 
 from nba_api_wrapper.api.api_calls import NBAApi
+from nba_api_wrapper.api.async_api_calls import AsyncNBAApi
 from nba_api_wrapper.config import SUPPORTED_TEAM_NAMES
 from nba_api_wrapper.data_models import PosessionNames, LGFDataNames, GameTeamNames, BoxscoreV2Names, RotationNames, \
-    PlayByPlay2Names, GameNames
-from nba_api_wrapper.datastructures import TransformedBoxscore, PlayByPlay, CollectedData
+    PlayByPlay2Names, GameNames, GamePlayerNames, LineupPlayByPlaysNames, PlayerOffensePlayByPlaysNames, \
+    PlayerDefensePlayByPlaysNames, ShotPlaysNames
+from nba_api_wrapper.datastructures import TransformedBoxscore, PlayByPlay, CollectedData, RawGameData
+from nba_api_wrapper.generators.batch_generators import stack_raw_games_data, \
+    generate_collected_data as generate_batch_collected_data
 from nba_api_wrapper.generators.boxscore_generators import generate_game_team, generate_game_players, generate_game
+from nba_api_wrapper.lineup_registry import LineupRegistry, remap_lineup_ids
+from nba_api_wrapper.schemas import apply_schema
 from nba_api_wrapper.generators.play_by_play_generators import generate_defense_player_play_by_plays, \
     generate_offense_player_play_by_plays, generate_possession_from_attempts, generate_possession_attempts, \
-    generate_inplay_lineups, generate_shot_plays
+    generate_inplay_lineups, generate_shot_plays, classify_play_types, add_rotation_seconds_played, \
+    add_seconds_played
 from nba_api_wrapper.storer.base_storer import Storer
 from nba_api_wrapper.storer.file_storer import FileStorer
 
@@ -34,21 +43,90 @@ class GameStorer():
     def __init__(self,
                  storer: Storer = FileStorer(),
                  store_frequency: int = 20,
-                 nba_api: NBAApi = NBAApi(),
+                 nba_api: Optional[NBAApi] = None,
                  game_team_player_data: bool = True,
                  newest_games_only: bool = False,
                  supported_team_names=SUPPORTED_TEAM_NAMES,
+                 concurrent_requests: int = 1,
+                 prefetch_queue_size: int = 0,
+                 fetch_workers: int = 2,
+                 batch_transform: bool = False,
+                 workers: int = 1,
+                 content_lineup_ids: bool = False,
                  ):
+        if batch_transform and workers > 1:
+            raise ValueError("batch_transform can not be combined with workers > 1")
+        if prefetch_queue_size > 0 and concurrent_requests > 1:
+            raise ValueError("prefetch_queue_size can not be combined with concurrent_requests > 1")
 
         self.store_frequency = store_frequency
 
         self.storer = storer
-        self.nba_api = nba_api
+        self.nba_api = nba_api or NBAApi()
         self.game_team_player_data = game_team_player_data
         self.supported_team_names = supported_team_names
         self.newest_games_only = newest_games_only
+        self.concurrent_requests = concurrent_requests
+        self.prefetch_queue_size = prefetch_queue_size
+        self.fetch_workers = fetch_workers
+        self.batch_transform = batch_transform
+        self.workers = workers
+        self.content_lineup_ids = content_lineup_ids
 
     def generate(self, min_date: Optional[str] = None, max_date: Optional[str] = None) -> None:
+        league_games, remaining_game_ids = self._get_league_games_to_store(min_date=min_date, max_date=max_date)
+
+        logging.info(f"Starting to store {len(remaining_game_ids)} games")
+
+        raw_games = self._iter_raw_games_data(game_ids=remaining_game_ids)
+        remaining_games_count = len(remaining_game_ids)
+        lineup_registry = LineupRegistry(lineups=self.storer.load_lineups(), content_ids=self.content_lineup_ids)
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            while remaining_games_count > 0:
+                collected_data = self._generate_collected_data(
+                    raw_games=itertools.islice(raw_games, self.store_frequency),
+                    lineup_registry=lineup_registry,
+                    league_games=league_games,
+                    executor=executor)
+                if len(collected_data.game) > 0:
+                    self.storer.store(collected_data=collected_data)
+                remaining_games_count = max(0, remaining_games_count - self.store_frequency)
+                logging.info(f"Finished storing, {remaining_games_count} games remaining")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def iter_games(self, min_date: Optional[str] = None, max_date: Optional[str] = None) -> Iterator[CollectedData]:
+        league_games, remaining_game_ids = self._get_league_games_to_store(min_date=min_date, max_date=max_date)
+
+        logging.info(f"Starting to iterate {len(remaining_game_ids)} games")
+
+        lineup_registry = LineupRegistry(lineups=self.storer.load_lineups(), content_ids=self.content_lineup_ids)
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for transformed_boxscore, play_by_play in self._transform_raw_games(
+                    raw_games=self._iter_raw_games_data(game_ids=remaining_game_ids),
+                    league_games=league_games,
+                    lineup_registry=lineup_registry,
+                    executor=executor):
+                yield CollectedData(
+                    possessions=play_by_play.possessions,
+                    game_teams=transformed_boxscore.game_teams,
+                    game_players=transformed_boxscore.game_players,
+                    offense_player_play_by_plays=play_by_play.offense_player_play_by_plays,
+                    defense_player_play_by_plays=play_by_play.defense_player_play_by_plays,
+                    possession_attempts=play_by_play.possession_attempts,
+                    shot_plays=play_by_play.shot_plays,
+                    game=transformed_boxscore.game,
+                    lineups=lineup_registry.export_new_lineups()
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _get_league_games_to_store(self, min_date: Optional[str],
+                                   max_date: Optional[str]) -> tuple[pd.DataFrame, list[str]]:
         if min_date is None:
             min_date_time = datetime.datetime.now() - datetime.timedelta(days=365)
             logging.info(f"min_date not provided, using {min_date_time}")
@@ -70,67 +148,128 @@ class GameStorer():
             stored_game_ids = stored_games[GameNames.GAME_ID].unique().tolist()
             remaining_game_ids = [game_id for game_id in remaining_game_ids if game_id not in stored_game_ids]
 
-        logging.info(f"Starting to store {len(remaining_game_ids)} games")
+        return league_games, remaining_game_ids
+
+    def _generate_collected_data(self, raw_games: Iterable[RawGameData], league_games: pd.DataFrame,
+                                 lineup_registry: LineupRegistry,
+                                 executor: Optional[ProcessPoolExecutor] = None) -> CollectedData:
+        if self.batch_transform:
+            return generate_batch_collected_data(raw_games=stack_raw_games_data(raw_games=raw_games),
+                                                 league_games=league_games,
+                                                 lineup_registry=lineup_registry)
 
-        while len(remaining_game_ids) > 0:
-            game_ids = remaining_game_ids[:self.store_frequency]
-            lineups = self.storer.load_lineups()
-            collected_data = self._generate_collected_data(game_ids=game_ids, lineups=lineups,
-                                                           league_games=league_games)
-            self.storer.store(collected_data=collected_data)
-            remaining_game_ids = remaining_game_ids[self.store_frequency:]
-            logging.info(f"Finished storing, {len(remaining_game_ids)} games remaining")
-
-    def _generate_collected_data(self, game_ids: list[int], league_games: pd.DataFrame,
-                                 lineups: pd.DataFrame) -> CollectedData:
         possessions = []
         game_players = []
         game_teams = []
         offense_player_play_by_plays = []
         defense_player_play_by_plays = []
         possession_attempts = []
+        shot_plays = []
         games = []
-        for game_id in game_ids:
-            print(f"processing gameid {game_id}")
-
-            try:
-                transformed_boxscore = self._generated_transformed_boxscore(game_id=game_id, league_games=league_games)
-            except ValueError as e:
-                logging.warning(f"gameid {game_id} failed to generate boxscore, error: {e}")
-
-            home_team_id = \
-                transformed_boxscore.game_teams[transformed_boxscore.game_teams[GameTeamNames.LOCATION] == 'home'][
-                    GameTeamNames.TEAM_ID].iloc[
-                    0]
-            away_team_id = \
-                transformed_boxscore.game_teams[transformed_boxscore.game_teams[GameTeamNames.LOCATION] != 'home'][
-                    GameTeamNames.TEAM_ID].iloc[
-                    0]
-            play_by_play = self._generate_play_by_play(game_id=game_id, home_team_id=home_team_id,
-                                                       away_team_id=away_team_id, lineups=lineups)
-
+        for transformed_boxscore, play_by_play in self._transform_raw_games(raw_games=raw_games,
+                                                                            league_games=league_games,
+                                                                            lineup_registry=lineup_registry,
+                                                                            executor=executor):
             possessions.append(play_by_play.possessions)
             offense_player_play_by_plays.append(play_by_play.offense_player_play_by_plays)
             defense_player_play_by_plays.append(play_by_play.defense_player_play_by_plays)
 
-            possession_attempts.append(play_by_play.possessions)
+            possession_attempts.append(play_by_play.possession_attempts)
+            shot_plays.append(play_by_play.shot_plays)
             game_teams.append(transformed_boxscore.game_teams)
             game_players.append(transformed_boxscore.game_players)
             games.append(transformed_boxscore.game)
 
-            lineups = play_by_play.lineups
-
         return CollectedData(
-            possessions=pd.concat(possessions) if possessions else [],
-            game_teams=pd.concat(game_teams) if game_teams else [],
-            game_players=pd.concat(game_players) if game_players else [],
-            offense_player_play_by_plays=pd.concat(
-                offense_player_play_by_plays) if offense_player_play_by_plays else [],
-            defense_player_play_by_plays=pd.concat(
-                defense_player_play_by_plays) if defense_player_play_by_plays else [],
-            possession_attempts=pd.concat(possession_attempts) if possession_attempts else [],
-            game=pd.concat(games) if games else [],
-            lineups=lineups
+            possessions=_concat_tables(possessions, names=LineupPlayByPlaysNames),
+            game_teams=_concat_tables(game_teams, names=GameTeamNames),
+            game_players=_concat_tables(game_players, names=GamePlayerNames),
+            offense_player_play_by_plays=_concat_tables(offense_player_play_by_plays,
+                                                        names=PlayerOffensePlayByPlaysNames),
+            defense_player_play_by_plays=_concat_tables(defense_player_play_by_plays,
+                                                        names=PlayerDefensePlayByPlaysNames),
+            possession_attempts=_concat_tables(possession_attempts, names=LineupPlayByPlaysNames),
+            shot_plays=_concat_tables(shot_plays, names=ShotPlaysNames),
+            game=_concat_tables(games, names=GameNames),
+            lineups=lineup_registry.export_new_lineups()
+        )
+
+    def _transform_raw_games(self, raw_games: Iterable[RawGameData], league_games: pd.DataFrame,
+                             lineup_registry: LineupRegistry,
+                             executor: Optional[ProcessPoolExecutor] = None
+                             ) -> Iterator[tuple[TransformedBoxscore, PlayByPlay]]:
+        if executor is None:
+            for raw_game in raw_games:
+                transformed_game = _transform_raw_game(raw_game=raw_game, league_games=league_games,
+                                                       lineup_registry=lineup_registry)
+                if transformed_game is not None:
+                    yield transformed_game
+            return
+
+        raw_games = iter(raw_games)
+        pending_games = deque()
+        for raw_game in itertools.islice(raw_games, self.workers * 2):
+            pending_games.append(self._submit_raw_game(executor=executor, raw_game=raw_game,
+                                                       league_games=league_games, lineup_registry=lineup_registry))
+
+        while pending_games:
+            transformed_game, new_lineups = pending_games.popleft().result()
+            for raw_game in itertools.islice(raw_games, 1):
+                pending_games.append(self._submit_raw_game(executor=executor, raw_game=raw_game,
+                                                           league_games=league_games,
+                                                           lineup_registry=lineup_registry))
+            if transformed_game is None:
+                continue
+            lineup_id_map = lineup_registry.reconcile_lineups(lineups=new_lineups)
+            transformed_boxscore, play_by_play = transformed_game
+            yield transformed_boxscore, _remap_lineup_ids(play_by_play=play_by_play, lineup_id_map=lineup_id_map)
+
+    def _submit_raw_game(self, executor: ProcessPoolExecutor, raw_game: RawGameData, league_games: pd.DataFrame,
+                         lineup_registry: LineupRegistry) -> Future:
+        return executor.submit(_transform_raw_game_in_worker, raw_game=raw_game,
+                               league_games=league_games[league_games[LFG.GAME_ID] == raw_game.game_id],
+                               content_lineup_ids=lineup_registry.content_ids,
+                               next_lineup_id=lineup_registry.next_lineup_id)
+
+    def _iter_raw_games_data(self, game_ids: list[int]) -> Iterator[RawGameData]:
+        if self.prefetch_queue_size > 0:
+            yield from self._prefetch_raw_games_data(game_ids=game_ids)
+        elif self.concurrent_requests > 1:
+            yield from self._fetch_raw_games_data_concurrently(game_ids=game_ids)
+        else:
+            for game_id in game_ids:
+                yield self._fetch_raw_game_data(game_id=game_id)
+
+    def _prefetch_raw_games_data(self, game_ids: list[int]) -> Iterator[RawGameData]:
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        unsubmitted_game_ids = iter(game_ids)
+        pending_raw_games = deque()
+        try:
+            for game_id in itertools.islice(unsubmitted_game_ids, self.prefetch_queue_size):
+                pending_raw_games.append(executor.submit(self._fetch_raw_game_data, game_id=game_id))
+
+            while pending_raw_games:
+                raw_game = pending_raw_games.popleft().result()
+                for game_id in itertools.islice(unsubmitted_game_ids, 1):
+                    pending_raw_games.append(executor.submit(self._fetch_raw_game_data, game_id=game_id))
+                yield raw_game
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_raw_games_data_concurrently(self, game_ids: list[int]) -> Iterator[RawGameData]:
+        async_nba_api = AsyncNBAApi(nba_api=self.nba_api, max_concurrent_requests=self.concurrent_requests)
+        try:
+            yield from async_nba_api.iter_games_data(game_ids=game_ids, max_pending_games=self.store_frequency)
+        finally:
+            async_nba_api.close()
+
+    def _fetch_raw_game_data(self, game_id: int) -> RawGameData:
+        return RawGameData(
+            game_id=game_id,
+            boxscore=self.nba_api.get_boxscore_by_game_id(game_id=game_id),
+            boxscore_adv=self.nba_api.boxscore_advanced_v2_by_game_id(game_id=game_id),
+            play_by_plays=self.nba_api.get_play_by_play_by_game_id(game_id=game_id),
+            team_rotations=self.nba_api.get_rotations_by_game_id(game_id=game_id),
         )
 
     def generate_league_games(self, min_date: datetime.date, max_date: datetime.date) -> pd.DataFrame:
@@ -144,77 +283,107 @@ class GameStorer():
                 .sort_values(by=[LGFDataNames.GAME_DATE, LGFDataNames.GAME_ID], ascending=True)
                 )
 
-    def _generated_transformed_boxscore(
-            self,
-            league_games: pd.DataFrame,
-            game_id) -> TransformedBoxscore:
-        boxscore = self.nba_api.get_boxscore_by_game_id(game_id=game_id)
-        boxscore_adv = self.nba_api.boxscore_advanced_v2_by_game_id(game_id=game_id)
-        league_game_rows = league_games[league_games['GAME_ID'] == game_id]
-        game_teams = generate_game_team(game_team_adv_df=boxscore_adv.team_data, league_game_rows=league_game_rows)
-        game_players = generate_game_players(boxscore=boxscore, boxscore_adv=boxscore_adv)
-        game = generate_game(league_game_rows=league_game_rows, boxscore=boxscore.team_data)
-
-        return TransformedBoxscore(
-            id=game_id,
-            game_players=game_players,
-            game_teams=game_teams,
-            game=game
-
-        )
 
-    def _generate_play_by_play(self, game_id: int, home_team_id: int, away_team_id: int,
-                               lineups: pd.DataFrame) -> PlayByPlay:
-        play_by_plays = self.nba_api.get_play_by_play_by_game_id(game_id=game_id)
-        play_by_plays = (
-            play_by_plays.assign(
-                MINUTES=play_by_plays['PCTIMESTRING'].str.split(":").str[0].astype(int),
-                SECONDS=play_by_plays['PCTIMESTRING'].str.split(":").str[1].astype(int)
-            )
-            .assign(SECONDS_REMAINING=lambda x: x['MINUTES'] * 60 + x['SECONDS'])
-            .assign(
-                OVERTIME_PERIODS=(play_by_plays['PERIOD'] - 4).clip(lower=0),
-                BASE_SECONDS=play_by_plays['PERIOD'].clip(upper=4) * 12 * 60,
-                OVERTIME_SECONDS=lambda x: x['OVERTIME_PERIODS'] * 5 * 60
-            )
-            .assign(
-                SECONDS_PLAYED=lambda x: np.where(
-                    play_by_plays['PERIOD'] > 4,
-                    4 * 12 * 60 + x['OVERTIME_SECONDS'] - x['SECONDS_REMAINING'],
-                    x['BASE_SECONDS'] - x['SECONDS_REMAINING']
-                )
-            )
-            .drop(['MINUTES', 'SECONDS', 'SECONDS_REMAINING', 'OVERTIME_PERIODS', 'BASE_SECONDS', 'OVERTIME_SECONDS',
-                   'PCTIMESTRING'], axis=1)
-        )
-
-        team_rotations = self.nba_api.get_rotations_by_game_id(game_id=game_id)
-        for idx, rotation in enumerate(team_rotations):
-            team_rotations[idx][RN.IN_TIME_SECONDS_PLAYED] = team_rotations[idx][RN.IN_TIME_REAL] / 10
-            team_rotations[idx][RN.OUT_TIME_SECONDS_PLAYED] = team_rotations[idx][RN.OUT_TIME_REAL] / 10
-        inplay_lineups, lineups = generate_inplay_lineups(team_rotations=team_rotations, lineups=lineups)
-        shot_plays = generate_shot_plays(play_by_plays=play_by_plays, inplay_lineups=inplay_lineups)
-        possession_attempts, play_by_plays = generate_possession_attempts(play_by_plays=play_by_plays,
-                                                                          inplay_lineups=inplay_lineups,
-                                                                          home_team_id=home_team_id,
-                                                                          away_team_id=away_team_id)
-
-        possessions = generate_possession_from_attempts(possession_attempts=possession_attempts)
-
-        defense_player_play_by_plays = generate_defense_player_play_by_plays(play_by_plays=play_by_plays,
-                                                                             possessions=possessions, lineups=lineups)
-
-        offense_player_play_by_plays = generate_offense_player_play_by_plays(play_by_plays=play_by_plays,
-                                                                             possessions=possessions, lineups=lineups)
-
-        return PlayByPlay(
-            team_rotations=team_rotations,
-            inplay_lineups=inplay_lineups,
-            play_by_plays=play_by_plays,
-            shot_plays=shot_plays,
-            possessions=possessions,
-            possession_attempts=possession_attempts,
-            offense_player_play_by_plays=offense_player_play_by_plays,
-            defense_player_play_by_plays=defense_player_play_by_plays,
-            lineups=lineups
-        )
+def _generate_transformed_boxscore(league_games: pd.DataFrame, raw_game: RawGameData) -> TransformedBoxscore:
+    game_id = raw_game.game_id
+    boxscore = raw_game.boxscore
+    boxscore_adv = raw_game.boxscore_adv
+    league_game_rows = league_games[league_games['GAME_ID'] == game_id]
+    game_teams = generate_game_team(game_team_adv_df=boxscore_adv.team_data, league_game_rows=league_game_rows)
+    game_players = generate_game_players(boxscore=boxscore, boxscore_adv=boxscore_adv)
+    game = generate_game(league_game_rows=league_game_rows, boxscore=boxscore.team_data)
+
+    return TransformedBoxscore(
+        id=game_id,
+        game_players=game_players,
+        game_teams=game_teams,
+        game=game
+
+    )
+
+def _generate_play_by_play(raw_game: RawGameData, home_team_id: int, away_team_id: int,
+                           lineup_registry: LineupRegistry) -> PlayByPlay:
+    play_by_plays = add_seconds_played(play_by_plays=raw_game.play_by_plays)
+    play_by_plays = classify_play_types(play_by_plays)
+
+    team_rotations = add_rotation_seconds_played(team_rotations=raw_game.team_rotations)
+    inplay_lineups, lineups = generate_inplay_lineups(team_rotations=team_rotations,
+                                                      lineup_registry=lineup_registry)
+    shot_plays = generate_shot_plays(play_by_plays=play_by_plays, inplay_lineups=inplay_lineups)
+    possession_attempts, play_by_plays = generate_possession_attempts(play_by_plays=play_by_plays,
+                                                                      inplay_lineups=inplay_lineups,
+                                                                      home_team_id=home_team_id,
+                                                                      away_team_id=away_team_id)
+
+    possessions = generate_possession_from_attempts(possession_attempts=possession_attempts)
+
+    defense_player_play_by_plays = generate_defense_player_play_by_plays(play_by_plays=play_by_plays,
+                                                                         possessions=possessions, lineups=lineups)
+
+    offense_player_play_by_plays = generate_offense_player_play_by_plays(play_by_plays=play_by_plays,
+                                                                         possessions=possessions, lineups=lineups)
+
+    return PlayByPlay(
+        team_rotations=team_rotations,
+        inplay_lineups=inplay_lineups,
+        play_by_plays=play_by_plays,
+        shot_plays=shot_plays,
+        possessions=possessions,
+        possession_attempts=possession_attempts,
+        offense_player_play_by_plays=offense_player_play_by_plays,
+        defense_player_play_by_plays=defense_player_play_by_plays,
+        lineups=lineups
+    )
+
+
+def _concat_tables(tables: list[pd.DataFrame], names: type) -> pd.DataFrame:
+    return apply_schema(pd.concat(tables), names) if tables else []
+
+
+def _transform_raw_game(raw_game: RawGameData, league_games: pd.DataFrame,
+                        lineup_registry: LineupRegistry) -> Optional[tuple[TransformedBoxscore, PlayByPlay]]:
+    game_id = raw_game.game_id
+    logging.info(f"processing gameid {game_id}")
+
+    try:
+        transformed_boxscore = _generate_transformed_boxscore(raw_game=raw_game, league_games=league_games)
+    except ValueError as e:
+        logging.warning(f"gameid {game_id} failed to generate boxscore, error: {e}")
+        return None
+
+    home_team_id = \
+        transformed_boxscore.game_teams[transformed_boxscore.game_teams[GameTeamNames.LOCATION] == 'home'][
+            GameTeamNames.TEAM_ID].iloc[
+            0]
+    away_team_id = \
+        transformed_boxscore.game_teams[transformed_boxscore.game_teams[GameTeamNames.LOCATION] != 'home'][
+            GameTeamNames.TEAM_ID].iloc[
+            0]
+    play_by_play = _generate_play_by_play(raw_game=raw_game, home_team_id=home_team_id,
+                                          away_team_id=away_team_id,
+                                          lineup_registry=lineup_registry)
+    return transformed_boxscore, play_by_play
+
+
+def _transform_raw_game_in_worker(raw_game: RawGameData, league_games: pd.DataFrame, content_lineup_ids: bool,
+                                  next_lineup_id: int
+                                  ) -> tuple[Optional[tuple[TransformedBoxscore, PlayByPlay]], pd.DataFrame]:
+    # the worker only sees this game's lineups, the parent registry reconciles them into its own ids
+    lineup_registry = LineupRegistry(content_ids=content_lineup_ids, next_lineup_id=next_lineup_id)
+    transformed_game = _transform_raw_game(raw_game=raw_game, league_games=league_games,
+                                           lineup_registry=lineup_registry)
+    return transformed_game, lineup_registry.export_new_lineups()
+
+
+def _remap_lineup_ids(play_by_play: PlayByPlay, lineup_id_map: dict[int, int]) -> PlayByPlay:
+    if not lineup_id_map:
+        return play_by_play
+
+    return replace(
+        play_by_play,
+        inplay_lineups=remap_lineup_ids(play_by_play.inplay_lineups, lineup_id_map=lineup_id_map),
+        shot_plays=remap_lineup_ids(play_by_play.shot_plays, lineup_id_map=lineup_id_map),
+        possession_attempts=remap_lineup_ids(play_by_play.possession_attempts, lineup_id_map=lineup_id_map),
+        possessions=remap_lineup_ids(play_by_play.possessions, lineup_id_map=lineup_id_map),
+        lineups=remap_lineup_ids(play_by_play.lineups, lineup_id_map=lineup_id_map),
+    )
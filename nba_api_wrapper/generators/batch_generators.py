@@ -0,0 +1,104 @@
+import logging
+from typing import Iterable
+
+import pandas as pd
+
+from nba_api_wrapper.api.api_calls import BoxscoreData, BoxscoreAdvancedV2Data
+from nba_api_wrapper.data_models import LGFDataNames, GameTeamNames, PlayByPlay2Names, RotationNames, \
+    BoxscoreV2Names
+from nba_api_wrapper.datastructures import RawGameData, RawGamesData, CollectedData
+from nba_api_wrapper.generators.boxscore_generators import generate_valid_game_teams, generate_game_players, \
+    generate_game
+from nba_api_wrapper.generators.play_by_play_generators import add_seconds_played, classify_play_types, \
+    add_rotation_seconds_played, generate_inplay_lineups, generate_shot_plays, generate_possession_attempts, \
+    generate_possession_from_attempts, generate_defense_player_play_by_plays, generate_offense_player_play_by_plays
+from nba_api_wrapper.lineup_registry import LineupRegistry
+
+LGF = LGFDataNames
+GT = GameTeamNames
+PBP = PlayByPlay2Names
+RN = RotationNames
+BOX = BoxscoreV2Names
+
+
+def stack_raw_games_data(raw_games: Iterable[RawGameData]) -> RawGamesData:
+    raw_games = list(raw_games)
+    return RawGamesData(
+        game_ids=[raw_game.game_id for raw_game in raw_games],
+        boxscore=BoxscoreData(
+            player_data=_concat([raw_game.boxscore.player_data for raw_game in raw_games]),
+            team_data=_concat([raw_game.boxscore.team_data for raw_game in raw_games]),
+        ),
+        boxscore_adv=BoxscoreAdvancedV2Data(
+            player_data=_concat([raw_game.boxscore_adv.player_data for raw_game in raw_games]),
+            team_data=_concat([raw_game.boxscore_adv.team_data for raw_game in raw_games]),
+        ),
+        play_by_plays=_concat([raw_game.play_by_plays for raw_game in raw_games]),
+        team_rotations=_concat([rotation for raw_game in raw_games for rotation in raw_game.team_rotations]),
+    )
+
+
+def _concat(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def _generate_game_teams(raw_games: RawGamesData, league_game_rows: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    game_teams, invalid_game_ids = generate_valid_game_teams(game_team_adv_df=raw_games.boxscore_adv.team_data,
+                                                             league_game_rows=league_game_rows)
+    game_ids = []
+    for game_id in raw_games.game_ids:
+        if game_id in invalid_game_ids:
+            logging.warning(f"gameid {game_id} failed to generate boxscore")
+            continue
+        game_ids.append(game_id)
+
+    return game_teams, game_ids
+
+
+def generate_collected_data(raw_games: RawGamesData, league_games: pd.DataFrame,
+                            lineup_registry: LineupRegistry) -> CollectedData:
+    league_game_rows = league_games[league_games[LGF.GAME_ID].isin(raw_games.game_ids)]
+    game_teams, game_ids = _generate_game_teams(raw_games=raw_games, league_game_rows=league_game_rows)
+
+    boxscore = BoxscoreData(
+        player_data=raw_games.boxscore.player_data[raw_games.boxscore.player_data[BOX.GAME_ID].isin(game_ids)],
+        team_data=raw_games.boxscore.team_data[raw_games.boxscore.team_data[BOX.GAME_ID].isin(game_ids)],
+    )
+    game_players = generate_game_players(boxscore=boxscore, boxscore_adv=raw_games.boxscore_adv)
+    game = generate_game(league_game_rows=league_game_rows, boxscore=boxscore.team_data)
+
+    is_home = (game_teams[GT.LOCATION] == 'home').to_numpy()
+    home_team_ids = dict(zip(game_teams[GT.GAME_ID][is_home], game_teams[GT.TEAM_ID][is_home]))
+    away_team_ids = dict(zip(game_teams[GT.GAME_ID][~is_home], game_teams[GT.TEAM_ID][~is_home]))
+
+    play_by_plays = raw_games.play_by_plays[raw_games.play_by_plays[PBP.GAME_ID].isin(game_ids)]
+    play_by_plays = classify_play_types(add_seconds_played(play_by_plays=play_by_plays))
+    team_rotations = raw_games.team_rotations[raw_games.team_rotations[RN.GAME_ID].isin(game_ids)]
+    team_rotations = add_rotation_seconds_played(team_rotations=[team_rotations])
+
+    inplay_lineups, lineups = generate_inplay_lineups(team_rotations=team_rotations,
+                                                      lineup_registry=lineup_registry)
+    shot_plays = generate_shot_plays(play_by_plays=play_by_plays, inplay_lineups=inplay_lineups)
+    possession_attempts, play_by_plays = generate_possession_attempts(play_by_plays=play_by_plays,
+                                                                      inplay_lineups=inplay_lineups,
+                                                                      home_team_id=home_team_ids,
+                                                                      away_team_id=away_team_ids)
+    possessions = generate_possession_from_attempts(possession_attempts=possession_attempts)
+    defense_player_play_by_plays = generate_defense_player_play_by_plays(play_by_plays=play_by_plays,
+                                                                         possessions=possessions, lineups=lineups)
+    offense_player_play_by_plays = generate_offense_player_play_by_plays(play_by_plays=play_by_plays,
+                                                                         possessions=possessions, lineups=lineups)
+
+    return CollectedData(
+        possessions=possessions,
+        game_teams=game_teams,
+        game_players=game_players,
+        offense_player_play_by_plays=offense_player_play_by_plays,
+        defense_player_play_by_plays=defense_player_play_by_plays,
+        possession_attempts=possession_attempts,
+        shot_plays=shot_plays,
+        game=game,
+        lineups=lineup_registry.export_new_lineups(),
+    )
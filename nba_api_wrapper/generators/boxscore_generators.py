@@ -1,10 +1,12 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
 from nba_api_wrapper.api.api_calls import BoxscoreData, BoxscoreAdvancedV2Data
 from nba_api_wrapper.data_models import GameTeamNames, GameNames, GamePlayerNames, LGFDataNames, BoxscoreV2Names, \
     BoxscoreAdvV2Names, BoxscoreAdvV2TeamNames
+from nba_api_wrapper.schemas import apply_schema
 
 GT = GameTeamNames
 G = GameNames
@@ -14,179 +16,141 @@ BOX = BoxscoreV2Names
 BOX_ADV = BoxscoreAdvV2Names
 BOX_ADV_TEAM = BoxscoreAdvV2TeamNames
 
-def _get_team_won(league_game_rows: pd.DataFrame, team_name: str) -> bool:
-    team_points = league_game_rows[league_game_rows[LGF.TEAM_NAME] == team_name][LGF.POINTS].iloc[0]
-    opponent_points = league_game_rows[league_game_rows[LGF.TEAM_NAME] != team_name][LGF.POINTS].iloc[0]
-    if team_points > opponent_points:
-        return True
-    return False
+GAME_TEAM_POSITION = "game_team_position"
+OPPONENT_SUFFIX = "_opponent"
 
+def _get_minutes_played(minutes: pd.Series) -> pd.Series:
+    played = (minutes.notna() & (minutes != 0)).to_numpy(dtype=bool)
+    clock = np.char.partition(minutes[played].astype(str).to_numpy(dtype=str), ':')
+    minutes_played = np.zeros(len(minutes))
+    minutes_played[played] = clock[:, 0].astype(float) + clock[:, 2].astype(float) / 60
+    return pd.Series(minutes_played, index=minutes.index).round(3)
 
-def _get_minutes_played(box_row: pd.Series) -> float:
-    if box_row[BOX.MIN] != 0:
-        secs = float(box_row[BOX.MIN].split(":")[1])
-        return round(float(box_row[BOX.MIN].split(":")[0]) + secs / 60, 3)
-    else:
-        return 0
 
-
-def _get_game_minutes_played(boxscore: pd.DataFrame):
-    mins = 0
-    for _, row in boxscore.iterrows():
-        mins += _get_minutes_played(row)
-
-    return round(mins / 10, 2)
+def _get_game_minutes_played(boxscore: pd.DataFrame) -> pd.Series:
+    minutes_played = _get_minutes_played(boxscore[BOX.MIN])
+    return minutes_played.groupby(boxscore[BOX.GAME_ID].to_numpy(), sort=False).sum().div(10).round(2)
 
 
 def generate_game(boxscore: pd.DataFrame, league_game_rows: pd.DataFrame) -> pd.DataFrame:
-    game = {
-        G.MINUTES: [_get_game_minutes_played(boxscore=boxscore)],
-        G.GAME_ID: [boxscore[BOX.GAME_ID].iloc[0]],
-        G.SEASON_ID: [league_game_rows[LGF.SEASON_ID].iloc[0]],
-        G.START_DATE: [league_game_rows[LGF.GAME_DATE].iloc[0]]
-    }
-    return pd.DataFrame.from_dict(game)
+    game_minutes_played = _get_game_minutes_played(boxscore=boxscore)
+    league_games = league_game_rows.drop_duplicates(subset=[LGF.GAME_ID]).set_index(LGF.GAME_ID)
+    game_ids = game_minutes_played.index
+    return apply_schema(pd.DataFrame({
+        G.MINUTES: game_minutes_played.to_numpy(),
+        G.GAME_ID: game_ids.to_numpy(),
+        G.SEASON_ID: league_games[LGF.SEASON_ID].reindex(game_ids).to_numpy(),
+        G.START_DATE: league_games[LGF.GAME_DATE].reindex(game_ids).to_numpy(),
+    }), GameNames)
 
 
 def generate_game_team(game_team_adv_df: pd.DataFrame,
                        league_game_rows: pd.DataFrame) -> pd.DataFrame:
-    game_team_dict = {
-        GT.GAME_ID: [],
-        GT.TEAM_ID: [],
-        GT.SCORE: [],
-        GT.SCORE_OPPONENT: [],
-        GT.LOCATION: [],
-        GT.TEAM_ID_OPPONENT: [],
-        GT.TEAM_NAME_ABBR: [],
-        GT.TEAM_NAME: [],
-        GT.WON: [],
-        GT.E_OFF_RATING: [],
-        GT.OFF_RATING: [],
-        GT.E_DEF_RATING: [],
-        GT.DEF_RATING: [],
-        GT.E_NET_RATING: [],
-        GT.NET_RATING: [],
-        GT.PACE: [],
-        GT.E_PACE: [],
-        GT.POSS: [],
-        GT.PIE: [],
-    }
-
-    for _, game_team_row in league_game_rows.iterrows():
-
-        if "@" in game_team_row[LGF.MATCHUP]:
-            location = 'away'
-        else:
-            location = 'home'
-
-        team_name = game_team_row[LGF.TEAM_NAME]
-        opponent_game_team_row = league_game_rows[league_game_rows[LGF.TEAM_NAME] != team_name]
-        if len(opponent_game_team_row) == 0:
-            logging.warning(f"gameid {game_team_row[LGF.GAME_ID]} team {team_name} has no opponent")
-            raise ValueError
-        team_won = _get_team_won(league_game_rows=league_game_rows, team_name=team_name)
-        team_id = game_team_row[LGF.TEAM_ID]
-
-        game_team_adv_df_row = game_team_adv_df[game_team_adv_df[BoxscoreAdvV2TeamNames.TEAM_ID] == team_id]
-        if len(game_team_adv_df_row) == 0:
-            logging.warning(f"gameid {game_team_row[LGF.GAME_ID]} team {team_name} has no advanced stats")
-            raise ValueError
-
-        game_team_dict[GT.GAME_ID].append(game_team_row[LGF.GAME_ID])
-        game_team_dict[GT.LOCATION].append(location)
-        game_team_dict[GT.TEAM_ID].append(team_id)
-        game_team_dict[GT.TEAM_NAME].append(team_name)
-        game_team_dict[GT.TEAM_ID_OPPONENT].append(opponent_game_team_row[LGF.TEAM_ID].iloc[0])
-        game_team_dict[GT.SCORE].append(game_team_row[LGF.POINTS])
-        game_team_dict[GT.SCORE_OPPONENT].append(opponent_game_team_row[LGF.POINTS].iloc[0])
-        game_team_dict[GT.TEAM_NAME_ABBR].append(game_team_row[LGF.TEAM_ABBREVIATION])
-        game_team_dict[GT.WON].append(team_won)
-        game_team_dict[GT.E_OFF_RATING].append(game_team_adv_df_row[BOX_ADV_TEAM.E_OFF_RATING].iloc[0])
-        game_team_dict[GT.OFF_RATING].append(game_team_adv_df_row[BOX_ADV_TEAM.OFF_RATING].iloc[0])
-        game_team_dict[GT.E_DEF_RATING].append(game_team_adv_df_row[BOX_ADV_TEAM.E_DEF_RATING].iloc[0])
-        game_team_dict[GT.DEF_RATING].append(game_team_adv_df_row[BOX_ADV_TEAM.DEF_RATING].iloc[0])
-        game_team_dict[GT.E_NET_RATING].append(game_team_adv_df_row[BOX_ADV_TEAM.E_NET_RATING].iloc[0])
-        game_team_dict[GT.NET_RATING].append(game_team_adv_df_row[BOX_ADV_TEAM.NET_RATING].iloc[0])
-        game_team_dict[GT.PACE].append(game_team_adv_df_row[BOX_ADV_TEAM.PACE].iloc[0])
-        game_team_dict[GT.POSS].append(game_team_adv_df_row[BOX_ADV_TEAM.POSS].iloc[0])
-        game_team_dict[GT.PIE].append(game_team_adv_df_row[BOX_ADV_TEAM.PIE].iloc[0])
-        game_team_dict[GT.E_PACE].append(game_team_adv_df_row[BOX_ADV_TEAM.E_PACE].iloc[0])
-
-    return pd.DataFrame.from_dict(game_team_dict)
+    game_teams, invalid_game_ids = generate_valid_game_teams(game_team_adv_df=game_team_adv_df,
+                                                             league_game_rows=league_game_rows)
+    if invalid_game_ids:
+        raise ValueError
+    return game_teams
+
+
+def generate_valid_game_teams(game_team_adv_df: pd.DataFrame,
+                              league_game_rows: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    game_teams = league_game_rows[[LGF.GAME_ID, LGF.TEAM_ID, LGF.TEAM_NAME, LGF.TEAM_ABBREVIATION, LGF.POINTS,
+                                   LGF.MATCHUP]].reset_index(drop=True)
+    game_teams[GAME_TEAM_POSITION] = np.arange(len(game_teams))
+
+    opponents = game_teams.merge(game_teams[[LGF.GAME_ID, LGF.TEAM_ID, LGF.TEAM_NAME, LGF.POINTS]],
+                                 on=LGF.GAME_ID, suffixes=("", OPPONENT_SUFFIX))
+    opponents = opponents[opponents[LGF.TEAM_NAME] != opponents[LGF.TEAM_NAME + OPPONENT_SUFFIX]]
+    opponents = opponents.drop_duplicates(subset=[GAME_TEAM_POSITION]).set_index(GAME_TEAM_POSITION)
+    opponents = opponents.reindex(game_teams[GAME_TEAM_POSITION])
+
+    missing_opponent = opponents[LGF.TEAM_ID + OPPONENT_SUFFIX].isna().to_numpy()
+    for game_id, team_name in zip(game_teams[LGF.GAME_ID][missing_opponent],
+                                  game_teams[LGF.TEAM_NAME][missing_opponent]):
+        logging.warning(f"gameid {game_id} team {team_name} has no opponent")
+
+    adv_keys = [BOX_ADV_TEAM.GAME_ID, BOX_ADV_TEAM.TEAM_ID]
+    game_team_keys = pd.MultiIndex.from_arrays([game_teams[LGF.GAME_ID], game_teams[LGF.TEAM_ID]])
+    game_team_adv = game_team_adv_df.drop_duplicates(subset=adv_keys).set_index(adv_keys)
+    missing_adv = ~game_team_keys.isin(game_team_adv.index)
+    game_team_adv = game_team_adv.reindex(game_team_keys)
+
+    for game_id, team_name in zip(game_teams[LGF.GAME_ID][missing_adv], game_teams[LGF.TEAM_NAME][missing_adv]):
+        logging.warning(f"gameid {game_id} team {team_name} has no advanced stats")
+
+    invalid_game_ids = game_teams[LGF.GAME_ID][missing_opponent | missing_adv].unique().tolist()
+    if invalid_game_ids:
+        valid = ~game_teams[LGF.GAME_ID].isin(invalid_game_ids).to_numpy()
+        game_teams = game_teams[valid]
+        opponents = opponents[valid]
+        game_team_adv = game_team_adv[valid]
+
+    return apply_schema(pd.DataFrame({
+        GT.GAME_ID: game_teams[LGF.GAME_ID].to_numpy(),
+        GT.TEAM_ID: game_teams[LGF.TEAM_ID].to_numpy(),
+        GT.SCORE: game_teams[LGF.POINTS].to_numpy(),
+        GT.SCORE_OPPONENT: opponents[LGF.POINTS + OPPONENT_SUFFIX].to_numpy(),
+        GT.LOCATION: np.where(game_teams[LGF.MATCHUP].str.contains("@", regex=False), 'away', 'home'),
+        GT.TEAM_ID_OPPONENT: opponents[LGF.TEAM_ID + OPPONENT_SUFFIX].to_numpy(),
+        GT.TEAM_NAME_ABBR: game_teams[LGF.TEAM_ABBREVIATION].to_numpy(),
+        GT.TEAM_NAME: game_teams[LGF.TEAM_NAME].to_numpy(),
+        GT.WON: (game_teams[LGF.POINTS].to_numpy() > opponents[LGF.POINTS + OPPONENT_SUFFIX].to_numpy()),
+        GT.E_OFF_RATING: game_team_adv[BOX_ADV_TEAM.E_OFF_RATING].to_numpy(),
+        GT.OFF_RATING: game_team_adv[BOX_ADV_TEAM.OFF_RATING].to_numpy(),
+        GT.E_DEF_RATING: game_team_adv[BOX_ADV_TEAM.E_DEF_RATING].to_numpy(),
+        GT.DEF_RATING: game_team_adv[BOX_ADV_TEAM.DEF_RATING].to_numpy(),
+        GT.E_NET_RATING: game_team_adv[BOX_ADV_TEAM.E_NET_RATING].to_numpy(),
+        GT.NET_RATING: game_team_adv[BOX_ADV_TEAM.NET_RATING].to_numpy(),
+        GT.PACE: game_team_adv[BOX_ADV_TEAM.PACE].to_numpy(),
+        GT.E_PACE: game_team_adv[BOX_ADV_TEAM.E_PACE].to_numpy(),
+        GT.POSS: game_team_adv[BOX_ADV_TEAM.POSS].to_numpy(),
+        GT.PIE: game_team_adv[BOX_ADV_TEAM.PIE].to_numpy(),
+    }), GameTeamNames), invalid_game_ids
 
 
 def generate_game_players(boxscore: BoxscoreData, boxscore_adv: BoxscoreAdvancedV2Data) -> pd.DataFrame:
-    game_player_dict = {
-        GT.GAME_ID: [],
-        GP.TEAM_ID: [],
-        GP.PLAYER_ID: [],
-        GP.START_POSITION: [],
-        GP.PLAYER_NAME: [],
-        GP.PLUS_MINUS: [],
-        GP.POINTS: [],
-        GP.MINUTES: [],
-        GP.FREE_THROWS_ATTEMPTED: [],
-        GP.FREE_THROWS_MADE: [],
-        GP.THREE_POINTERS_MADE: [],
-        GP.THREE_POINTERS_ATTEMPTED: [],
-        GP.TWO_POINTERS_MADE: [],
-        GP.TWO_POINTERS_ATTEMPTED: [],
-        GP.TURNOVERS: [],
-        GP.STEALS: [],
-        GP.ASSISTS: [],
-        GP.BLOCKS: [],
-        GP.DEFENSIVE_REBOUNDS: [],
-        GP.OFFENSIVE_REBOUNDS: [],
-        GP.PACE: [],
-        GP.POSS: [],
-        GP.E_PACE: [],
-        GP.E_OFF_RATING: [],
-        GP.OFF_RATING: [],
-        GP.E_DEF_RATING: [],
-        GP.DEF_RATING: [],
-        GP.E_NET_RATING: [],
-        GP.NET_RATING: [],
-        GP.AST_TOV: [],
-        GP.AST_RATIO: [],
-
-    }
-    for _, row in boxscore.player_data.iterrows():
-        game_player_dict[GP.START_POSITION].append(row[BOX.START_POSITION])
-        game_player_dict[GT.GAME_ID].append(row[BOX.GAME_ID])
-        game_player_dict[GP.TEAM_ID].append(row[BOX.TEAM_ID])
-        game_player_dict[GP.PLAYER_ID].append(row[BOX.PLAYER_ID])
-        game_player_dict[GP.PLAYER_NAME].append(row[BOX.PLAYER_NAME])
-        game_player_dict[GP.FREE_THROWS_MADE].append(row[BOX.FTM])
-        game_player_dict[GP.FREE_THROWS_ATTEMPTED].append(row[BOX.FTA])
-        game_player_dict[GP.THREE_POINTERS_MADE].append(row[BOX.FG3M])
-        game_player_dict[GP.THREE_POINTERS_ATTEMPTED].append(row[BOX.FG3A])
-        game_player_dict[GP.TWO_POINTERS_MADE].append(row[BOX.FGM] - row[BOX.FG3M])
-        game_player_dict[GP.TWO_POINTERS_ATTEMPTED].append(row[BOX.FGA] - row[BOX.FG3A])
-        game_player_dict[GP.PLUS_MINUS].append(row[BOX.PLUS_MINUS])
-        game_player_dict[GP.MINUTES].append(_get_minutes_played(box_row=row))
-        game_player_dict[GP.POINTS].append(row[BOX.PTS])
-        game_player_dict[GP.STEALS].append(row[BOX.STL])
-        game_player_dict[GP.ASSISTS].append(row[BOX.AST])
-        game_player_dict[GP.BLOCKS].append(row[BOX.BLK])
-        game_player_dict[GP.TURNOVERS].append(row[BOX.TO])
-        game_player_dict[GP.OFFENSIVE_REBOUNDS].append(row[BOX.OREB])
-        game_player_dict[GP.DEFENSIVE_REBOUNDS].append(row[BOX.DREB])
-
-        adv_row = boxscore_adv.player_data[boxscore_adv.player_data[BOX_ADV.PLAYER_ID] == row[BOX.PLAYER_ID]]
-
-        if len(adv_row) > 0:
-            game_player_dict[GP.E_PACE].append(adv_row[BOX_ADV.E_PACE].iloc[0])
-            game_player_dict[GP.PACE].append(adv_row[BOX_ADV.PACE].iloc[0])
-            game_player_dict[GP.POSS].append(adv_row[BOX_ADV.POSS])
-            game_player_dict[GP.AST_RATIO].append(adv_row[BOX_ADV.AST_RATIO].iloc[0])
-            game_player_dict[GP.AST_TOV].append(adv_row[BOX_ADV.AST_TOV].iloc[0])
-            game_player_dict[GP.NET_RATING].append(adv_row[BOX_ADV.NET_RATING].iloc[0])
-            game_player_dict[GP.E_NET_RATING].append(adv_row[BOX_ADV.E_NET_RATING].iloc[0])
-            game_player_dict[GP.DEF_RATING].append(adv_row[BOX_ADV.DEF_RATING].iloc[0])
-            game_player_dict[GP.E_DEF_RATING].append(adv_row[BOX_ADV.E_DEF_RATING].iloc[0])
-            game_player_dict[GP.OFF_RATING].append(adv_row[BOX_ADV.OFF_RATING].iloc[0])
-            game_player_dict[GP.E_OFF_RATING].append(adv_row[BOX_ADV.E_OFF_RATING].iloc[0])
-        else:
-            logging.warning(f"no advanced stats for player {row[BOX.PLAYER_NAME]}")
-
-    return pd.DataFrame.from_dict(game_player_dict)
+    player_data = boxscore.player_data.reset_index(drop=True)
+
+    adv_keys = [BOX_ADV.GAME_ID, BOX_ADV.PLAYER_ID]
+    player_keys = pd.MultiIndex.from_arrays([player_data[BOX.GAME_ID], player_data[BOX.PLAYER_ID]])
+    player_adv = boxscore_adv.player_data.drop_duplicates(subset=adv_keys).set_index(adv_keys)
+    missing_adv = ~player_keys.isin(player_adv.index)
+    player_adv = player_adv.reindex(player_keys)
+
+    for player_name in player_data[BOX.PLAYER_NAME][missing_adv]:
+        logging.warning(f"no advanced stats for player {player_name}")
+
+    return apply_schema(pd.DataFrame({
+        GT.GAME_ID: player_data[BOX.GAME_ID].to_numpy(),
+        GP.TEAM_ID: player_data[BOX.TEAM_ID].to_numpy(),
+        GP.PLAYER_ID: player_data[BOX.PLAYER_ID].to_numpy(),
+        GP.START_POSITION: player_data[BOX.START_POSITION].to_numpy(),
+        GP.PLAYER_NAME: player_data[BOX.PLAYER_NAME].to_numpy(),
+        GP.PLUS_MINUS: player_data[BOX.PLUS_MINUS].to_numpy(),
+        GP.POINTS: player_data[BOX.PTS].to_numpy(),
+        GP.MINUTES: _get_minutes_played(player_data[BOX.MIN]).to_numpy(),
+        GP.FREE_THROWS_ATTEMPTED: player_data[BOX.FTA].to_numpy(),
+        GP.FREE_THROWS_MADE: player_data[BOX.FTM].to_numpy(),
+        GP.THREE_POINTERS_MADE: player_data[BOX.FG3M].to_numpy(),
+        GP.THREE_POINTERS_ATTEMPTED: player_data[BOX.FG3A].to_numpy(),
+        GP.TWO_POINTERS_MADE: (player_data[BOX.FGM] - player_data[BOX.FG3M]).to_numpy(),
+        GP.TWO_POINTERS_ATTEMPTED: (player_data[BOX.FGA] - player_data[BOX.FG3A]).to_numpy(),
+        GP.TURNOVERS: player_data[BOX.TO].to_numpy(),
+        GP.STEALS: player_data[BOX.STL].to_numpy(),
+        GP.ASSISTS: player_data[BOX.AST].to_numpy(),
+        GP.BLOCKS: player_data[BOX.BLK].to_numpy(),
+        GP.DEFENSIVE_REBOUNDS: player_data[BOX.DREB].to_numpy(),
+        GP.OFFENSIVE_REBOUNDS: player_data[BOX.OREB].to_numpy(),
+        GP.PACE: player_adv[BOX_ADV.PACE].to_numpy(),
+        GP.POSS: player_adv[BOX_ADV.POSS].to_numpy(),
+        GP.E_PACE: player_adv[BOX_ADV.E_PACE].to_numpy(),
+        GP.E_OFF_RATING: player_adv[BOX_ADV.E_OFF_RATING].to_numpy(),
+        GP.OFF_RATING: player_adv[BOX_ADV.OFF_RATING].to_numpy(),
+        GP.E_DEF_RATING: player_adv[BOX_ADV.E_DEF_RATING].to_numpy(),
+        GP.DEF_RATING: player_adv[BOX_ADV.DEF_RATING].to_numpy(),
+        GP.E_NET_RATING: player_adv[BOX_ADV.E_NET_RATING].to_numpy(),
+        GP.NET_RATING: player_adv[BOX_ADV.NET_RATING].to_numpy(),
+        GP.AST_TOV: player_adv[BOX_ADV.AST_TOV].to_numpy(),
+        GP.AST_RATIO: player_adv[BOX_ADV.AST_RATIO].to_numpy(),
+    }), GamePlayerNames)
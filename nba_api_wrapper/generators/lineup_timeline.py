@@ -0,0 +1,67 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from nba_api_wrapper.data_models import TeamInPlayLineupNames
+
+TIPL = TeamInPlayLineupNames
+
+
+class LineupTimeline:
+
+    def __init__(self, inplay_lineups: pd.DataFrame):
+        self.inplay_lineups = inplay_lineups.reset_index(drop=True)
+        seconds_played_start = self.inplay_lineups[TIPL.SECONDS_PLAYED_START].to_numpy()
+        seconds_played_end = self.inplay_lineups[TIPL.SECONDS_PLAYED_END].to_numpy()
+
+        self._team_timelines = {}
+        team_groups = self.inplay_lineups.groupby([TIPL.GAME_ID, TIPL.TEAM_ID], sort=False, observed=True).indices
+        for game_team, team_positions in team_groups.items():
+            team_positions = team_positions[np.argsort(seconds_played_start[team_positions], kind="stable")]
+            self._team_timelines[game_team] = (
+                seconds_played_start[team_positions],
+                seconds_played_end[team_positions],
+                team_positions,
+            )
+
+    def lookup(self, game_ids: np.ndarray, team_ids: np.ndarray, seconds_played: np.ndarray,
+               closed: str = "left") -> np.ndarray:
+        seconds_played = np.asarray(seconds_played)
+        positions = np.full(len(seconds_played), -1, dtype=np.int64)
+        if len(seconds_played) == 0:
+            return positions
+        query_groups = pd.DataFrame({TIPL.GAME_ID: game_ids, TIPL.TEAM_ID: team_ids}).groupby(
+            [TIPL.GAME_ID, TIPL.TEAM_ID], sort=False, observed=True).indices
+        for game_team, query_positions in query_groups.items():
+            if game_team not in self._team_timelines:
+                continue
+            starts, ends, team_positions = self._team_timelines[game_team]
+            positions[query_positions] = self._lookup_team(starts=starts, ends=ends, team_positions=team_positions,
+                                                           seconds_played=seconds_played[query_positions],
+                                                           closed=closed)
+        return positions
+
+    def lookup_one(self, game_id: str, team_id: int, seconds_played: float, closed: str = "left") -> Optional[int]:
+        if (game_id, team_id) not in self._team_timelines:
+            return None
+        starts, ends, team_positions = self._team_timelines[(game_id, team_id)]
+        position = self._lookup_team(starts=starts, ends=ends, team_positions=team_positions,
+                                     seconds_played=np.array([seconds_played]), closed=closed)[0]
+        return None if position == -1 else int(position)
+
+    @staticmethod
+    def _lookup_team(starts: np.ndarray, ends: np.ndarray, team_positions: np.ndarray, seconds_played: np.ndarray,
+                     closed: str) -> np.ndarray:
+        if closed == "left":
+            stint_idx = np.searchsorted(starts, seconds_played, side="right") - 1
+            valid_stint_idx = np.clip(stint_idx, 0, None)
+            found = (stint_idx >= 0) & (seconds_played < ends[valid_stint_idx])
+        elif closed == "right":
+            stint_idx = np.searchsorted(starts, seconds_played, side="left") - 1
+            valid_stint_idx = np.clip(stint_idx, 0, None)
+            found = (stint_idx >= 0) & (seconds_played <= ends[valid_stint_idx])
+        else:
+            raise ValueError(f"closed must be 'left' or 'right', got {closed}")
+
+        return np.where(found, team_positions[valid_stint_idx], -1)
@@ -1,11 +1,16 @@
 import logging
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from nba_api_wrapper.data_models import RotationNames, TeamPossessionNames, TeamInPlayLineupNames, \
     ShotPlaysNames, PlayByPlay2Names, LineupPlayByPlaysNames, PlayerOffensePlayByPlaysNames, \
     PlayerDefensePlayByPlaysNames, PosessionNames, LineupNames
+from nba_api_wrapper.generators.lineup_timeline import LineupTimeline
+from nba_api_wrapper.lineup_arrays import get_lineup_matrix, explode_lineup_matrix
+from nba_api_wrapper.lineup_registry import LineupRegistry
+from nba_api_wrapper.schemas import apply_schema
 
 RN = RotationNames
 TP = TeamPossessionNames
@@ -19,43 +24,179 @@ PN = PosessionNames
 LN = LineupNames
 
 
-def _get_play_type_by_row(text_description: str, row: pd.Series) -> Optional[str]:
-    play_type = None
-    if text_description is None:
-        return None
-    if 'MISS' in text_description:
-        play_type = 'miss'
-    elif 'Instant Replay' in text_description:
-        return 'instant replay'
-    elif 'REBOUND' in text_description or 'Rebound' in text_description:
-        play_type = 'rebound'
-
-    elif row['SCORE'] is not None and 'End of' not in text_description and 'Start of' not in text_description:
-        play_type = "score"
-    elif 'FOUL' in text_description:
-        play_type = "defensive foul"
-    elif 'offensive foul' in text_description:
-        play_type = "offensive foul"
-    elif 'Turnover' in text_description:
-        play_type = 'turnover'
-    elif 'Timeout' in text_description:
-        play_type = 'timeout'
-    elif 'STEAL' in text_description:
-        play_type = 'steal'
-    elif 'BLOCK' in text_description:
-        play_type = 'block'
-    elif 'SUB' in text_description:
-        play_type = 'sub'
-    elif 'Start' in text_description:
-        play_type = 'start'
-    elif 'End' in text_description:
-        play_type = 'end'
-    elif 'STEAL' in text_description:
-        play_type = 'steal'
-    elif 'Jump Ball' in text_description:
-        play_type = 'jump ball'
-
-    return play_type
+EVENT_POSITION = "event_position"
+POSSESSION_PLAYER_POSITION = "possession_player_position"
+
+OFFENSE_PLAY_TYPES = ('score', 'miss', 'rebound', 'offensive foul')
+DEFENSE_PLAY_TYPES = ('rebound', 'steal', 'block', 'defensive foul')
+
+REGULATION_PERIODS = 4
+REGULATION_PERIOD_SECONDS = 12 * 60
+OVERTIME_PERIOD_SECONDS = 5 * 60
+
+PLAY_TYPES = ['miss', 'instant replay', 'rebound', 'score', 'defensive foul', 'offensive foul', 'turnover',
+              'timeout', 'steal', 'block', 'sub', 'start', 'end', 'jump ball']
+
+
+def add_seconds_played(play_by_plays: pd.DataFrame) -> pd.DataFrame:
+    clock = np.char.partition(play_by_plays[PBP.PCTIMESTRING].to_numpy(dtype=str), ':')
+    seconds_remaining = clock[:, 0].astype(np.int64) * 60 + clock[:, 2].astype(np.int64)
+    periods = play_by_plays[PBP.PERIOD].to_numpy(dtype=np.int64)
+
+    overtime_periods = np.clip(periods - REGULATION_PERIODS, 0, None)
+    period_end_seconds = (np.minimum(periods, REGULATION_PERIODS) * REGULATION_PERIOD_SECONDS +
+                          overtime_periods * OVERTIME_PERIOD_SECONDS)
+    return play_by_plays.drop(columns=[PBP.PCTIMESTRING]).assign(
+        **{PBP.SECONDS_PLAYED: period_end_seconds - seconds_remaining})
+
+
+def _has_text(descriptions: pd.Series) -> np.ndarray:
+    return (descriptions.notna() & (descriptions != '')).to_numpy(dtype=bool)
+
+
+def _classify_descriptions(descriptions: pd.Series, has_score: np.ndarray) -> np.ndarray:
+    text = descriptions.fillna('').astype(str)
+
+    def contains(pattern: str) -> np.ndarray:
+        return text.str.contains(pattern, regex=False).to_numpy(dtype=bool)
+
+    conditions = [
+        contains('MISS'),
+        contains('Instant Replay'),
+        contains('REBOUND') | contains('Rebound'),
+        has_score & ~contains('End of') & ~contains('Start of'),
+        contains('FOUL'),
+        contains('offensive foul'),
+        contains('Turnover'),
+        contains('Timeout'),
+        contains('STEAL'),
+        contains('BLOCK'),
+        contains('SUB'),
+        contains('Start'),
+        contains('End'),
+        contains('Jump Ball'),
+    ]
+    play_types = np.select(conditions, PLAY_TYPES, default=None).astype(object)
+    play_types[descriptions.isna().to_numpy()] = None
+    return play_types
+
+
+def classify_play_types(play_by_plays: pd.DataFrame) -> pd.DataFrame:
+    home_descriptions = play_by_plays[PBP.HOMEDESCRIPTION]
+    visitor_descriptions = play_by_plays[PBP.VISITORDESCRIPTION]
+    neutral_descriptions = play_by_plays[PBP.NEUTRALDESCRIPTION]
+    has_score = np.not_equal(play_by_plays[PBP.SCORE].to_numpy(dtype=object), None)
+
+    home_play_types = _classify_descriptions(descriptions=home_descriptions, has_score=has_score)
+    visitor_play_types = _classify_descriptions(descriptions=visitor_descriptions, has_score=has_score)
+    neutral_play_types = _classify_descriptions(descriptions=neutral_descriptions, has_score=has_score)
+
+    has_home_description = _has_text(home_descriptions)
+    has_visitor_description = _has_text(visitor_descriptions)
+
+    play_by_plays = play_by_plays.copy()
+    play_by_plays[PBP.DESCRIPTION] = np.where(
+        has_home_description, home_descriptions.to_numpy(dtype=object),
+        np.where(has_visitor_description, visitor_descriptions.to_numpy(dtype=object),
+                 neutral_descriptions.to_numpy(dtype=object)))
+    play_by_plays[PBP.PLAY_TYPE] = pd.Categorical(
+        np.where(has_home_description, home_play_types,
+                 np.where(has_visitor_description, visitor_play_types, neutral_play_types)),
+        categories=PLAY_TYPES)
+    play_by_plays[PBP.HOME_PLAY_TYPE] = pd.Categorical(home_play_types, categories=PLAY_TYPES)
+    play_by_plays[PBP.VISITOR_PLAY_TYPE] = pd.Categorical(visitor_play_types, categories=PLAY_TYPES)
+    return play_by_plays
+
+
+def _ensure_play_types(play_by_plays: pd.DataFrame) -> pd.DataFrame:
+    if PBP.PLAY_TYPE in play_by_plays.columns:
+        return play_by_plays
+    return classify_play_types(play_by_plays)
+
+
+def _get_play_type_values(play_types: pd.Series) -> np.ndarray:
+    return play_types.astype(object).where(play_types.notna(), None).to_numpy(dtype=object)
+
+
+def _get_previous_row_positions(game_ids: pd.Series) -> np.ndarray:
+    game_codes = pd.factorize(game_ids)[0]
+    game_starts = np.flatnonzero(np.r_[True, game_codes[1:] != game_codes[:-1]])
+    game_ends = np.r_[game_starts[1:], len(game_codes)]
+    previous_positions = np.arange(len(game_codes)) - 1
+    previous_positions[game_starts] = game_ends - 1
+    return previous_positions
+
+
+def _get_side_play_types(play_by_plays: pd.DataFrame, side_play_types: tuple) -> tuple[np.ndarray, np.ndarray]:
+    home_play_types = play_by_plays[PBP.HOME_PLAY_TYPE]
+    visitor_play_types = play_by_plays[PBP.VISITOR_PLAY_TYPE]
+    is_home = home_play_types.isin(side_play_types).to_numpy(dtype=bool)
+    is_visitor = ~is_home & visitor_play_types.isin(side_play_types).to_numpy(dtype=bool)
+    play_types = np.select([is_home, is_visitor],
+                           [_get_play_type_values(home_play_types), _get_play_type_values(visitor_play_types)],
+                           default=None)
+    return play_types, is_home
+
+
+def _explode_possession_lineups(possessions: pd.DataFrame, lineups: pd.DataFrame, lineup_id_column: str,
+                                team_id_column: str, names) -> pd.DataFrame:
+    lineups = lineups.drop_duplicates(subset=[LN.LINEUP_ID])
+    lineup_positions = pd.Index(lineups[LN.LINEUP_ID]).get_indexer(possessions[lineup_id_column])
+    possession_positions = np.flatnonzero(lineup_positions != -1)
+    if len(possession_positions) < len(possessions):
+        missing_lineup_ids = possessions[lineup_id_column].to_numpy()[lineup_positions == -1]
+        logging.warning(f"could not find any lineups for {len(missing_lineup_ids)} possessions, "
+                        f"{lineup_id_column}: {sorted(set(missing_lineup_ids.tolist()))}")
+    player_rows, player_ids = explode_lineup_matrix(get_lineup_matrix(lineups)[lineup_positions[possession_positions]])
+    possession_positions = possession_positions[player_rows]
+
+    return pd.DataFrame({
+        names.GAME_ID: possessions[LPBP.GAME_ID].to_numpy()[possession_positions],
+        names.POSSESSION_ID: possessions[LPBP.POSSESSION_ID].to_numpy()[possession_positions],
+        names.TEAM_ID: possessions[team_id_column].to_numpy()[possession_positions],
+        names.PLAYER_ID: player_ids.astype(np.int64),
+        POSSESSION_PLAYER_POSITION: np.arange(len(player_ids)),
+    })
+
+
+def _get_player_events(play_by_plays: pd.DataFrame, event_positions: np.ndarray, player_columns: list[tuple],
+                       names) -> pd.DataFrame:
+    events = play_by_plays.iloc[event_positions]
+    player_events = []
+    for player_id_column, team_id_column in player_columns:
+        slot_events = pd.DataFrame({
+            EVENT_POSITION: event_positions,
+            names.GAME_ID: events[PBP.GAME_ID].to_numpy(),
+            names.POSSESSION_ID: pd.to_numeric(events[PBP.POSSESSION_ID], errors='coerce').to_numpy(),
+            names.PLAYER_ID: pd.to_numeric(events[player_id_column], errors='coerce').to_numpy(),
+        })
+        if team_id_column is not None:
+            slot_events[names.TEAM_ID] = pd.to_numeric(events[team_id_column], errors='coerce').to_numpy()
+        player_events.append(slot_events.dropna())
+
+    player_events = pd.concat(player_events, ignore_index=True)
+    id_columns = [c for c in (names.POSSESSION_ID, names.PLAYER_ID, names.TEAM_ID) if c in player_events.columns]
+    player_events[id_columns] = player_events[id_columns].astype(np.int64)
+    return player_events
+
+
+def _attach_player_events(possession_players: pd.DataFrame, player_events: pd.DataFrame,
+                          join_columns: list[str]) -> pd.DataFrame:
+    possession_player_events = possession_players[[POSSESSION_PLAYER_POSITION, *join_columns]].merge(
+        player_events, on=join_columns)
+    possession_player_events = possession_player_events.drop_duplicates(
+        subset=[POSSESSION_PLAYER_POSITION, EVENT_POSITION])
+    return possession_player_events.sort_values(by=[POSSESSION_PLAYER_POSITION, EVENT_POSITION], kind="stable")
+
+
+def _sum_player_events(possession_players: pd.DataFrame, possession_player_events: pd.DataFrame,
+                       stat_columns: list[str]) -> pd.DataFrame:
+    stats = possession_player_events.groupby(POSSESSION_PLAYER_POSITION)[stat_columns].sum()
+    stats = stats.reindex(possession_players[POSSESSION_PLAYER_POSITION], fill_value=0)
+    possession_players = possession_players.drop(columns=[POSSESSION_PLAYER_POSITION])
+    for stat_column in stat_columns:
+        possession_players[stat_column] = stats[stat_column].to_numpy(dtype=np.int64)
+    return possession_players
 
 
 def _get_shot_attempt_type_by_text_description_and_play_type(text_description: str, play_type) -> Optional[str]:
@@ -84,21 +225,19 @@ def _get_shot_distance_by_text_description(text_description: str):
     return shot_distance
 
 
-def _get_offense_team_id(play_type: str, row: pd.Series, home_team_id, away_team_id, last_team_id):
+def _get_offense_team_id(play_type: str, home_description: Optional[str], player_team_ids: tuple, home_team_id,
+                         away_team_id, last_team_id):
     if play_type != 'end':
         if play_type == 'turnover':
-            if row[PBP.HOMEDESCRIPTION]:
+            if home_description:
                 team_id = home_team_id
             else:
                 team_id = away_team_id
 
         else:
-
-            team_id = int(row[PBP.PLAYER1_TEAM_ID]) if row[PBP.PLAYER1_TEAM_ID] else int(
-                row[PBP.PLAYER2_TEAM_ID]) if \
-                row[
-                    PBP.PLAYER2_TEAM_ID] else int(row[
-                                                      PBP.PLAYER3_TEAM_ID])
+            player1_team_id, player2_team_id, player3_team_id = player_team_ids
+            team_id = int(player1_team_id) if player1_team_id else int(player2_team_id) if player2_team_id else int(
+                player3_team_id)
     else:
         team_id = last_team_id
     return team_id
@@ -106,170 +245,82 @@ def _get_offense_team_id(play_type: str, row: pd.Series, home_team_id, away_team
 
 def generate_offense_player_play_by_plays(play_by_plays: pd.DataFrame,
                                           possessions: pd.DataFrame, lineups: pd.DataFrame) -> pd.DataFrame:
-    offense_player_play_by_plays = {
-        POPBP.GAME_ID: [],
-        POPBP.POINTS: [],
-        POPBP.POSSESSION_ID: [],
-        #  POPBP.ASSISTS: [],
-        POPBP.FOULS: [],
-        POPBP.REBOUNDS: [],
-        POPBP.PLAYER_ID: [],
-        POPBP.TEAM_ID: [],
-    }
-    tot_points = 0
-    for lineup_idx, row in possessions.iterrows():
-
-        offense_lineup_id = row[LPBP.LINEUP_ID_DEFENSE]
-        offense_players = lineups[lineups[LN.LINEUP_ID] == offense_lineup_id][LN.LINEUP].iloc[0]
-
-        for player_id in offense_players:
-
-            play_rows = play_by_plays[
-                (play_by_plays[PBP.PLAYER1_ID] == player_id) &
-                (play_by_plays[PBP.POSSESSION_ID] == row[LPBP.POSSESSION_ID])
-
-                ]
-
-            rebounds = 0
-            fouls = 0
-            points = 0
-
-            for play_row_idx, play_row in play_rows.iterrows():
-                home_description = play_row[PBP.HOMEDESCRIPTION]
-                away_description = play_row[PBP.VISITORDESCRIPTION]
-
-                home_play_type = _get_play_type_by_row(text_description=home_description, row=play_row)
-                away_play_type = _get_play_type_by_row(text_description=away_description, row=play_row)
-
-                if home_play_type is not None and home_play_type in (
-                        'score', 'miss', 'rebound', 'offensive foul'):
-                    play_type = home_play_type
-                    description = home_description
-                elif away_play_type is not None and away_play_type in (
-                        'score', 'miss', 'rebound', 'offensive foul'):
-                    play_type = away_play_type
-                    description = away_description
-                else:
-                    continue
-
-                if play_type == 'rebound':
-                    if play_type == 'rebound':
-                        miss_is_home = play_row[PBP.HOMEDESCRIPTION] is not None
-                        if miss_is_home and play_by_plays.iloc[play_row_idx - 1][PBP.HOMEDESCRIPTION]:
-                            rebounds += 1
-                        elif not miss_is_home and play_by_plays.iloc[play_row_idx - 1][PBP.VISITORDESCRIPTION]:
-                            rebounds += 1
-
-                elif play_type == 'offensive foul':
-                    fouls += 1
-                elif play_type == 'score':
-
-                    if 'Free Throw' in description:
-                        points += 1
-                        tot_points += 1
-                    elif '3PT' in description:
-                        points += 3
-                        tot_points += 3
-                    elif play_row[PBP.SCORE]:
-                        points += 2
-                        tot_points += 2
-
-            offense_player_play_by_plays[POPBP.GAME_ID].append(row[LPBP.GAME_ID])
-            offense_player_play_by_plays[POPBP.POSSESSION_ID].append(row[LPBP.POSSESSION_ID])
-            offense_player_play_by_plays[POPBP.FOULS].append(fouls)
-            offense_player_play_by_plays[POPBP.POINTS].append(points)
-            offense_player_play_by_plays[POPBP.REBOUNDS].append(rebounds)
-            offense_player_play_by_plays[POPBP.PLAYER_ID].append(player_id)
-            offense_player_play_by_plays[POPBP.TEAM_ID].append(row[LPBP.TEAM_ID_OFFENSE])
-
-    return pd.DataFrame.from_dict(offense_player_play_by_plays)
+    play_by_plays = _ensure_play_types(play_by_plays)
+    play_types, is_home = _get_side_play_types(play_by_plays, OFFENSE_PLAY_TYPES)
+    home_descriptions = play_by_plays[PBP.HOMEDESCRIPTION]
+    descriptions = home_descriptions.where(is_home, play_by_plays[PBP.VISITORDESCRIPTION])
+
+    miss_is_home = home_descriptions.notna().to_numpy(dtype=bool)
+    previous_positions = _get_previous_row_positions(play_by_plays[PBP.GAME_ID])
+    prev_has_home_description = _has_text(home_descriptions)[previous_positions]
+    prev_has_visitor_description = _has_text(play_by_plays[PBP.VISITORDESCRIPTION])[previous_positions]
+    is_score = play_types == 'score'
+
+    event_positions = np.flatnonzero(pd.notna(play_types))
+    player_events = _get_player_events(play_by_plays, event_positions=event_positions,
+                                       player_columns=[(PBP.PLAYER1_ID, None)], names=POPBP)
+    player_events[POPBP.REBOUNDS] = ((play_types == 'rebound') & np.where(
+        miss_is_home, prev_has_home_description, prev_has_visitor_description))[player_events[EVENT_POSITION]]
+    player_events[POPBP.FOULS] = (play_types == 'offensive foul')[player_events[EVENT_POSITION]]
+    player_events[POPBP.POINTS] = np.select(
+        [is_score & descriptions.str.contains('Free Throw', regex=False, na=False).to_numpy(dtype=bool),
+         is_score & descriptions.str.contains('3PT', regex=False, na=False).to_numpy(dtype=bool),
+         is_score & _has_text(play_by_plays[PBP.SCORE])],
+        [1, 3, 2], default=0)[player_events[EVENT_POSITION]]
+
+    offense_players = _explode_possession_lineups(possessions, lineups, lineup_id_column=LPBP.LINEUP_ID_OFFENSE,
+                                                  team_id_column=LPBP.TEAM_ID_OFFENSE, names=POPBP)
+    offense_player_events = _attach_player_events(
+        offense_players, player_events, join_columns=[POPBP.GAME_ID, POPBP.POSSESSION_ID, POPBP.PLAYER_ID])
+    offense_player_play_by_plays = _sum_player_events(offense_players, offense_player_events,
+                                                      stat_columns=[POPBP.POINTS, POPBP.FOULS, POPBP.REBOUNDS])
+
+    return apply_schema(offense_player_play_by_plays[[POPBP.GAME_ID, POPBP.POINTS, POPBP.POSSESSION_ID, POPBP.FOULS,
+                                                      POPBP.REBOUNDS, POPBP.PLAYER_ID, POPBP.TEAM_ID]], POPBP)
 
 
 def generate_defense_player_play_by_plays(play_by_plays: pd.DataFrame,
                                           possessions: pd.DataFrame, lineups: pd.DataFrame) -> pd.DataFrame:
-    defense_player_play_by_plays = {
-        PDPBP.POSSESSION_ID: [],
-        PDPBP.STEALS: [],
-        PDPBP.BLOCKS: [],
-        PDPBP.REBOUNDS: [],
-        PDPBP.PLAYER_ID: [],
-        PDPBP.TEAM_ID: [],
-        PDPBP.GAME_ID: [],
-    }
-
-    player_defensive_rebounds = {p: 0 for p in play_by_plays[PBP.PLAYER1_ID].unique().tolist()}
-
-    for lineup_idx, row in possessions.iterrows():
-
-        defense_lineup_id = row[LPBP.LINEUP_ID_DEFENSE]
-        defensive_players = lineups[lineups[LN.LINEUP_ID] == defense_lineup_id][LN.LINEUP].iloc[0]
-        team_id_defense = row[LPBP.TEAM_ID_DEFENSE]
-        for player_id in defensive_players:
-
-            play_rows = play_by_plays[
-                (play_by_plays[PBP.PLAYER1_ID] == player_id) &
-                (play_by_plays[PBP.POSSESSION_ID] == row[LPBP.POSSESSION_ID]) &
-                (play_by_plays[PBP.PLAYER1_TEAM_ID] == team_id_defense) |
-                (play_by_plays[PBP.PLAYER2_ID] == player_id) &
-                (play_by_plays[PBP.POSSESSION_ID] == row[LPBP.POSSESSION_ID]) &
-                (play_by_plays[PBP.PLAYER2_TEAM_ID] == team_id_defense) |
-                (play_by_plays[PBP.PLAYER3_ID] == player_id) &
-                (play_by_plays[PBP.POSSESSION_ID] == row[LPBP.POSSESSION_ID]) &
-                (play_by_plays[PBP.PLAYER3_TEAM_ID] == team_id_defense)
-                ]
-
-            rebounds = 0
-            fouls = 0
-            steals = 0
-            blocks = 0
-
-            for play_row_idx, play_row in play_rows.iterrows():
-
-                home_description = play_row[PBP.HOMEDESCRIPTION]
-                away_description = play_row[PBP.VISITORDESCRIPTION]
-
-                home_play_type = _get_play_type_by_row(text_description=home_description, row=play_row)
-                away_play_type = _get_play_type_by_row(text_description=away_description, row=play_row)
-
-                if home_play_type is not None and home_play_type in (
-                        'rebound', 'steal', 'block', 'defensive foul'):
-                    play_type = home_play_type
-                elif away_play_type is not None and away_play_type in (
-                        'rebound', 'steal', 'block', 'defensive foul'):
-                    play_type = away_play_type
-                else:
-                    continue
-
-                if play_type == 'rebound':
-
-                    if home_description and 'REBOUND' in home_description:
-                        def_rebound_value = int(home_description.split('Def:')[1:][0].split(")")[0])
-                        if def_rebound_value > player_defensive_rebounds[player_id]:
-                            rebounds += 1
-                        player_defensive_rebounds[player_id] = def_rebound_value
-                    elif away_description and 'REBOUND' in away_description:
-                        def_rebound_value = int(away_description.split('Def:')[1:][0].split(")")[0])
-                        if def_rebound_value > player_defensive_rebounds[player_id]:
-                            rebounds += 1
-                        player_defensive_rebounds[player_id] = int(away_description.split('Def:')[1:][0].split(")")[0])
-
-
-                elif play_type == 'defensive foul':
-                    fouls += 1
-                elif play_type == 'steal':
-                    steals += 1
-                elif play_type == 'block':
-                    blocks += 1
-
-            defense_player_play_by_plays[PDPBP.GAME_ID].append(row[LPBP.GAME_ID])
-            defense_player_play_by_plays[PDPBP.POSSESSION_ID].append(row[LPBP.POSSESSION_ID])
-            defense_player_play_by_plays[PDPBP.STEALS].append(steals)
-            defense_player_play_by_plays[PDPBP.BLOCKS].append(blocks)
-            defense_player_play_by_plays[PDPBP.REBOUNDS].append(rebounds)
-            defense_player_play_by_plays[PDPBP.PLAYER_ID].append(player_id)
-            defense_player_play_by_plays[PDPBP.TEAM_ID].append(row[LPBP.TEAM_ID_DEFENSE])
-
-    return pd.DataFrame.from_dict(defense_player_play_by_plays)
+    play_by_plays = _ensure_play_types(play_by_plays)
+    play_types, _ = _get_side_play_types(play_by_plays, DEFENSE_PLAY_TYPES)
+    home_descriptions = play_by_plays[PBP.HOMEDESCRIPTION]
+    visitor_descriptions = play_by_plays[PBP.VISITORDESCRIPTION]
+    home_rebound = home_descriptions.str.contains('REBOUND', regex=False, na=False).to_numpy(dtype=bool)
+    visitor_rebound = visitor_descriptions.str.contains('REBOUND', regex=False, na=False).to_numpy(dtype=bool)
+    rebound_descriptions = home_descriptions.where(home_rebound, visitor_descriptions.where(visitor_rebound))
+    defensive_rebound_values = pd.to_numeric(rebound_descriptions.str.extract(r'Def:([^)]*)', expand=False),
+                                             errors='coerce').to_numpy(dtype=float)
+    defensive_rebound_values[play_types != 'rebound'] = np.nan
+
+    event_positions = np.flatnonzero(pd.notna(play_types))
+    player_events = _get_player_events(
+        play_by_plays, event_positions=event_positions,
+        player_columns=[(PBP.PLAYER1_ID, PBP.PLAYER1_TEAM_ID), (PBP.PLAYER2_ID, PBP.PLAYER2_TEAM_ID),
+                        (PBP.PLAYER3_ID, PBP.PLAYER3_TEAM_ID)],
+        names=PDPBP)
+    player_events[PDPBP.STEALS] = (play_types == 'steal')[player_events[EVENT_POSITION]]
+    player_events[PDPBP.BLOCKS] = (play_types == 'block')[player_events[EVENT_POSITION]]
+
+    defense_players = _explode_possession_lineups(possessions, lineups, lineup_id_column=LPBP.LINEUP_ID_DEFENSE,
+                                                  team_id_column=LPBP.TEAM_ID_DEFENSE, names=PDPBP)
+    defense_player_events = _attach_player_events(
+        defense_players, player_events,
+        join_columns=[PDPBP.GAME_ID, PDPBP.POSSESSION_ID, PDPBP.PLAYER_ID, PDPBP.TEAM_ID])
+
+    rebound_values = pd.Series(defensive_rebound_values[defense_player_events[EVENT_POSITION]],
+                               index=defense_player_events.index)
+    player_rebound_values = rebound_values.dropna()
+    rebound_players = defense_player_events.loc[player_rebound_values.index, [PDPBP.GAME_ID, PDPBP.PLAYER_ID]]
+    prev_rebound_values = player_rebound_values.groupby(
+        [rebound_players[PDPBP.GAME_ID], rebound_players[PDPBP.PLAYER_ID]], observed=True).shift(1).fillna(0)
+    defense_player_events[PDPBP.REBOUNDS] = (player_rebound_values > prev_rebound_values).reindex(
+        defense_player_events.index, fill_value=False)
+
+    defense_player_play_by_plays = _sum_player_events(defense_players, defense_player_events,
+                                                      stat_columns=[PDPBP.STEALS, PDPBP.BLOCKS, PDPBP.REBOUNDS])
+
+    return apply_schema(defense_player_play_by_plays[[PDPBP.POSSESSION_ID, PDPBP.STEALS, PDPBP.BLOCKS, PDPBP.REBOUNDS,
+                                                      PDPBP.PLAYER_ID, PDPBP.TEAM_ID, PDPBP.GAME_ID]], PDPBP)
 
 
 def generate_possession_from_attempts(possession_attempts: pd.DataFrame) -> pd.DataFrame:
@@ -277,7 +328,7 @@ def generate_possession_from_attempts(possession_attempts: pd.DataFrame) -> pd.D
                    .groupby(
         [LPBP.GAME_ID, LPBP.POSSESSION_ID, LPBP.TEAM_ID_OFFENSE, LPBP.TEAM_ID_DEFENSE, LPBP.LINEUP_ID_OFFENSE,
          LPBP.LINEUP_ID_DEFENSE,
-         LPBP.SECONDS_PLAYED_START]).agg(
+         LPBP.SECONDS_PLAYED_START], sort=False, observed=True).agg(
         {
             LPBP.POINTS: 'sum',
             LPBP.FREE_THROW_ATTEMPTS: 'sum',
@@ -288,15 +339,19 @@ def generate_possession_from_attempts(possession_attempts: pd.DataFrame) -> pd.D
         }
     )
                    .reset_index()
-                   .drop_duplicates(subset=[LPBP.POSSESSION_ID, LPBP.TEAM_ID_OFFENSE, LPBP.TEAM_ID_DEFENSE])
+                   .drop_duplicates(subset=[LPBP.GAME_ID, LPBP.POSSESSION_ID, LPBP.TEAM_ID_OFFENSE,
+                                            LPBP.TEAM_ID_DEFENSE])
                    )
 
-    return possessions
+    game_order = pd.Index(possession_attempts[LPBP.GAME_ID].unique()).get_indexer(possessions[LPBP.GAME_ID])
+    possessions = possessions.iloc[np.lexsort((possessions[LPBP.TEAM_ID_DEFENSE], possessions[LPBP.TEAM_ID_OFFENSE],
+                                               possessions[LPBP.POSSESSION_ID], game_order))]
+    return apply_schema(possessions, LPBP)
 
 
 def generate_possession_attempts(play_by_plays: pd.DataFrame,
-                                 inplay_lineups: pd.DataFrame, home_team_id: int, away_team_id: int) -> Tuple[
-    pd.DataFrame, pd.DataFrame]:
+                                 inplay_lineups: pd.DataFrame, home_team_id: Union[int, dict[str, int]],
+                                 away_team_id: Union[int, dict[str, int]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
     lineup_possession_attempts = {
         LPBP.GAME_ID: [],
         LPBP.TEAM_ID_OFFENSE: [],
@@ -316,32 +371,68 @@ def generate_possession_attempts(play_by_plays: pd.DataFrame,
         LPBP.PLAY_END_REASON: [],
         #   LPBP.PRECEEDED_BY: [],
     }
-    play_by_plays = play_by_plays.sort_values(by=[PBP.SECONDS_PLAYED, PBP.EVENTNUM])
+    play_by_plays = _ensure_play_types(play_by_plays)
+    game_order = pd.factorize(play_by_plays[PBP.GAME_ID])[0]
+    play_by_plays = play_by_plays.iloc[np.lexsort((play_by_plays[PBP.EVENTNUM].to_numpy(),
+                                                   play_by_plays[PBP.SECONDS_PLAYED].to_numpy(),
+                                                   game_order))]
     play_by_plays = play_by_plays.reset_index(drop=True)
-    possession_start_seconds_played = None
-
-    last_team_id = None
-    team_id_offense = None
-    score_offense = 0
-    score_defense = 0
 
-    possession_attempt_id = 1
-    possession_id = 1
-    points = 0
-    field_goal_attempts = 0
-    free_throw_attempts = 0
-    player_defensive_rebounds = {p: 0 for p in play_by_plays[PBP.PLAYER1_ID].unique().tolist()}
-
-    for idx, row in play_by_plays.iterrows():
-        seconds_played = row[PBP.SECONDS_PLAYED]
-        description = row[PBP.HOMEDESCRIPTION] if row[PBP.HOMEDESCRIPTION] else row['VISITORDESCRIPTION'] if row[
-            'VISITORDESCRIPTION'] else row['NEUTRALDESCRIPTION']
+    game_ids = play_by_plays[PBP.GAME_ID].tolist()
+    seconds_played_values = play_by_plays[PBP.SECONDS_PLAYED].tolist()
+    descriptions = play_by_plays[PBP.DESCRIPTION].tolist()
+    home_descriptions = play_by_plays[PBP.HOMEDESCRIPTION].tolist()
+    visitor_descriptions = play_by_plays[PBP.VISITORDESCRIPTION].tolist()
+    scores = play_by_plays[PBP.SCORE].tolist()
+    player1_ids = play_by_plays[PBP.PLAYER1_ID].tolist()
+    player_team_ids = list(zip(play_by_plays[PBP.PLAYER1_TEAM_ID].tolist(),
+                               play_by_plays[PBP.PLAYER2_TEAM_ID].tolist(),
+                               play_by_plays[PBP.PLAYER3_TEAM_ID].tolist()))
+    play_types = _get_play_type_values(play_by_plays[PBP.PLAY_TYPE])
+    previous_positions = _get_previous_row_positions(play_by_plays[PBP.GAME_ID])
+
+    lineup_timeline = LineupTimeline(inplay_lineups)
+    lineup_ids = lineup_timeline.inplay_lineups[TIPL.LINEUP_ID].tolist()
+    lineup_ids_opponent = lineup_timeline.inplay_lineups[TIPL.LINEUP_ID_OPPONENT].tolist()
+
+    possession_ids = np.full(len(play_by_plays), np.nan)
+    possession_attempt_ids = np.full(len(play_by_plays), np.nan)
+    current_game_id = None
+
+    for idx, description in enumerate(descriptions):
+        seconds_played = seconds_played_values[idx]
+        game_id = game_ids[idx]
+
+        if game_id != current_game_id:
+            current_game_id = game_id
+            game_start_idx = idx
+            game_home_team_id = home_team_id[game_id] if isinstance(home_team_id, dict) else home_team_id
+            game_away_team_id = away_team_id[game_id] if isinstance(away_team_id, dict) else away_team_id
+
+            possession_start_seconds_played = None
+            possession_attempt_start_seconds_played = None
+
+            last_team_id = None
+            team_id_offense = None
+            team_id_defense = None
+            score_offense = 0
+            score_defense = 0
+
+            possession_attempt_id = 1
+            possession_id = 1
+            points = 0
+            field_goal_attempts = 0
+            free_throw_attempts = 0
+            player_defensive_rebounds = {}
 
         if description is None:
-            logging.warning(f"no description for row {idx}, gameId: {row[PBP.GAME_ID]}")
+            logging.warning(f"no description for row {idx - game_start_idx}, gameId: {game_id}")
             continue
 
-        play_type = _get_play_type_by_row(row=row, text_description=description)
+        play_type = play_types[idx]
+        home_description = home_descriptions[idx]
+        visitor_description = visitor_descriptions[idx]
+        previous_idx = previous_positions[idx]
 
         if possession_start_seconds_played is None:
             possession_start_seconds_played = seconds_played
@@ -352,88 +443,83 @@ def generate_possession_attempts(play_by_plays: pd.DataFrame,
         if 'Jump Ball' in description:
             possession_attempt_start_seconds_played = seconds_played
 
-        if play_type in ('miss',
-                         'score', 'steal', 'turnover', 'end', 'offensive foul',
-                         'rebound') or 'Free Throw 1 of 1' in description \
-                or 'Free Throw 2 of 2' in description or 'Free Throw 3 of 3' in description:
+        is_last_free_throw = 'Free Throw 1 of 1' in description or 'Free Throw 2 of 2' in description \
+            or 'Free Throw 3 of 3' in description
+
+        if play_type in ('miss', 'score', 'steal', 'turnover', 'end', 'offensive foul',
+                         'rebound') or is_last_free_throw:
 
-            player1_id = row[PBP.PLAYER1_ID]
-            defensive_rebound = False
+            player1_id = player1_ids[idx]
 
             if play_type == 'rebound':
-                if row[PBP.HOMEDESCRIPTION] and 'REBOUND' in row[PBP.HOMEDESCRIPTION]:
-                    new_rebound_player = int(row[PBP.HOMEDESCRIPTION].split('Def:')[1:][0].split(")")[0])
-                    if new_rebound_player > player_defensive_rebounds[player1_id]:
+                if home_description and 'REBOUND' in home_description:
+                    new_rebound_player = int(home_description.split('Def:')[1:][0].split(")")[0])
+                    if new_rebound_player > player_defensive_rebounds.get(player1_id, 0):
                         defensive_rebound = True
-                        team_id_offense = away_team_id
-                        team_id_defense = home_team_id
+                        team_id_offense = game_away_team_id
+                        team_id_defense = game_home_team_id
                     else:
-                        team_id_offense = home_team_id
-                        team_id_defense = away_team_id
+                        team_id_offense = game_home_team_id
+                        team_id_defense = game_away_team_id
                     player_defensive_rebounds[player1_id] = new_rebound_player
 
-                elif row[PBP.HOMEDESCRIPTION] and 'rebound' in row[PBP.HOMEDESCRIPTION] and play_by_plays.iloc[idx - 1][
-                    PBP.VISITORDESCRIPTION] and 'MISS' in \
-                        play_by_plays.iloc[idx - 1][PBP.VISITORDESCRIPTION]:
+                elif home_description and 'rebound' in home_description and visitor_descriptions[previous_idx] \
+                        and 'MISS' in visitor_descriptions[previous_idx]:
                     defensive_rebound = True
 
-
-                elif row[PBP.VISITORDESCRIPTION] and 'REBOUND' in row[PBP.VISITORDESCRIPTION]:
-
-                    new_rebound_player = int(row[PBP.VISITORDESCRIPTION].split('Def:')[1:][0].split(")")[0])
-                    if new_rebound_player > player_defensive_rebounds[player1_id]:
+                elif visitor_description and 'REBOUND' in visitor_description:
+                    new_rebound_player = int(visitor_description.split('Def:')[1:][0].split(")")[0])
+                    if new_rebound_player > player_defensive_rebounds.get(player1_id, 0):
                         defensive_rebound = True
-                        team_id_offense = home_team_id
-                        team_id_defense = away_team_id
+                        team_id_offense = game_home_team_id
+                        team_id_defense = game_away_team_id
                     else:
-                        team_id_offense = away_team_id
-                        team_id_defense = home_team_id
+                        team_id_offense = game_away_team_id
+                        team_id_defense = game_home_team_id
                     player_defensive_rebounds[player1_id] = new_rebound_player
 
-                elif row[PBP.VISITORDESCRIPTION] and 'Rebound' in row[PBP.VISITORDESCRIPTION] and \
-                        play_by_plays.iloc[idx - 1][PBP.HOMEDESCRIPTION] and 'MISS' in \
-                        play_by_plays.iloc[idx - 1][PBP.HOMEDESCRIPTION]:
+                elif visitor_description and 'Rebound' in visitor_description and home_descriptions[previous_idx] \
+                        and 'MISS' in home_descriptions[previous_idx]:
                     defensive_rebound = True
 
             else:
-                team_id_offense = _get_offense_team_id(row=row, play_type=play_type, home_team_id=home_team_id,
-                                                       away_team_id=away_team_id,
+                team_id_offense = _get_offense_team_id(play_type=play_type, home_description=home_description,
+                                                       player_team_ids=player_team_ids[idx],
+                                                       home_team_id=game_home_team_id, away_team_id=game_away_team_id,
                                                        last_team_id=last_team_id)
-                if team_id_offense == home_team_id:
-                    team_id_defense = away_team_id
+                if team_id_offense == game_home_team_id:
+                    team_id_defense = game_away_team_id
                 else:
-                    team_id_defense = home_team_id
-
-            lineup_row = inplay_lineups[
-                (inplay_lineups[TIPL.SECONDS_PLAYED_START] < seconds_played) &
-                (inplay_lineups[TIPL.SECONDS_PLAYED_END] >= seconds_played) &
-                (inplay_lineups[TIPL.TEAM_ID] == team_id_offense)
-                ]
-            if len(lineup_row) == 0:
+                    team_id_defense = game_home_team_id
+
+            lineup_position = lineup_timeline.lookup_one(game_id=game_id, team_id=team_id_offense,
+                                                         seconds_played=seconds_played, closed="right")
+            if lineup_position is None:
                 logging.warning("could not find any lineups")
                 continue
             else:
-                lineup_id = lineup_row[TIPL.LINEUP_ID].tolist()[0]
-                lineup_id_defense = lineup_row[TIPL.LINEUP_ID_OPPONENT].tolist()[0]
+                lineup_id = lineup_ids[lineup_position]
+                lineup_id_defense = lineup_ids_opponent[lineup_position]
 
             if play_type == 'miss' and 'Free Throw' not in description:
                 field_goal_attempts += 1
 
             if play_type == "score":
-                away_score = int(row['SCORE'].split(" -")[0])
-                home_score = int(row['SCORE'].split("- ")[1])
+                score = scores[idx]
+                away_score = int(score.split(" -")[0])
+                home_score = int(score.split("- ")[1])
 
                 prev_home_score = home_score
                 prev_away_score = away_score
 
-                if row[PBP.HOMEDESCRIPTION]:
+                if home_description:
                     if 'Free Throw' in description:
                         prev_home_score -= 1
                         free_throw_attempts += 1
                     elif '3PT' in description:
                         prev_home_score -= 3
                         field_goal_attempts += 1
-                    elif row[PBP.SCORE]:
+                    elif score:
                         prev_home_score -= 2
                         field_goal_attempts += 1
                 else:
@@ -443,11 +529,11 @@ def generate_possession_attempts(play_by_plays: pd.DataFrame,
                     elif '3PT' in description:
                         prev_away_score -= 3
                         field_goal_attempts += 1
-                    elif row[PBP.SCORE]:
+                    elif score:
                         prev_away_score -= 2
                         field_goal_attempts += 1
 
-                if row[PBP.HOMEDESCRIPTION]:
+                if home_description:
                     score_offense = prev_home_score
                     score_defense = prev_away_score
                     points += home_score - prev_home_score
@@ -457,34 +543,13 @@ def generate_possession_attempts(play_by_plays: pd.DataFrame,
                     score_defense = home_score
                     points += away_score - prev_away_score
 
-            if idx > 0:
-                prev_row = play_by_plays.iloc[idx - 1]
-                prev_description = prev_row[PBP.HOMEDESCRIPTION] if prev_row[PBP.HOMEDESCRIPTION] else prev_row[
-                    'VISITORDESCRIPTION'] if \
-                    prev_row[
-                        'VISITORDESCRIPTION'] else prev_row['NEUTRALDESCRIPTION']
-                prev_play_type = _get_play_type_by_row(row=prev_row, text_description=prev_description)
-                if prev_row[PBP.HOMEDESCRIPTION] and row[PBP.HOMEDESCRIPTION] or prev_row[PBP.VISITORDESCRIPTION] and \
-                        row[PBP.VISITORDESCRIPTION]:
-                    team_prev_posession = True
-                else:
-                    team_prev_posession = False
-            else:
-                prev_play_type = None
-                team_prev_posession = None
-
-        #  lineup_possession_attempts[LPBP.TEAM_PREV_POSSESION].append(team_prev_posession)
-        # lineup_possession_attempts[LPBP.PRECEEDED_BY].append(prev_play_type)
-
-        play_by_plays.at[idx, LPBP.POSSESSION_ID] = possession_id
-        play_by_plays.at[idx, LPBP.POSSESSION_ATTEMPT_ID] = possession_attempt_id
+        possession_ids[idx] = possession_id
+        possession_attempt_ids[idx] = possession_attempt_id
 
-        if play_type in ('miss', 'steal', 'turnover', 'end',
-                         'offensive foul') or 'Free Throw 1 of 1' in description \
-                or 'Free Throw 2 of 2' in description or 'Free Throw 3 of 3' in description or defensive_rebound \
-                or 'Free Throw' not in description and play_type == 'score':
+        if play_type in ('miss', 'steal', 'turnover', 'end', 'offensive foul') or is_last_free_throw \
+                or defensive_rebound or 'Free Throw' not in description and play_type == 'score':
 
-            lineup_possession_attempts[LPBP.GAME_ID].append(row[PBP.GAME_ID])
+            lineup_possession_attempts[LPBP.GAME_ID].append(game_id)
             lineup_possession_attempts[LPBP.POSSESSION_ID].append(possession_id)
             lineup_possession_attempts[LPBP.POSSESSION_ATTEMPT_ID].append(possession_attempt_id)
             lineup_possession_attempts[LPBP.SECONDS_PLAYED_END].append(seconds_played)
@@ -514,7 +579,11 @@ def generate_possession_attempts(play_by_plays: pd.DataFrame,
 
         last_team_id = team_id_offense
 
-    return pd.DataFrame.from_dict(lineup_possession_attempts), play_by_plays
+    if not np.isnan(possession_ids).all():
+        play_by_plays[LPBP.POSSESSION_ID] = possession_ids
+        play_by_plays[LPBP.POSSESSION_ATTEMPT_ID] = possession_attempt_ids
+
+    return apply_schema(pd.DataFrame.from_dict(lineup_possession_attempts), LPBP), play_by_plays
 
 
 def generate_shot_plays(play_by_plays: pd.DataFrame, inplay_lineups: pd.DataFrame) -> pd.DataFrame:
@@ -523,26 +592,48 @@ def generate_shot_plays(play_by_plays: pd.DataFrame, inplay_lineups: pd.DataFram
         SP.SECONDS_PLAYED: [],
         SP.SCORE: [],
         SP.SCORE_OPPONENT: [],
-        SP.LINEUP: [],
-        SP.LINEUP_OPPONENT: [],
+        SP.LINEUP_ID: [],
+        SP.LINEUP_ID_OPPONENT: [],
         SP.TEAM_ID: [],
         SP.PLAYER_ID: [],
         SP.SHOT_TYPE: [],
         SP.SHOT_DISTANCE: [],
         SP.SUCCESS: [],
     }
+    play_by_plays = _ensure_play_types(play_by_plays)
     play_by_plays = play_by_plays.reset_index(drop=True)
-    home_score = None
-    away_score = None
-    for ix, row in play_by_plays.iterrows():
-
-        seconds_played = row[PBP.SECONDS_PLAYED]
-        description = row[PBP.HOMEDESCRIPTION] if row[PBP.HOMEDESCRIPTION] else row['VISITORDESCRIPTION'] if row[
-            'VISITORDESCRIPTION'] else row['NEUTRALDESCRIPTION']
+    shots = play_by_plays[play_by_plays[PBP.PLAY_TYPE].isin(['miss', 'score'])]
 
-        play_type = _get_play_type_by_row(row=row, text_description=description)
-        if play_type not in ('miss', 'score'):
+    shot_team_ids = {}
+    for ix, row in shots.iterrows():
+        try:
+            shot_team_ids[ix] = int(row[PBP.PLAYER1_TEAM_ID]) if row[PBP.PLAYER1_TEAM_ID] else int(
+                row[PBP.PLAYER2_TEAM_ID]) if row[PBP.PLAYER2_TEAM_ID] else int(row[PBP.PLAYER3_TEAM_ID])
+        except ValueError:
+            continue
+    shots = shots.loc[list(shot_team_ids)]
+
+    lineup_timeline = LineupTimeline(inplay_lineups)
+    lineup_positions = lineup_timeline.lookup(game_ids=shots[PBP.GAME_ID].to_numpy(),
+                                              team_ids=np.array(list(shot_team_ids.values()), dtype=np.int64),
+                                              seconds_played=shots[PBP.SECONDS_PLAYED].to_numpy(), closed="left")
+    lineup_ids = lineup_timeline.inplay_lineups[TIPL.LINEUP_ID].tolist()
+    lineup_ids_opponent = lineup_timeline.inplay_lineups[TIPL.LINEUP_ID_OPPONENT].tolist()
+
+    current_game_id = None
+    for (ix, row), lineup_position in zip(shots.iterrows(), lineup_positions):
+        if row[PBP.GAME_ID] != current_game_id:
+            current_game_id = row[PBP.GAME_ID]
+            home_score = None
+            away_score = None
+
+        if lineup_position == -1:
+            logging.warning("could not find any lineups")
             continue
+
+        description = row[PBP.DESCRIPTION]
+        play_type = row[PBP.PLAY_TYPE]
+        team_id = shot_team_ids[ix]
         shot_attempt_type = _get_shot_attempt_type_by_text_description_and_play_type(text_description=description,
                                                                                      play_type=play_type)
         if shot_attempt_type in ('2pt', '3pt'):
@@ -552,30 +643,14 @@ def generate_shot_plays(play_by_plays: pd.DataFrame, inplay_lineups: pd.DataFram
 
         player_id = row[PBP.PLAYER1_ID] if row[PBP.PLAYER1_ID] else row[PBP.PLAYER2_ID] if row[PBP.PLAYER2_ID] else row[
             PBP.PLAYER3_ID]
-        try:
-            team_id = int(row[PBP.PLAYER1_TEAM_ID]) if row[PBP.PLAYER1_TEAM_ID] else int(row[PBP.PLAYER2_TEAM_ID]) if \
-                row[
-                    PBP.PLAYER2_TEAM_ID] else int(row[
-                                                      PBP.PLAYER3_TEAM_ID])
-        except ValueError:
-            continue
 
         if 'miss' in play_type:
             success = False
         else:
             success = True
 
-        lineup_row = inplay_lineups[
-            (inplay_lineups[TIPL.SECONDS_PLAYED_START] <= seconds_played) &
-            (inplay_lineups[TIPL.SECONDS_PLAYED_END] > seconds_played) &
-            (inplay_lineups[TIPL.TEAM_ID] == team_id)
-            ]
-        if len(lineup_row) == 0:
-            logging.warning("could not find any lineups")
-            continue
-        else:
-            lineup = lineup_row[TIPL.LINEUP].tolist()[0]
-            lineup_opponent = lineup_row[TIPL.LINEUP_OPPONENT].tolist()[0]
+        lineup_id = lineup_ids[lineup_position]
+        lineup_id_opponent = lineup_ids_opponent[lineup_position]
 
         if play_type == "score":
             away_score = int(row['SCORE'].split(" -")[0])
@@ -595,26 +670,64 @@ def generate_shot_plays(play_by_plays: pd.DataFrame, inplay_lineups: pd.DataFram
         shot_plays[SP.TEAM_ID].append(team_id)
         shot_plays[SP.SHOT_DISTANCE].append(shot_distance)
         shot_plays[SP.SUCCESS].append(success)
-        shot_plays[SP.LINEUP].append(lineup)
-        shot_plays[SP.LINEUP_OPPONENT].append(lineup_opponent)
+        shot_plays[SP.LINEUP_ID].append(lineup_id)
+        shot_plays[SP.LINEUP_ID_OPPONENT].append(lineup_id_opponent)
         shot_plays[SP.SCORE].append(score)
         shot_plays[SP.SCORE_OPPONENT].append(score_opponent)
 
-    return pd.DataFrame.from_dict(shot_plays)
+    return apply_schema(pd.DataFrame.from_dict(shot_plays), SP)
+
+
+def add_rotation_seconds_played(team_rotations: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    return [
+        rotation.assign(**{
+            RN.IN_TIME_SECONDS_PLAYED: rotation[RN.IN_TIME_REAL].to_numpy() / 10,
+            RN.OUT_TIME_SECONDS_PLAYED: rotation[RN.OUT_TIME_REAL].to_numpy() / 10,
+        })
+        for rotation in team_rotations
+    ]
 
 
-def generate_inplay_lineups(team_rotations: list[pd.DataFrame], lineups: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+def _get_rotation_events(game_team_rotation: pd.DataFrame, time_column: str) -> list[tuple[float, list]]:
+    rotation_events = game_team_rotation[[time_column, RN.PERSON_ID]].sort_values(by=time_column, kind="stable")
+    events = {}
+    for seconds_played, person_id in zip(rotation_events[time_column].tolist(),
+                                         rotation_events[RN.PERSON_ID].tolist()):
+        events.setdefault(seconds_played, dict())[person_id] = None
+    return [(seconds_played, list(person_ids)) for seconds_played, person_ids in events.items()]
+
+
+def _pop_rotation_events(events: list[tuple[float, list]], position: int, seconds_played: float) -> tuple[int, list]:
+    while position < len(events) and events[position][0] < seconds_played:
+        position += 1
+    if position < len(events) and events[position][0] == seconds_played:
+        return position + 1, events[position][1]
+    return position, []
+
+
+def generate_inplay_lineups(team_rotations: list[pd.DataFrame],
+                            lineup_registry: LineupRegistry) -> tuple[pd.DataFrame, pd.DataFrame]:
     inplay_lineups = {
+        TIPL.GAME_ID: [],
         TIPL.TEAM_ID: [],
         TIPL.LINEUP_ID: [],
         TIPL.LINEUP_ID_OPPONENT: [],
         TIPL.SECONDS_PLAYED_START: [],
         TIPL.SECONDS_PLAYED_END: [],
-        TIPL.LINEUP: [],
-        TIPL.LINEUP_OPPONENT: [],
     }
-    game_rotations = pd.concat(team_rotations)
+    rotations = pd.concat(team_rotations)
+    for game_id, game_rotations in rotations.groupby(RN.GAME_ID, sort=False):
+        _sweep_game_rotations(game_id=game_id, game_rotations=game_rotations, lineup_registry=lineup_registry,
+                              inplay_lineups=inplay_lineups)
+
+    inplay_lineups = apply_schema(pd.DataFrame.from_dict(inplay_lineups), TIPL)
+    lineups = lineup_registry.to_frame(
+        lineup_ids=inplay_lineups[TIPL.LINEUP_ID].tolist() + inplay_lineups[TIPL.LINEUP_ID_OPPONENT].tolist())
+    return inplay_lineups, lineups
 
+
+def _sweep_game_rotations(game_id: str, game_rotations: pd.DataFrame, lineup_registry: LineupRegistry,
+                          inplay_lineups: dict[str, list]) -> None:
     game_rotations = game_rotations.sort_values(by=[RN.IN_TIME_SECONDS_PLAYED, RN.OUT_TIME_SECONDS_PLAYED],
                                                 ascending=True)
 
@@ -622,17 +735,22 @@ def generate_inplay_lineups(team_rotations: list[pd.DataFrame], lineups: pd.Data
     team_ids = game_rotations[RN.TEAM_ID].unique().tolist()
 
     game_seconds_duration = game_rotations[RN.OUT_TIME_SECONDS_PLAYED].max()
-    lineup_to_id = {}
+
+    team_in_events = {}
+    team_out_events = {}
+    for team_id, game_team_rotation in game_rotations.groupby(RN.TEAM_ID, sort=False):
+        team_in_events[team_id] = _get_rotation_events(game_team_rotation, time_column=RN.IN_TIME_SECONDS_PLAYED)
+        team_out_events[team_id] = _get_rotation_events(game_team_rotation, time_column=RN.OUT_TIME_SECONDS_PLAYED)
+    team_in_positions = {t: 0 for t in team_ids}
+    team_out_positions = {t: 0 for t in team_ids}
 
     team_current_lineup = {t: [] for t in team_ids}
     for idx, seconds_played_start in enumerate(switch_times):
         for team_id in team_ids:
-            game_team_rotation = game_rotations[game_rotations[RN.TEAM_ID] == team_id]
-
-            in_player_ids = game_team_rotation[game_team_rotation[RN.IN_TIME_SECONDS_PLAYED] == seconds_played_start][
-                RN.PERSON_ID].unique().tolist()
-            out_player_ids = game_team_rotation[game_team_rotation[RN.OUT_TIME_SECONDS_PLAYED] == seconds_played_start][
-                RN.PERSON_ID].unique().tolist()
+            team_in_positions[team_id], in_player_ids = _pop_rotation_events(
+                team_in_events[team_id], position=team_in_positions[team_id], seconds_played=seconds_played_start)
+            team_out_positions[team_id], out_player_ids = _pop_rotation_events(
+                team_out_events[team_id], position=team_out_positions[team_id], seconds_played=seconds_played_start)
 
             for in_player_id in in_player_ids:
                 if in_player_id in out_player_ids:
@@ -664,45 +782,12 @@ def generate_inplay_lineups(team_rotations: list[pd.DataFrame], lineups: pd.Data
             lineup.sort()
             lineup_opponent.sort()
 
-            if tuple(lineup) in lineup_to_id:
-                lineup_row = lineup_to_id[tuple(lineup)]
-            else:
-                lineup_row = lineups[lineups[LN.LINEUP] == tuple(lineup)]
-
-            if len(lineup_row) >1:
-                h = 2
-
-            if len(lineup_row) == 0:
-                if len(lineups) == 0:
-                    lineup_id = 1
-                else:
-                    lineup_id = lineups[LN.LINEUP_ID].max() + 1
-                lineups = pd.concat([lineups, pd.DataFrame.from_dict({LN.LINEUP_ID: [lineup_id], LN.LINEUP: [tuple(lineup)]})])
-            else:
-                lineup_id = lineup_row[LN.LINEUP_ID].tolist()[0]
-
-            if tuple(lineup_opponent) in lineup_to_id:
-                opponent_lineup_row = lineup_to_id[tuple(lineup_opponent)]
-            else:
-                opponent_lineup_row = lineups[lineups[LN.LINEUP] == tuple(lineup_opponent)]
-
-            if len(opponent_lineup_row) == 0:
-                if len(lineups) == 0:
-                    lineup_opponent_id = 1
-                else:
-                    lineup_opponent_id = lineups[LN.LINEUP_ID].max() + 1
-
-                lineups = pd.concat(
-                    [lineups, pd.DataFrame.from_dict({LN.LINEUP_ID: [lineup_opponent_id], LN.LINEUP: [tuple(lineup_opponent)]})])
-            else:
-                lineup_opponent_id = opponent_lineup_row[LN.LINEUP_ID].tolist()[0]
+            lineup_id = lineup_registry.get_or_add_lineup_id(lineup)
+            lineup_opponent_id = lineup_registry.get_or_add_lineup_id(lineup_opponent)
 
+            inplay_lineups[TIPL.GAME_ID].append(game_id)
             inplay_lineups[TIPL.LINEUP_ID].append(lineup_id)
             inplay_lineups[TIPL.LINEUP_ID_OPPONENT].append(lineup_opponent_id)
-            inplay_lineups[TIPL.LINEUP].append(lineup)
-            inplay_lineups[TIPL.LINEUP_OPPONENT].append(lineup_opponent)
             inplay_lineups[TIPL.TEAM_ID].append(team_id)
             inplay_lineups[TIPL.SECONDS_PLAYED_START].append(seconds_played_start)
             inplay_lineups[TIPL.SECONDS_PLAYED_END].append(seconds_played_end)
-
-    return pd.DataFrame.from_dict(inplay_lineups), lineups
@@ -0,0 +1,57 @@
+from typing import Iterable, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from nba_api_wrapper.data_models import LineupNames
+
+LN = LineupNames
+
+LINEUP_WIDTH = 5
+EMPTY_PLAYER_ID = 0
+
+
+def get_lineup_player_columns(width: int = LINEUP_WIDTH) -> list[str]:
+    return [f"{LN.PLAYER_ID}_{position + 1}" for position in range(width)]
+
+
+def to_lineup_matrix(lineups: Sequence[Iterable[int]], width: int = LINEUP_WIDTH) -> np.ndarray:
+    lineups = [sorted(int(player_id) for player_id in lineup) for lineup in lineups]
+    lineup_sizes = np.array([len(lineup) for lineup in lineups], dtype=np.int64)
+    width = max([width, *lineup_sizes.tolist()])
+
+    lineup_matrix = np.full((len(lineups), width), EMPTY_PLAYER_ID, dtype=np.int32)
+    rows = np.repeat(np.arange(len(lineups)), lineup_sizes)
+    columns = np.arange(len(rows)) - np.repeat(np.cumsum(lineup_sizes) - lineup_sizes, lineup_sizes)
+    lineup_matrix[rows, columns] = [player_id for lineup in lineups for player_id in lineup]
+    return lineup_matrix
+
+
+def lineup_matrix_to_tuples(lineup_matrix: np.ndarray) -> list[tuple]:
+    return [tuple(player_id for player_id in lineup if player_id != EMPTY_PLAYER_ID)
+            for lineup in lineup_matrix.tolist()]
+
+
+def lineup_matrix_to_frame(lineup_ids: Sequence[int], lineup_matrix: np.ndarray) -> pd.DataFrame:
+    lineups = pd.DataFrame(lineup_matrix, columns=get_lineup_player_columns(width=lineup_matrix.shape[1]))
+    lineups.insert(0, LN.LINEUP_ID, np.asarray(lineup_ids, dtype=np.int64))
+    return lineups
+
+
+def get_lineup_matrix(lineups: pd.DataFrame) -> np.ndarray:
+    if LN.LINEUP in lineups.columns:
+        return to_lineup_matrix(lineups[LN.LINEUP].tolist())
+
+    player_columns = [column for column in get_lineup_player_columns(width=len(lineups.columns))
+                      if column in lineups.columns]
+    return lineups[player_columns].fillna(EMPTY_PLAYER_ID).to_numpy(dtype=np.int32).reshape(
+        len(lineups), len(player_columns))
+
+
+def lineups_containing_player(lineup_matrix: np.ndarray, player_ids: Union[int, Sequence[int]]) -> np.ndarray:
+    return np.isin(lineup_matrix, player_ids).any(axis=1)
+
+
+def explode_lineup_matrix(lineup_matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    rows, columns = np.nonzero(lineup_matrix != EMPTY_PLAYER_ID)
+    return rows, lineup_matrix[rows, columns]
@@ -0,0 +1,113 @@
+import hashlib
+from typing import Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+from nba_api_wrapper.data_models import LineupNames, LineupPlayByPlaysNames, TeamInPlayLineupNames, ShotPlaysNames
+from nba_api_wrapper.lineup_arrays import get_lineup_matrix, lineup_matrix_to_tuples, lineup_matrix_to_frame, \
+    to_lineup_matrix
+
+LN = LineupNames
+LPBP = LineupPlayByPlaysNames
+TIPL = TeamInPlayLineupNames
+SP = ShotPlaysNames
+
+LINEUP_ID_COLUMNS = [LPBP.LINEUP_ID_OFFENSE, LPBP.LINEUP_ID_DEFENSE, TIPL.LINEUP_ID, TIPL.LINEUP_ID_OPPONENT,
+                     SP.LINEUP_ID, SP.LINEUP_ID_OPPONENT]
+
+
+def get_content_lineup_id(lineup: Iterable[int]) -> int:
+    player_ids = np.array(sorted(int(player_id) for player_id in lineup), dtype="<i8").tobytes()
+    digest = hashlib.blake2b(player_ids, digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="little") & 0x7FFFFFFFFFFFFFFF
+
+
+def get_content_lineup_id_map(lineups: pd.DataFrame) -> dict[int, int]:
+    content_lineup_ids = {}
+    lineup_id_map = {}
+    for lineup_id, lineup in zip(lineups[LN.LINEUP_ID].tolist(), lineup_matrix_to_tuples(get_lineup_matrix(lineups))):
+        content_lineup_id = get_content_lineup_id(lineup)
+        if content_lineup_ids.setdefault(content_lineup_id, lineup) != lineup:
+            raise ValueError(f"lineup id collision between {content_lineup_ids[content_lineup_id]} and {lineup}")
+        lineup_id_map[int(lineup_id)] = content_lineup_id
+    return lineup_id_map
+
+
+def remap_lineup_ids(frame: pd.DataFrame, lineup_id_map: dict[int, int]) -> pd.DataFrame:
+    if not lineup_id_map:
+        return frame
+    return frame.assign(**{
+        column: frame[column].map(lambda lineup_id: lineup_id_map.get(lineup_id, lineup_id))
+        for column in LINEUP_ID_COLUMNS if column in frame.columns
+    })
+
+
+class LineupRegistry:
+
+    def __init__(self, lineups: Optional[pd.DataFrame] = None, content_ids: bool = False, next_lineup_id: int = 1):
+        self.content_ids = content_ids
+        self._lineup_ids: dict[tuple, int] = {}
+        self._lineups: dict[int, tuple] = {}
+        self._new_lineup_ids: list[int] = []
+        self._next_lineup_id = next_lineup_id
+        if lineups is not None:
+            for lineup_id, lineup in zip(lineups[LN.LINEUP_ID].tolist(),
+                                         lineup_matrix_to_tuples(get_lineup_matrix(lineups))):
+                if content_ids and int(lineup_id) != get_content_lineup_id(lineup):
+                    raise ValueError(f"lineup {lineup} is stored with id {lineup_id} which is not content derived, "
+                                     f"migrate the stored lineup ids with get_content_lineup_id_map first")
+                self._register(lineup=lineup, lineup_id=int(lineup_id))
+
+    @property
+    def next_lineup_id(self) -> int:
+        return self._next_lineup_id
+
+    def __len__(self) -> int:
+        return len(self._lineups)
+
+    def __contains__(self, lineup: Iterable[int]) -> bool:
+        return tuple(lineup) in self._lineup_ids
+
+    def get_lineup_id(self, lineup: Iterable[int]) -> Optional[int]:
+        return self._lineup_ids.get(tuple(lineup))
+
+    def get_lineup(self, lineup_id: int) -> tuple:
+        return self._lineups[lineup_id]
+
+    def get_or_add_lineup_id(self, lineup: Iterable[int]) -> int:
+        lineup = tuple(lineup)
+        lineup_id = self._lineup_ids.get(lineup)
+        if lineup_id is None:
+            if self.content_ids:
+                lineup_id = get_content_lineup_id(lineup)
+                if lineup_id in self._lineups:
+                    raise ValueError(f"lineup id collision between {self._lineups[lineup_id]} and {lineup}")
+            else:
+                lineup_id = self._next_lineup_id
+            self._register(lineup=lineup, lineup_id=lineup_id)
+            self._new_lineup_ids.append(lineup_id)
+        return lineup_id
+
+    def to_frame(self, lineup_ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        lineup_ids = list(self._lineups) if lineup_ids is None else list(dict.fromkeys(lineup_ids))
+        return lineup_matrix_to_frame(
+            lineup_ids=lineup_ids,
+            lineup_matrix=to_lineup_matrix([self._lineups[lineup_id] for lineup_id in lineup_ids]))
+
+    def export_new_lineups(self) -> pd.DataFrame:
+        new_lineups = self.to_frame(lineup_ids=self._new_lineup_ids)
+        self._new_lineup_ids = []
+        return new_lineups
+
+    def reconcile_lineups(self, lineups: pd.DataFrame) -> dict[int, int]:
+        lineup_id_map = {}
+        for lineup_id, lineup in zip(lineups[LN.LINEUP_ID].tolist(), lineup_matrix_to_tuples(get_lineup_matrix(lineups))):
+            lineup_id_map[int(lineup_id)] = self.get_or_add_lineup_id(lineup=lineup)
+        return {lineup_id: mapped_lineup_id for lineup_id, mapped_lineup_id in lineup_id_map.items()
+                if lineup_id != mapped_lineup_id}
+
+    def _register(self, lineup: tuple, lineup_id: int) -> None:
+        self._lineup_ids.setdefault(lineup, lineup_id)
+        self._lineups.setdefault(lineup_id, lineup)
+        self._next_lineup_id = max(self._next_lineup_id, lineup_id + 1)
@@ -0,0 +1,160 @@
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+from nba_api_wrapper.data_models import LineupPlayByPlaysNames, PlayerOffensePlayByPlaysNames, \
+    PlayerDefensePlayByPlaysNames, GamePlayerNames, GameTeamNames, GameNames, TeamInPlayLineupNames, ShotPlaysNames, \
+    LineupNames
+
+LPBP = LineupPlayByPlaysNames
+POPBP = PlayerOffensePlayByPlaysNames
+PDPBP = PlayerDefensePlayByPlaysNames
+GP = GamePlayerNames
+GT = GameTeamNames
+G = GameNames
+TIPL = TeamInPlayLineupNames
+SP = ShotPlaysNames
+LN = LineupNames
+
+SCHEMAS: dict[type, dict[str, str]] = {
+    LineupPlayByPlaysNames: {
+        LPBP.GAME_ID: "category",
+        LPBP.TEAM_ID_OFFENSE: "int32",
+        LPBP.TEAM_ID_DEFENSE: "int32",
+        LPBP.POSSESSION_ID: "int16",
+        LPBP.POSSESSION_ATTEMPT_ID: "int16",
+        LPBP.SCORE_OFFENSE: "int16",
+        LPBP.SCORE_DEFENSE: "int16",
+        LPBP.SECONDS_PLAYED_START: "int16",
+        LPBP.SECONDS_PLAYED_END: "int16",
+        LPBP.FIELD_GOAL_ATTEMPTS: "int8",
+        LPBP.POINTS: "int8",
+        LPBP.FREE_THROW_ATTEMPTS: "int8",
+        LPBP.LINEUP_ID_OFFENSE: "int64",
+        LPBP.LINEUP_ID_DEFENSE: "int64",
+        LPBP.PLAY_END_REASON: "category",
+    },
+    PlayerOffensePlayByPlaysNames: {
+        POPBP.GAME_ID: "category",
+        POPBP.TEAM_ID: "int32",
+        POPBP.POSSESSION_ID: "int16",
+        POPBP.PLAYER_ID: "int32",
+        POPBP.POINTS: "int8",
+        POPBP.ASSISTS: "int8",
+        POPBP.REBOUNDS: "int8",
+        POPBP.TURNOVERS: "int8",
+        POPBP.FOULS: "int8",
+        POPBP.THREE_POINTERS_ATTEMPTED: "int8",
+        POPBP.THREE_POINTERS_MADE: "int8",
+        POPBP.TWO_POINTERS_ATTEMPTED: "int8",
+        POPBP.TWO_POINTERS_MADE: "int8",
+        POPBP.FREE_THROWS_ATTEMPTED: "int8",
+        POPBP.FREE_THROWS_MADE: "int8",
+    },
+    PlayerDefensePlayByPlaysNames: {
+        PDPBP.GAME_ID: "category",
+        PDPBP.TEAM_ID: "int32",
+        PDPBP.POSSESSION_ID: "int16",
+        PDPBP.PLAYER_ID: "int32",
+        PDPBP.REBOUNDS: "int8",
+        PDPBP.BLOCKS: "int8",
+        PDPBP.STEALS: "int8",
+        PDPBP.FOULS: "int8",
+    },
+    GamePlayerNames: {
+        GP.GAME_ID: "category",
+        GP.PLAYER_ID: "int32",
+        GP.TEAM_ID: "int32",
+        GP.START_POSITION: "category",
+        GP.MINUTES: "float32",
+        GP.POINTS: "int16",
+        GP.THREE_POINTERS_MADE: "int16",
+        GP.THREE_POINTERS_ATTEMPTED: "int16",
+        GP.TWO_POINTERS_MADE: "int16",
+        GP.TWO_POINTERS_ATTEMPTED: "int16",
+        GP.FREE_THROWS_MADE: "int16",
+        GP.FREE_THROWS_ATTEMPTED: "int16",
+        GP.PLUS_MINUS: "int16",
+        GP.BLOCKS: "int16",
+        GP.STEALS: "int16",
+        GP.ASSISTS: "int16",
+        GP.OFFENSIVE_REBOUNDS: "int16",
+        GP.DEFENSIVE_REBOUNDS: "int16",
+        GP.TURNOVERS: "int16",
+        GP.FOULS: "int16",
+        GP.PACE: "float32",
+        GP.POSS: "int16",
+        GP.E_PACE: "float32",
+        GP.E_OFF_RATING: "float32",
+        GP.OFF_RATING: "float32",
+        GP.E_DEF_RATING: "float32",
+        GP.DEF_RATING: "float32",
+        GP.E_NET_RATING: "float32",
+        GP.NET_RATING: "float32",
+        GP.AST_TOV: "float32",
+        GP.AST_RATIO: "float32",
+    },
+    GameTeamNames: {
+        GT.GAME_ID: "category",
+        GT.TEAM_ID: "int32",
+        GT.TEAM_NAME: "category",
+        GT.TEAM_NAME_ABBR: "category",
+        GT.TEAM_ID_OPPONENT: "int32",
+        GT.LOCATION: "category",
+        GT.SCORE: "int16",
+        GT.SCORE_OPPONENT: "int16",
+        GT.WON: "bool",
+        GT.E_OFF_RATING: "float32",
+        GT.OFF_RATING: "float32",
+        GT.E_DEF_RATING: "float32",
+        GT.DEF_RATING: "float32",
+        GT.E_NET_RATING: "float32",
+        GT.NET_RATING: "float32",
+        GT.PACE: "float32",
+        GT.E_PACE: "float32",
+        GT.POSS: "int16",
+        GT.PIE: "float32",
+    },
+    GameNames: {
+        G.GAME_ID: "category",
+        G.MINUTES: "float32",
+        G.SEASON_ID: "category",
+    },
+    TeamInPlayLineupNames: {
+        TIPL.GAME_ID: "category",
+        TIPL.TEAM_ID: "int32",
+        TIPL.LINEUP_ID: "int64",
+        TIPL.LINEUP_ID_OPPONENT: "int64",
+        TIPL.SECONDS_PLAYED_START: "float32",
+        TIPL.SECONDS_PLAYED_END: "float32",
+    },
+    ShotPlaysNames: {
+        SP.GAME_ID: "category",
+        SP.SECONDS_PLAYED: "int16",
+        SP.SCORE: "int16",
+        SP.SCORE_OPPONENT: "int16",
+        SP.TEAM_ID: "int32",
+        SP.PLAYER_ID: "int32",
+        SP.LINEUP_ID: "int64",
+        SP.LINEUP_ID_OPPONENT: "int64",
+        SP.SHOT_DISTANCE: "float32",
+        SP.SUCCESS: "bool",
+        SP.SHOT_TYPE: "category",
+    },
+    LineupNames: {
+        LN.LINEUP_ID: "int64",
+    },
+}
+
+
+def apply_schema(frame: pd.DataFrame, names: type) -> pd.DataFrame:
+    dtypes = {}
+    for column, dtype in SCHEMAS[names].items():
+        if column not in frame.columns:
+            continue
+        if is_integer_dtype(dtype) and frame[column].isna().any():
+            dtype = dtype.capitalize()
+        if frame[column].dtype != dtype:
+            dtypes[column] = dtype
+    if not dtypes:
+        return frame
+    return frame.astype(dtypes)
@@ -0,0 +1,16 @@
+from typing import Optional
+
+import pyarrow.dataset as ds
+
+from nba_api_wrapper.storer.base_storer import Conditions
+
+
+def to_arrow_filter(conditions: Conditions) -> Optional[ds.Expression]:
+    filters = None
+    for condition_columns, values in conditions:
+        condition = ds.scalar(False)
+        if values:
+            for column in condition_columns:
+                condition = condition | ds.field(column).isin(values)
+        filters = condition if filters is None else filters & condition
+    return filters
@@ -1,12 +1,98 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+from nba_api_wrapper.data_models import LineupNames, LineupPlayByPlaysNames, GamePlayerNames, GameTeamNames, \
+    PlayerOffensePlayByPlaysNames, PlayerDefensePlayByPlaysNames, GameNames
 from nba_api_wrapper.datastructures import CollectedData
+from nba_api_wrapper.lineup_arrays import get_lineup_matrix, lineups_containing_player
+from nba_api_wrapper.schemas import apply_schema
+
+LPBP = LineupPlayByPlaysNames
+POPBP = PlayerOffensePlayByPlaysNames
+PDPBP = PlayerDefensePlayByPlaysNames
+GP = GamePlayerNames
+GT = GameTeamNames
+G = GameNames
+LN = LineupNames
+
+GAME_TABLES = {
+    "game": GameNames,
+    "game_player": GamePlayerNames,
+    "game_team": GameTeamNames,
+    "offense_player_play_by_plays": PlayerOffensePlayByPlaysNames,
+    "defense_player_play_by_plays": PlayerDefensePlayByPlaysNames,
+    "possessions": LineupPlayByPlaysNames,
+}
+
+TEAM_COLUMNS = {
+    "game_player": [GP.TEAM_ID],
+    "game_team": [GT.TEAM_ID],
+    "offense_player_play_by_plays": [POPBP.TEAM_ID],
+    "defense_player_play_by_plays": [PDPBP.TEAM_ID],
+    "possessions": [LPBP.TEAM_ID_OFFENSE, LPBP.TEAM_ID_DEFENSE],
+}
+
+PLAYER_COLUMNS = {
+    "game_player": [GP.PLAYER_ID],
+    "offense_player_play_by_plays": [POPBP.PLAYER_ID],
+    "defense_player_play_by_plays": [PDPBP.PLAYER_ID],
+}
+
+Conditions = list[tuple[list[str], list]]
+
+
+def upsert(stored: Optional[pd.DataFrame], new: pd.DataFrame, names: type) -> pd.DataFrame:
+    primary_key = list(names.PRIMARY_KEY)
+    new = new.drop_duplicates(subset=primary_key, keep="last")
+    if stored is None or len(stored) == 0:
+        return new
+    if len(new) == 0:
+        return stored
+
+    replaced = pd.MultiIndex.from_frame(stored[primary_key]).isin(pd.MultiIndex.from_frame(new[primary_key]))
+    return pd.concat([stored[~replaced], new], ignore_index=True)
+
+
+def replace_games(stored: Optional[pd.DataFrame], new: pd.DataFrame, game_ids: list[str], names: type) -> pd.DataFrame:
+    if len(new) > 0:
+        new = new.drop_duplicates(subset=list(names.PRIMARY_KEY), keep="last")
+    if stored is None or len(stored) == 0:
+        return new
+
+    replaced = stored[G.GAME_ID].astype(str).isin(game_ids).to_numpy()
+    if len(new) == 0:
+        return stored[~replaced].reset_index(drop=True)
+    return pd.concat([stored[~replaced], new], ignore_index=True)
+
+
+def get_game_ids(collected_data: CollectedData) -> list[str]:
+    if not isinstance(collected_data.game, pd.DataFrame):
+        return []
+    return collected_data.game[G.GAME_ID].astype(str).unique().tolist()
+
+
+def filter_table(table: pd.DataFrame, conditions: Conditions, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    mask = np.ones(len(table), dtype=bool)
+    for condition_columns, values in conditions:
+        condition_mask = np.zeros(len(table), dtype=bool)
+        for column in condition_columns:
+            condition_mask |= table[column].isin(values).to_numpy()
+        mask &= condition_mask
+
+    if columns is not None:
+        table = table[columns]
+    if mask.all():
+        return table
+    return table[mask].reset_index(drop=True)
 
 
 class Storer(ABC):
 
+    # collected_data.lineups only holds lineups first seen in this batch, not the full lineup table,
+    # so implementations must merge them into the lineups already stored rather than replace them
     @abstractmethod
     def store(self, collected_data: CollectedData):
         pass
@@ -17,4 +103,112 @@ class Storer(ABC):
 
     @abstractmethod
     def load_games(self) -> pd.DataFrame:
-        pass
\ No newline at end of file
+        pass
+
+    def _read_table(self, table_name: str, conditions: Conditions,
+                    columns: Optional[list[str]]) -> Optional[pd.DataFrame]:
+        raise NotImplementedError(f"{type(self).__name__} does not support loading {table_name} tables")
+
+    def load_possessions(self, game_ids: Optional[Sequence[str]] = None, seasons: Optional[Sequence[str]] = None,
+                         min_date: Optional[str] = None, max_date: Optional[str] = None,
+                         team_ids: Optional[Sequence[int]] = None, player_ids: Optional[Sequence[int]] = None,
+                         columns: Optional[list[str]] = None) -> pd.DataFrame:
+        return self.load_table("possessions", game_ids=game_ids, seasons=seasons, min_date=min_date,
+                               max_date=max_date, team_ids=team_ids, player_ids=player_ids, columns=columns)
+
+    def load_game_players(self, game_ids: Optional[Sequence[str]] = None, seasons: Optional[Sequence[str]] = None,
+                          min_date: Optional[str] = None, max_date: Optional[str] = None,
+                          team_ids: Optional[Sequence[int]] = None, player_ids: Optional[Sequence[int]] = None,
+                          columns: Optional[list[str]] = None) -> pd.DataFrame:
+        return self.load_table("game_player", game_ids=game_ids, seasons=seasons, min_date=min_date,
+                               max_date=max_date, team_ids=team_ids, player_ids=player_ids, columns=columns)
+
+    def load_game_teams(self, game_ids: Optional[Sequence[str]] = None, seasons: Optional[Sequence[str]] = None,
+                        min_date: Optional[str] = None, max_date: Optional[str] = None,
+                        team_ids: Optional[Sequence[int]] = None,
+                        columns: Optional[list[str]] = None) -> pd.DataFrame:
+        return self.load_table("game_team", game_ids=game_ids, seasons=seasons, min_date=min_date,
+                               max_date=max_date, team_ids=team_ids, columns=columns)
+
+    def load_offense_player_play_by_plays(self, game_ids: Optional[Sequence[str]] = None,
+                                          seasons: Optional[Sequence[str]] = None, min_date: Optional[str] = None,
+                                          max_date: Optional[str] = None, team_ids: Optional[Sequence[int]] = None,
+                                          player_ids: Optional[Sequence[int]] = None,
+                                          columns: Optional[list[str]] = None) -> pd.DataFrame:
+        return self.load_table("offense_player_play_by_plays", game_ids=game_ids, seasons=seasons,
+                               min_date=min_date, max_date=max_date, team_ids=team_ids, player_ids=player_ids,
+                               columns=columns)
+
+    def load_defense_player_play_by_plays(self, game_ids: Optional[Sequence[str]] = None,
+                                          seasons: Optional[Sequence[str]] = None, min_date: Optional[str] = None,
+                                          max_date: Optional[str] = None, team_ids: Optional[Sequence[int]] = None,
+                                          player_ids: Optional[Sequence[int]] = None,
+                                          columns: Optional[list[str]] = None) -> pd.DataFrame:
+        return self.load_table("defense_player_play_by_plays", game_ids=game_ids, seasons=seasons,
+                               min_date=min_date, max_date=max_date, team_ids=team_ids, player_ids=player_ids,
+                               columns=columns)
+
+    def load_table(self, table_name: str, game_ids: Optional[Sequence[str]] = None,
+                   seasons: Optional[Sequence[str]] = None, min_date: Optional[str] = None,
+                   max_date: Optional[str] = None, team_ids: Optional[Sequence[int]] = None,
+                   player_ids: Optional[Sequence[int]] = None, columns: Optional[list[str]] = None) -> pd.DataFrame:
+        if table_name not in GAME_TABLES:
+            raise ValueError(f"{table_name} is not a stored game table")
+
+        if game_ids is not None:
+            game_ids = [str(game_id) for game_id in game_ids]
+        if seasons is not None or min_date is not None or max_date is not None:
+            game_ids = self._get_game_ids(game_ids=game_ids, seasons=seasons, min_date=min_date, max_date=max_date)
+
+        conditions = []
+        if team_ids is not None:
+            team_ids = [int(team_id) for team_id in team_ids]
+            if table_name in TEAM_COLUMNS:
+                conditions.append((TEAM_COLUMNS[table_name], team_ids))
+            elif table_name == "game":
+                game_ids = self._intersect_game_ids(game_ids, self.load_game_teams(
+                    game_ids=game_ids, team_ids=team_ids, columns=[GT.GAME_ID])[GT.GAME_ID])
+            else:
+                raise ValueError(f"{table_name} can not be filtered by team")
+
+        if player_ids is not None:
+            player_ids = [int(player_id) for player_id in player_ids]
+            if table_name in PLAYER_COLUMNS:
+                conditions.append((PLAYER_COLUMNS[table_name], player_ids))
+            elif table_name == "possessions":
+                lineups = self.load_lineups()
+                contains_player = lineups_containing_player(get_lineup_matrix(lineups), player_ids=player_ids)
+                conditions.append(([LPBP.LINEUP_ID_OFFENSE, LPBP.LINEUP_ID_DEFENSE],
+                                   lineups[LN.LINEUP_ID][contains_player].tolist()))
+            elif table_name == "game":
+                game_ids = self._intersect_game_ids(game_ids, self.load_game_players(
+                    game_ids=game_ids, player_ids=player_ids, columns=[GP.GAME_ID])[GP.GAME_ID])
+            else:
+                raise ValueError(f"{table_name} can not be filtered by player")
+
+        if game_ids is not None:
+            conditions.insert(0, ([G.GAME_ID], game_ids))
+
+        table = self._read_table(table_name, conditions=conditions, columns=columns)
+        if table is None:
+            return pd.DataFrame({column: [] for column in columns or []})
+        return apply_schema(table, GAME_TABLES[table_name])
+
+    def _get_game_ids(self, game_ids: Optional[list[str]], seasons: Optional[Sequence[str]],
+                      min_date: Optional[str], max_date: Optional[str]) -> list[str]:
+        games = self.load_games()
+        mask = np.ones(len(games), dtype=bool)
+        if seasons is not None:
+            mask &= games[G.SEASON_ID].astype(str).isin([str(season) for season in seasons]).to_numpy()
+        if min_date is not None:
+            mask &= (pd.to_datetime(games[G.START_DATE]) >= pd.to_datetime(min_date)).to_numpy()
+        if max_date is not None:
+            mask &= (pd.to_datetime(games[G.START_DATE]) <= pd.to_datetime(max_date)).to_numpy()
+        return self._intersect_game_ids(game_ids, games[G.GAME_ID][mask])
+
+    def _intersect_game_ids(self, game_ids: Optional[list[str]], matching_game_ids: pd.Series) -> list[str]:
+        matching_game_ids = matching_game_ids.astype(str).unique().tolist()
+        if game_ids is None:
+            return matching_game_ids
+        matching_game_ids = set(matching_game_ids)
+        return [game_id for game_id in game_ids if game_id in matching_game_ids]
@@ -2,99 +2,147 @@ import os
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
 
-from nba_api_wrapper.data_models import LineupNames
+from nba_api_wrapper.data_models import LineupNames, GameNames
 from nba_api_wrapper.datastructures import CollectedData
+from nba_api_wrapper.lineup_arrays import get_lineup_matrix, lineup_matrix_to_frame, to_lineup_matrix
+from nba_api_wrapper.lineup_registry import get_content_lineup_id_map, remap_lineup_ids
+from nba_api_wrapper.schemas import apply_schema
 
-from nba_api_wrapper.storer.base_storer import Storer
+from nba_api_wrapper.storer.arrow_filters import to_arrow_filter
+from nba_api_wrapper.storer.base_storer import Storer, upsert, replace_games, get_game_ids, filter_table, \
+    GAME_TABLES, Conditions
+
+MIGRATION_SUFFIX = ".migrating"
+
+
+def _to_writable_frame(table: pa.Table) -> pd.DataFrame:
+    frame = table.to_pandas()
+    # numeric columns are copied into new blocks, categorical codes still point into the arrow buffers
+    categorical_columns = [column for column in frame.columns if isinstance(frame[column].dtype, pd.CategoricalDtype)]
+    if not categorical_columns:
+        return frame
+    return frame.assign(**{column: frame[column].copy() for column in categorical_columns})
 
 
 class FileStorer(Storer):
 
-    def __init__(self, base_path: str = "", pickle: bool = True, overwrite: bool = False):
+    def __init__(self, base_path: str = "", pickle: bool = True, overwrite: bool = False, writable: bool = True):
         self.base_path = base_path
         self.pickle = pickle
         self.overwrite = overwrite
+        self.writable = writable
 
 
     def store(self, collected_data: CollectedData):
-
-        if os.path.exists(os.path.join(self.base_path, "game.pickle")):
-            games = pd.read_pickle(os.path.join(self.base_path, "game.pickle"))
-            games = pd.concat([games, collected_data.game])
-            games = games.drop_duplicates()
+        self._recover_migration()
+        tables = {
+            "game": collected_data.game,
+            "game_player": collected_data.game_players,
+            "game_team": collected_data.game_teams,
+            "offense_player_play_by_plays": collected_data.offense_player_play_by_plays,
+            "defense_player_play_by_plays": collected_data.defense_player_play_by_plays,
+            "possessions": collected_data.possessions,
+        }
+        game_ids = get_game_ids(collected_data)
+        for table_name, names in GAME_TABLES.items():
+            table = replace_games(stored=self._read_table(table_name, conditions=[], columns=None),
+                                  new=tables[table_name], game_ids=game_ids, names=names)
+            self._write_table(apply_schema(table, names), table_name=table_name)
+
+        if os.path.exists(self._get_path("lineups")):
+            lineups = upsert(stored=self.load_lineups(), new=collected_data.lineups, names=LineupNames)
+            lineups = lineup_matrix_to_frame(lineup_ids=lineups[LineupNames.LINEUP_ID],
+                                             lineup_matrix=get_lineup_matrix(lineups))
         else:
-            games = collected_data.game
+            lineups = collected_data.lineups
 
-        if os.path.exists(os.path.join(self.base_path, "game_player.pickle")):
-            game_players = pd.read_pickle(os.path.join(self.base_path, "game_player.pickle"))
-            game_players = pd.concat([game_players, collected_data.game_players])
-            game_players = game_players.drop_duplicates()
-        else:
-            game_players = collected_data.game_players
+        self._write_table(apply_schema(lineups, LineupNames), table_name="lineups")
 
-        if os.path.exists(os.path.join(self.base_path, "game_team.pickle")):
-            game_teams = pd.read_pickle(os.path.join(self.base_path, "game_team.pickle"))
-            game_teams = pd.concat([game_teams, collected_data.game_teams])
-            game_teams = game_teams.drop_duplicates()
-        else:
-            game_teams = collected_data.game_teams
 
-        if os.path.exists(os.path.join(self.base_path, "offense_player_play_by_plays.pickle")):
-            offense_player_play_by_plays = pd.read_pickle(os.path.join(self.base_path, "offense_player_play_by_plays.pickle"))
-            offense_player_play_by_plays = pd.concat(
-                [offense_player_play_by_plays, collected_data.offense_player_play_by_plays])
-            offense_player_play_by_plays = offense_player_play_by_plays.drop_duplicates()
-        else:
-            offense_player_play_by_plays = collected_data.offense_player_play_by_plays
+    def migrate_to_content_lineup_ids(self) -> None:
+        if self._recover_migration():
+            return
 
-        if os.path.exists(os.path.join(self.base_path, "defense_player_play_by_plays.pickle")):
+        lineups = self.load_lineups()
+        lineup_id_map = get_content_lineup_id_map(lineups)
+        lineups = lineups.assign(**{LineupNames.LINEUP_ID: lineups[LineupNames.LINEUP_ID].map(lineup_id_map)})
+        lineups = lineups.astype({LineupNames.LINEUP_ID: "int64"}).drop_duplicates(subset=[LineupNames.LINEUP_ID])
 
-            defense_player_play_by_plays = pd.read_pickle(os.path.join(self.base_path, "defense_player_play_by_plays.pickle"))
-            defense_player_play_by_plays = pd.concat(
-                [defense_player_play_by_plays, collected_data.defense_player_play_by_plays])
-            defense_player_play_by_plays = defense_player_play_by_plays.drop_duplicates()
-        else:
-            defense_player_play_by_plays = collected_data.defense_player_play_by_plays
-
-        if os.path.exists(os.path.join(self.base_path, "possessions.pickle")):
-
-            possessions = pd.read_pickle(os.path.join(self.base_path, "possessions.pickle"))
-            possessions = pd.concat([possessions, collected_data.possessions])
-            possessions = possessions.drop_duplicates()
-        else:
-            possessions = collected_data.possessions
+        # both tables are staged first, the staged lineups mark the migration as ready to be swapped in
+        possessions = self._read_table("possessions", conditions=[], columns=None)
+        if possessions is not None:
+            self._write_file(remap_lineup_ids(possessions, lineup_id_map=lineup_id_map),
+                             path=self._get_path("possessions") + MIGRATION_SUFFIX)
+        self._write_file(lineups, path=self._get_path("lineups") + MIGRATION_SUFFIX)
+        self._recover_migration()
 
-        collected_data.lineups.to_pickle(os.path.join(self.base_path, "lineups.pickle"))
-        possessions.to_pickle(os.path.join(self.base_path, "possessions.pickle"))
-        game_players.to_pickle(os.path.join(self.base_path, "game_player.pickle"))
-        game_teams.to_pickle(os.path.join(self.base_path, "game_team.pickle"))
-        offense_player_play_by_plays.to_pickle(os.path.join(self.base_path, "offense_player_play_by_plays.pickle"))
-        defense_player_play_by_plays.to_pickle(os.path.join(self.base_path, "defense_player_play_by_plays.pickle"))
-        games.to_pickle(os.path.join(self.base_path, "game.pickle"))
+    def _recover_migration(self) -> bool:
+        if not os.path.exists(self._get_path("lineups") + MIGRATION_SUFFIX):
+            if os.path.exists(self._get_path("possessions") + MIGRATION_SUFFIX):
+                os.remove(self._get_path("possessions") + MIGRATION_SUFFIX)
+            return False
 
+        for table_name in ["possessions", "lineups"]:
+            migration_path = self._get_path(table_name) + MIGRATION_SUFFIX
+            if os.path.exists(migration_path):
+                os.replace(migration_path, self._get_path(table_name))
+        return True
 
     def load_lineups(self) -> pd.DataFrame:
-        path = os.path.join(self.base_path, "lineups.pickle")
-        if os.path.exists(path):
-            lineups =  pd.read_pickle(path)
-            lineups[LineupNames.LINEUP] = lineups[LineupNames.LINEUP].apply(lambda x: tuple(x))
+        lineups = self._read_table("lineups", conditions=[], columns=None)
+        if lineups is not None:
+            if LineupNames.LINEUP in lineups.columns:
+                lineups = lineup_matrix_to_frame(lineup_ids=lineups[LineupNames.LINEUP_ID],
+                                                 lineup_matrix=get_lineup_matrix(lineups))
             return lineups
         else:
-            return pd.DataFrame(
-                {
-                    LineupNames.LINEUP_ID: [],
-                    LineupNames.LINEUP: [],
-                })
+            return lineup_matrix_to_frame(lineup_ids=[], lineup_matrix=to_lineup_matrix([]))
 
 
     def load_games(self) -> pd.DataFrame:
-        path = os.path.join(self.base_path, "game.pickle")
-        if os.path.exists(path):
-            return pd.read_pickle(path)
+        games = self._read_table("game", conditions=[], columns=None)
+        if games is not None:
+            return games
+        else:
+            return pd.DataFrame({GameNames.GAME_ID: [], GameNames.START_DATE: [], GameNames.MINUTES: [],
+                                 GameNames.SEASON_ID: []})
+
+    def _read_table(self, table_name: str, conditions: Conditions,
+                    columns: Optional[list[str]]) -> Optional[pd.DataFrame]:
+        path = self._get_path(table_name)
+        if not os.path.exists(path):
+            return None
+        if self.pickle:
+            return filter_table(pd.read_pickle(path), conditions=conditions, columns=columns)
+
+        read_columns = None
+        if columns is not None:
+            read_columns = columns + [column for condition_columns, _ in conditions for column in condition_columns
+                                      if column not in columns]
+        table = feather.read_table(path, columns=read_columns, memory_map=True)
+        if conditions:
+            table = table.filter(to_arrow_filter(conditions))
+        if columns is not None:
+            table = table.select(columns)
+        if not self.writable:
+            # zero copy, numeric columns stay backed by the read only memory map
+            return table.to_pandas(split_blocks=True)
+        return _to_writable_frame(table)
+
+    def _write_table(self, table: pd.DataFrame, table_name: str) -> None:
+        self._write_file(table, path=self._get_path(table_name))
+
+    def _write_file(self, table: pd.DataFrame, path: str) -> None:
+        tmp_path = path + ".tmp"
+        if self.pickle:
+            table.to_pickle(tmp_path)
         else:
-            return pd.DataFrame(
-                {
-                    LineupNames.LINEUP_ID: [],
-                    LineupNames.LINEUP: [],
-                })
+            table.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed",
+                                                    chunksize=max(len(table), 1))
+        os.replace(tmp_path, path)
+
+    def _get_path(self, table_name: str) -> str:
+        return os.path.join(self.base_path, f"{table_name}.{'pickle' if self.pickle else 'feather'}")
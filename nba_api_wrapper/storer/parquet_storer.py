@@ -0,0 +1,229 @@
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from nba_api_wrapper.data_models import LineupNames, GameNames
+from nba_api_wrapper.datastructures import CollectedData
+from nba_api_wrapper.lineup_arrays import get_lineup_matrix, lineup_matrix_to_frame, to_lineup_matrix
+from nba_api_wrapper.lineup_registry import get_content_lineup_id_map, remap_lineup_ids
+from nba_api_wrapper.schemas import apply_schema
+from nba_api_wrapper.storer.arrow_filters import to_arrow_filter
+from nba_api_wrapper.storer.base_storer import Storer, Conditions
+
+G = GameNames
+LN = LineupNames
+
+MANIFEST_FILE_NAME = "manifest.jsonl"
+
+LINEUPS_TABLE = "lineups"
+
+
+class ParquetStorer(Storer):
+
+    def __init__(self, base_path: str = ""):
+        self.base_path = base_path
+        self._manifest_offset = 0
+        self._next_part = 0
+        self._files: dict[str, list[dict]] = {}
+        self._game_files: dict[str, dict[str, list[int]]] = {}
+
+    def store(self, collected_data: CollectedData):
+        with self._lock_manifest() as manifest:
+            part = self._next_part
+            files = []
+
+            game_partitions = self._get_game_partitions(games=collected_data.game)
+            replaced_game_ids = [game_id for game_id in game_partitions.index
+                                 if any(game_id in game_files for game_files in self._game_files.values())]
+            game_tables = {
+                "game": collected_data.game,
+                "game_player": collected_data.game_players,
+                "game_team": collected_data.game_teams,
+                "offense_player_play_by_plays": collected_data.offense_player_play_by_plays,
+                "defense_player_play_by_plays": collected_data.defense_player_play_by_plays,
+                "possessions": collected_data.possessions,
+            }
+            for table_name, table in game_tables.items():
+                if not isinstance(table, pd.DataFrame) or len(table) == 0:
+                    continue
+                table = table[table[G.GAME_ID].astype(str).isin(game_partitions.index)]
+                partitions = game_partitions.reindex(table[G.GAME_ID].astype(str))
+                for (season_id, start_date), partition in table.groupby(
+                        [partitions[G.SEASON_ID].to_numpy(), partitions[G.START_DATE].to_numpy()], sort=False):
+                    path = os.path.join(table_name, f"{G.SEASON_ID}={season_id}", f"{G.START_DATE}={start_date}",
+                                        f"part-{part:06d}.parquet")
+                    files.append(self._write_table_file(partition, table_name=table_name, path=path, partition={
+                        G.SEASON_ID: str(season_id), G.START_DATE: str(start_date)}))
+
+            lineups = collected_data.lineups
+            if isinstance(lineups, pd.DataFrame) and len(lineups) > 0:
+                path = os.path.join(LINEUPS_TABLE, f"part-{part:06d}.parquet")
+                files.append(self._write_table_file(lineups, table_name=LINEUPS_TABLE, path=path))
+
+            self._append_manifest(manifest, {"part": part, "replaced_game_ids": replaced_game_ids, "files": files})
+
+    def migrate_to_content_lineup_ids(self) -> None:
+        with self._lock_manifest() as manifest:
+            lineups = self.load_lineups()
+            lineup_id_map = get_content_lineup_id_map(lineups)
+            if all(lineup_id == content_lineup_id for lineup_id, content_lineup_id in lineup_id_map.items()):
+                return
+            lineups = lineups.assign(**{LN.LINEUP_ID: lineups[LN.LINEUP_ID].map(lineup_id_map)})
+            lineups = lineups.astype({LN.LINEUP_ID: "int64"}).drop_duplicates(subset=[LN.LINEUP_ID])
+
+            part = self._next_part
+            files = []
+            replaced_files = []
+            partition_files = {}
+            for file in self._files.get("possessions", []):
+                if not self._is_replaced(file):
+                    partition_files.setdefault(os.path.dirname(file["path"]), []).append(file)
+            for directory, possessions_files in partition_files.items():
+                possessions = pd.concat([pd.read_parquet(os.path.join(self.base_path, file["path"]),
+                                                         filters=self._get_file_filters(file, filters=None))
+                                         for file in possessions_files], ignore_index=True)
+                files.append(self._write_table_file(remap_lineup_ids(possessions, lineup_id_map=lineup_id_map),
+                                                    table_name="possessions",
+                                                    path=os.path.join(directory, f"part-{part:06d}.parquet"),
+                                                    partition={G.SEASON_ID: possessions_files[0][G.SEASON_ID],
+                                                               G.START_DATE: possessions_files[0][G.START_DATE]}))
+                replaced_files += [file["path"] for file in possessions_files]
+
+            files.append(self._write_table_file(lineups, table_name=LINEUPS_TABLE,
+                                                path=os.path.join(LINEUPS_TABLE, f"part-{part:06d}.parquet")))
+            replaced_files += [file["path"] for file in self._files.get(LINEUPS_TABLE, [])
+                               if not self._is_replaced(file)]
+
+            # the rewritten files only become visible together with the replacement of the old ones
+            self._append_manifest(manifest, {"part": part, "replaced_files": replaced_files, "files": files})
+
+    def load_lineups(self) -> pd.DataFrame:
+        lineups = self._read_table(LINEUPS_TABLE, conditions=[], columns=None)
+        if lineups is None:
+            return lineup_matrix_to_frame(lineup_ids=[], lineup_matrix=to_lineup_matrix([]))
+        lineups = lineups.drop_duplicates(subset=[LN.LINEUP_ID])
+        return lineup_matrix_to_frame(lineup_ids=lineups[LN.LINEUP_ID], lineup_matrix=get_lineup_matrix(lineups))
+
+    def load_games(self) -> pd.DataFrame:
+        games = self._read_table("game", conditions=[], columns=None)
+        if games is None:
+            return pd.DataFrame({G.GAME_ID: [], G.START_DATE: [], G.MINUTES: [], G.SEASON_ID: []})
+        return apply_schema(games, GameNames)
+
+    def _get_game_partitions(self, games: pd.DataFrame) -> pd.DataFrame:
+        if not isinstance(games, pd.DataFrame) or len(games) == 0:
+            return pd.DataFrame({G.SEASON_ID: [], G.START_DATE: []})
+
+        return (games.assign(**{G.GAME_ID: games[G.GAME_ID].astype(str)})
+                .drop_duplicates(subset=[G.GAME_ID], keep="last")
+                .set_index(G.GAME_ID)[[G.SEASON_ID, G.START_DATE]])
+
+    def _read_table(self, table_name: str, conditions: Conditions,
+                    columns: Optional[list[str]]) -> Optional[pd.DataFrame]:
+        self._load_manifest()
+        files = self._files.get(table_name, [])
+        if not files:
+            return None
+
+        live_files = [file for file in files if not self._is_replaced(file)]
+        for condition_columns, values in conditions:
+            if condition_columns == [G.GAME_ID]:
+                game_files = self._game_files.get(table_name, {})
+                file_indexes = sorted({file_index for game_id in values for file_index in game_files.get(game_id, [])})
+                live_files = [files[file_index] for file_index in file_indexes]
+
+        if not live_files:
+            dtypes = files[-1]["dtypes"]
+            return pd.DataFrame({column: pd.Series(dtype=dtypes[column]) for column in columns or dtypes})
+
+        filters = to_arrow_filter(conditions)
+        tables = [pd.read_parquet(os.path.join(self.base_path, file["path"]), columns=columns,
+                                  filters=self._get_file_filters(file, filters=filters))
+                  for file in live_files]
+        return pd.concat([table for table in tables if len(table) > 0] or tables[:1], ignore_index=True)
+
+    def _is_replaced(self, file: dict) -> bool:
+        if file.get("replaced", False):
+            return True
+        return "game_ids" in file and len(file.get("replaced_game_ids", [])) == len(file["game_ids"])
+
+    def _get_file_filters(self, file: dict, filters: Optional[ds.Expression]) -> Optional[ds.Expression]:
+        if not file.get("replaced_game_ids"):
+            return filters
+        live_rows = ~ds.field(G.GAME_ID).isin(file["replaced_game_ids"])
+        return live_rows if filters is None else filters & live_rows
+
+    def _write_table_file(self, table: pd.DataFrame, table_name: str, path: str,
+                          partition: Optional[dict[str, str]] = None) -> dict:
+        self._write_file(table, path=path)
+        file = {"table": table_name, "path": path}
+        if partition is not None:
+            file.update(partition)
+            file["game_ids"] = table[G.GAME_ID].astype(str).unique().tolist()
+        file["rows"] = len(table)
+        file["dtypes"] = table.dtypes.astype(str).to_dict()
+        return file
+
+    def _write_file(self, table: pd.DataFrame, path: str) -> None:
+        full_path = os.path.join(self.base_path, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        table.to_parquet(full_path, index=False)
+
+    def _load_manifest(self) -> None:
+        path = os.path.join(self.base_path, MANIFEST_FILE_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            f.seek(self._manifest_offset)
+            for line in f:
+                # a line without its newline is still being written, pick it up on a later call
+                if not line.endswith(b"\n"):
+                    break
+                self._add_manifest_entry(json.loads(line))
+                self._manifest_offset += len(line)
+
+    def _add_manifest_entry(self, entry: dict) -> None:
+        # rows of a replaced game stay in their files but are filtered out on read
+        for game_id in entry.get("replaced_game_ids", []):
+            for table_name, game_files in self._game_files.items():
+                for file_index in game_files.pop(game_id, []):
+                    self._files[table_name][file_index].setdefault("replaced_game_ids", []).append(game_id)
+        replaced_files = set(entry.get("replaced_files", []))
+        if replaced_files:
+            for table_name, table_files in self._files.items():
+                for file in table_files:
+                    file["replaced"] = file.get("replaced", False) or file["path"] in replaced_files
+                for file_indexes in self._game_files.get(table_name, {}).values():
+                    file_indexes[:] = [file_index for file_index in file_indexes
+                                       if not table_files[file_index]["replaced"]]
+        for file in entry["files"]:
+            table_files = self._files.setdefault(file["table"], [])
+            for game_id in file.get("game_ids", []):
+                self._game_files.setdefault(file["table"], {}).setdefault(game_id, []).append(len(table_files))
+            table_files.append(file)
+        self._next_part = max(self._next_part, entry["part"] + 1)
+
+    @contextmanager
+    def _lock_manifest(self) -> Iterator[BinaryIO]:
+        os.makedirs(self.base_path or ".", exist_ok=True)
+        with open(os.path.join(self.base_path, MANIFEST_FILE_NAME), "a+b") as manifest:
+            # writers take turns from reading the manifest to appending their entry, so they never pick the same
+            # part or append past each other, even from other processes
+            fcntl.flock(manifest.fileno(), fcntl.LOCK_EX)
+            self._load_manifest()
+            yield manifest
+
+    def _append_manifest(self, manifest: BinaryIO, entry: dict) -> None:
+        manifest.seek(self._manifest_offset)
+        # only drop a final line a crashed writer left without its newline, never a complete entry
+        if b"\n" not in manifest.read():
+            manifest.truncate(self._manifest_offset)
+        manifest.write(json.dumps(entry).encode() + b"\n")
+        manifest.flush()
+        os.fsync(manifest.fileno())
+        self._load_manifest()
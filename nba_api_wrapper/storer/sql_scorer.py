@@ -0,0 +1,193 @@
+import sqlite3
+from contextlib import closing
+from typing import Optional, Sequence
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+from nba_api_wrapper.data_models import LineupNames, GameNames
+from nba_api_wrapper.datastructures import CollectedData
+from nba_api_wrapper.lineup_arrays import get_lineup_matrix, lineup_matrix_to_frame, to_lineup_matrix, \
+    get_lineup_player_columns
+from nba_api_wrapper.lineup_registry import LINEUP_ID_COLUMNS, get_content_lineup_id_map
+from nba_api_wrapper.schemas import apply_schema
+from nba_api_wrapper.storer.base_storer import Storer, GAME_TABLES, TEAM_COLUMNS, PLAYER_COLUMNS, Conditions, \
+    get_game_ids
+
+G = GameNames
+LN = LineupNames
+
+LINEUPS_TABLE = "lineups"
+
+TABLES = {**GAME_TABLES, LINEUPS_TABLE: LineupNames}
+
+
+def quote_identifier(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteStorer(Storer):
+
+    def __init__(self, database_path: str = "nba.db"):
+        self.database_path = database_path
+
+    def store(self, collected_data: CollectedData):
+        tables = {
+            "game": collected_data.game,
+            "game_player": collected_data.game_players,
+            "game_team": collected_data.game_teams,
+            "offense_player_play_by_plays": collected_data.offense_player_play_by_plays,
+            "defense_player_play_by_plays": collected_data.defense_player_play_by_plays,
+            "possessions": collected_data.possessions,
+            LINEUPS_TABLE: collected_data.lineups,
+        }
+        game_ids = get_game_ids(collected_data)
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN")
+            try:
+                for table_name in GAME_TABLES:
+                    self._delete_games(connection, table_name=table_name, game_ids=game_ids)
+                for table_name, table in tables.items():
+                    if isinstance(table, pd.DataFrame) and len(table) > 0:
+                        self._upsert(connection, table_name=table_name, table=table)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def migrate_to_content_lineup_ids(self) -> None:
+        lineups = self.load_lineups()
+        lineup_id_map = get_content_lineup_id_map(lineups)
+        if all(lineup_id == content_lineup_id for lineup_id, content_lineup_id in lineup_id_map.items()):
+            return
+        lineups = lineups.assign(**{LN.LINEUP_ID: lineups[LN.LINEUP_ID].map(lineup_id_map)})
+        lineups = lineups.astype({LN.LINEUP_ID: "int64"}).drop_duplicates(subset=[LN.LINEUP_ID])
+
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN")
+            try:
+                connection.execute("CREATE TEMP TABLE lineup_id_map "
+                                   "(lineup_id INTEGER PRIMARY KEY, content_lineup_id INTEGER NOT NULL)")
+                connection.executemany("INSERT INTO lineup_id_map VALUES (?, ?)", lineup_id_map.items())
+                for table_name in GAME_TABLES:
+                    table_columns = self._get_table_columns(connection, table_name=table_name)
+                    for column in [column for column in LINEUP_ID_COLUMNS if column in table_columns]:
+                        column = quote_identifier(column)
+                        connection.execute(
+                            f"UPDATE {quote_identifier(table_name)} SET {column} = COALESCE("
+                            f"(SELECT content_lineup_id FROM lineup_id_map WHERE lineup_id = {column}), {column})")
+                connection.execute(f"DELETE FROM {quote_identifier(LINEUPS_TABLE)}")
+                self._upsert(connection, table_name=LINEUPS_TABLE, table=lineups)
+                connection.execute("DROP TABLE lineup_id_map")
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def load_lineups(self, player_ids: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        conditions = []
+        if player_ids is not None:
+            with closing(self._connect()) as connection:
+                table_columns = self._get_table_columns(connection, table_name=LINEUPS_TABLE)
+            player_columns = [column for column in get_lineup_player_columns(width=len(table_columns))
+                              if column in table_columns]
+            conditions.append((player_columns, [int(player_id) for player_id in player_ids]))
+
+        lineups = self._read_table(LINEUPS_TABLE, conditions=conditions, columns=None)
+        if lineups is None:
+            return lineup_matrix_to_frame(lineup_ids=[], lineup_matrix=to_lineup_matrix([]))
+        return lineup_matrix_to_frame(lineup_ids=lineups[LN.LINEUP_ID], lineup_matrix=get_lineup_matrix(lineups))
+
+    def load_games(self) -> pd.DataFrame:
+        games = self._read_table("game", conditions=[], columns=None)
+        if games is None:
+            return pd.DataFrame({G.GAME_ID: [], G.START_DATE: [], G.MINUTES: [], G.SEASON_ID: []})
+        return apply_schema(games, GameNames)
+
+    def _read_table(self, table_name: str, conditions: Conditions,
+                    columns: Optional[list[str]]) -> Optional[pd.DataFrame]:
+        with closing(self._connect()) as connection:
+            table_columns = self._get_table_columns(connection, table_name=table_name)
+            if not table_columns:
+                return None
+            if columns is not None:
+                unknown_columns = [column for column in columns if column not in table_columns]
+                if unknown_columns:
+                    raise ValueError(f"{table_name} has no columns {unknown_columns}")
+
+            where = []
+            params = []
+            for condition_columns, values in conditions:
+                placeholders = ", ".join("?" * len(values))
+                where.append("(" + " OR ".join(f"{quote_identifier(column)} IN ({placeholders})"
+                                               for column in condition_columns) + ")")
+                params += list(values) * len(condition_columns)
+
+            selected = ", ".join(map(quote_identifier, columns)) if columns is not None else "*"
+            query = f"SELECT {selected} FROM {quote_identifier(table_name)}"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            return pd.read_sql_query(query, connection, params=params)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.database_path, isolation_level=None)
+
+    def _delete_games(self, connection: sqlite3.Connection, table_name: str, game_ids: list[str]) -> None:
+        if not game_ids or not self._get_table_columns(connection, table_name=table_name):
+            return
+        connection.execute(f"DELETE FROM {quote_identifier(table_name)} WHERE {quote_identifier(G.GAME_ID)} "
+                           f"IN ({', '.join('?' * len(game_ids))})", game_ids)
+
+    def _upsert(self, connection: sqlite3.Connection, table_name: str, table: pd.DataFrame) -> None:
+        columns = list(table.columns)
+        self._ensure_table(connection, table_name=table_name, table=table)
+
+        primary_key = TABLES[table_name].PRIMARY_KEY
+        updates = [column for column in columns if column not in primary_key]
+        query = (f"INSERT INTO {quote_identifier(table_name)} ({', '.join(map(quote_identifier, columns))}) "
+                 f"VALUES ({', '.join('?' * len(columns))}) "
+                 f"ON CONFLICT ({', '.join(map(quote_identifier, primary_key))}) DO ")
+        if updates:
+            query += "UPDATE SET " + ", ".join(f"{quote_identifier(column)} = excluded.{quote_identifier(column)}"
+                                               for column in updates)
+        else:
+            query += "NOTHING"
+        connection.executemany(query, zip(*[self._to_sql_values(table[column]) for column in columns]))
+
+    def _ensure_table(self, connection: sqlite3.Connection, table_name: str, table: pd.DataFrame) -> None:
+        table_columns = self._get_table_columns(connection, table_name=table_name)
+        if not table_columns:
+            column_definitions = [f"{quote_identifier(column)} {self._get_sql_type(table[column])}"
+                                  for column in table.columns]
+            connection.execute(f"CREATE TABLE {quote_identifier(table_name)} ({', '.join(column_definitions)}, "
+                               f"PRIMARY KEY ({', '.join(map(quote_identifier, TABLES[table_name].PRIMARY_KEY))}))")
+            new_columns = list(table.columns)
+        else:
+            new_columns = [column for column in table.columns if column not in table_columns]
+            for column in new_columns:
+                connection.execute(f"ALTER TABLE {quote_identifier(table_name)} ADD COLUMN {quote_identifier(column)} "
+                                   f"{self._get_sql_type(table[column])}")
+
+        index_columns = TEAM_COLUMNS.get(table_name, []) + PLAYER_COLUMNS.get(table_name, [])
+        if table_name == LINEUPS_TABLE:
+            index_columns = get_lineup_player_columns(width=len(table.columns))
+        for column in index_columns:
+            if column in new_columns:
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {quote_identifier(f'{table_name}_{column}')} "
+                                   f"ON {quote_identifier(table_name)} ({quote_identifier(column)})")
+
+    def _get_table_columns(self, connection: sqlite3.Connection, table_name: str) -> list[str]:
+        return [row[1] for row in connection.execute(f"PRAGMA table_info({quote_identifier(table_name)})")]
+
+    def _get_sql_type(self, column: pd.Series) -> str:
+        if is_bool_dtype(column.dtype) or is_integer_dtype(column.dtype):
+            return "INTEGER"
+        if is_float_dtype(column.dtype):
+            return "REAL"
+        return "TEXT"
+
+    def _to_sql_values(self, column: pd.Series) -> list:
+        if is_bool_dtype(column.dtype) or is_integer_dtype(column.dtype) or is_float_dtype(column.dtype):
+            if not column.hasnans:
+                return column.tolist()
+        return column.astype(object).where(column.notna(), None).tolist()
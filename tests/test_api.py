@@ -0,0 +1,265 @@
+import gzip
+import os
+import pickle
+import time
+
+import pandas as pd
+import pytest
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from nba_api_wrapper.api import retry
+from nba_api_wrapper.api.api_calls import NBAApi
+from nba_api_wrapper.api.api_throttle import APIThrottle
+from nba_api_wrapper.api.decorators import retry_on_error
+from nba_api_wrapper.api.response_cache import ResponseCache
+from nba_api_wrapper.api.retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from nba_api_wrapper.generator import GameStorer
+
+
+class _Clock:
+    def __init__(self, now: float = 1000):
+        self.now = now
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(time, "time", clock.time)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def _http_error(status_code: int, headers: dict = None) -> requests.exceptions.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.exceptions.HTTPError(response=response)
+
+
+class _Endpoint:
+    def __init__(self, timeout, **parameters):
+        self.session = NBAStatsHTTP.get_session()
+        self.timeout = timeout
+        self.parameters = parameters
+
+
+def test_nba_api_session_is_installed_on_first_request(monkeypatch):
+    session = NBAStatsHTTP.get_session()
+    monkeypatch.setattr(NBAStatsHTTP, "_session", session)
+
+    nba_api = NBAApi()
+    GameStorer()
+    assert NBAStatsHTTP.get_session() is session
+
+    endpoint = nba_api._request(_Endpoint, game_id="0022100001")
+    assert endpoint.session is nba_api.session
+    assert endpoint.parameters == {"game_id": "0022100001"}
+
+
+def test_token_bucket_allows_a_burst_then_refills_at_a_steady_rate():
+    api_throttle = APIThrottle(interval_seconds=60, max_calls_per_interval=10, burst=3)
+
+    tokens, updated_at, wait_seconds = 3.0, 1000.0, []
+    for _ in range(5):
+        tokens, wait = api_throttle._reserve_token(tokens=tokens, updated_at=updated_at, current_time=1000.0)
+        wait_seconds.append(wait)
+    assert wait_seconds == pytest.approx([0, 0, 0, 6, 12])
+
+    tokens, wait = api_throttle._reserve_token(tokens=-2.0, updated_at=1000.0, current_time=1018.0)
+    assert (tokens, wait) == pytest.approx((0, 0))
+    tokens, wait = api_throttle._reserve_token(tokens=2.0, updated_at=1000.0, current_time=2000.0)
+    assert (tokens, wait) == pytest.approx((2, 0))
+
+
+def test_token_bucket_waits_one_refill_interval_per_call_after_the_burst(clock):
+    api_throttle = APIThrottle(interval_seconds=60, max_calls_per_interval=10, burst=3)
+
+    for _ in range(6):
+        api_throttle.acquire()
+
+    assert clock.sleeps == pytest.approx([6, 6, 6])
+
+
+def test_throttles_on_the_same_state_path_share_one_bucket(tmp_path, clock):
+    state_path = os.path.join(tmp_path, "throttle.db")
+    api_throttle = APIThrottle(interval_seconds=60, max_calls_per_interval=10, burst=2, state_path=state_path)
+    other_api_throttle = APIThrottle(interval_seconds=60, max_calls_per_interval=10, burst=2, state_path=state_path)
+    other_name_api_throttle = APIThrottle(interval_seconds=60, max_calls_per_interval=10, burst=2,
+                                          state_path=state_path, name="other")
+
+    api_throttle.acquire()
+    other_api_throttle.acquire()
+    other_name_api_throttle.acquire()
+    assert clock.sleeps == []
+
+    other_api_throttle.acquire()
+    api_throttle.acquire()
+    assert clock.sleeps == pytest.approx([6, 6])
+
+
+def test_retry_delay_backs_off_and_honours_retry_after(monkeypatch):
+    monkeypatch.setattr(retry.random, "random", lambda: 1.0)
+    retry_policy = RetryPolicy(base_delay_seconds=2, multiplier=2, max_delay_seconds=10, jitter=0.5)
+
+    assert [retry_policy.get_delay_seconds(attempt=attempt) for attempt in (1, 2, 3, 4)] == [1, 2, 4, 5]
+    assert retry_policy.get_delay_seconds(attempt=1, error=_http_error(429, {"Retry-After": "30"})) == 30
+    assert retry_policy.get_delay_seconds(attempt=4, error=_http_error(503, {"Retry-After": "1"})) == 5
+    assert retry_policy.get_delay_seconds(attempt=1, error=_http_error(503, {"Retry-After": "soon"})) == 1
+
+
+def test_retry_budget_is_limited_per_window(clock):
+    retry_policy = RetryPolicy(retry_budgets={"PlayByPlayV2": 2}, retry_budget_window_seconds=600)
+
+    assert retry_policy.consume_retry_budget(endpoint="PlayByPlayV2")
+    clock.now += 300
+    assert retry_policy.consume_retry_budget(endpoint="PlayByPlayV2")
+    assert not retry_policy.consume_retry_budget(endpoint="PlayByPlayV2")
+    assert retry_policy.consume_retry_budget(endpoint="GameRotation")
+
+    clock.now += 301
+    assert retry_policy.consume_retry_budget(endpoint="PlayByPlayV2")
+    assert not retry_policy.consume_retry_budget(endpoint="PlayByPlayV2")
+
+
+def test_circuit_breaker_reopens_with_doubled_cooldown_after_failed_trial(clock):
+    circuit_breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10, max_cooldown_seconds=25,
+                                     pause_when_open=False)
+    circuit_breaker.record_failure()
+    circuit_breaker.before_call()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open
+
+    for cooldown_seconds in (10, 20, 25):
+        clock.now += cooldown_seconds - 1
+        with pytest.raises(CircuitOpenError):
+            circuit_breaker.before_call()
+        clock.now += 1
+        circuit_breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            circuit_breaker.before_call()
+        circuit_breaker.record_failure()
+        assert circuit_breaker.is_open
+
+    clock.now += 25
+    circuit_breaker.before_call()
+    circuit_breaker.record_success()
+    assert not circuit_breaker.is_open
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    clock.now += 10
+    circuit_breaker.before_call()
+
+
+class _RetriedEndpoint:
+    def __init__(self, errors: list[Exception], failure_threshold: int = 2):
+        self.retry_policy = RetryPolicy(jitter=0)
+        self.circuit_breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown_seconds=10,
+                                              pause_when_open=False)
+        self.errors = errors
+        self.calls = 0
+
+    @retry_on_error(endpoint="PlayByPlayV2")
+    def request(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "response"
+
+
+def test_retry_on_error_retries_retryable_errors(clock):
+    endpoint = _RetriedEndpoint(errors=[requests.exceptions.Timeout(), _http_error(503)], failure_threshold=5)
+
+    assert endpoint.request() == "response"
+    assert endpoint.calls == 3
+    assert clock.sleeps == [2, 4]
+    assert not endpoint.circuit_breaker.is_open
+
+
+def test_retry_on_error_does_not_count_non_http_errors_as_success(clock):
+    endpoint = _RetriedEndpoint(errors=[requests.exceptions.Timeout(), KeyError("resultSets")])
+    endpoint.retry_policy.max_attempts = 1
+
+    with pytest.raises(requests.exceptions.Timeout):
+        endpoint.request()
+    with pytest.raises(KeyError):
+        endpoint.request()
+    endpoint.circuit_breaker.record_failure()
+    assert endpoint.circuit_breaker.is_open
+
+    clock.now += 10
+    endpoint.errors = [KeyError("resultSets")]
+    with pytest.raises(KeyError):
+        endpoint.request()
+    assert endpoint.circuit_breaker.is_open
+    assert endpoint.request() == "response"
+    assert not endpoint.circuit_breaker.is_open
+
+
+def test_retry_on_error_counts_non_retryable_http_responses_as_success(clock):
+    endpoint = _RetriedEndpoint(errors=[requests.exceptions.Timeout(), _http_error(404)])
+    endpoint.retry_policy.max_attempts = 1
+
+    with pytest.raises(requests.exceptions.Timeout):
+        endpoint.request()
+    with pytest.raises(requests.exceptions.HTTPError):
+        endpoint.request()
+    endpoint.circuit_breaker.record_failure()
+    assert not endpoint.circuit_breaker.is_open
+
+
+def test_response_cache_expires_league_game_finder_after_its_ttl(tmp_path, clock):
+    response_cache = ResponseCache(base_path=str(tmp_path))
+    parameters = {"min_date": "10/01/2021", "max_date": "06/01/2022"}
+    response_cache.set(endpoint="LeagueGameFinder", parameters=parameters, value=pd.DataFrame({"GAME_ID": ["1"]}))
+    response_cache.set(endpoint="PlayByPlayV2", parameters={"game_id": "1"}, value=pd.DataFrame({"EVENTNUM": [1]}))
+
+    clock.now += 6 * 60 * 60
+    assert response_cache.get(endpoint="LeagueGameFinder", parameters=parameters) is not None
+    clock.now += 1
+    assert response_cache.get(endpoint="LeagueGameFinder", parameters=parameters) is None
+    assert response_cache.get(endpoint="PlayByPlayV2", parameters={"game_id": "1"}) is not None
+    assert len([file_name for file_name in os.listdir(tmp_path) if file_name.endswith(".pickle.gz")]) == 1
+
+
+def test_response_cache_evicts_least_recently_accessed_entries(tmp_path, clock):
+    response_cache = ResponseCache(base_path=str(tmp_path), max_size_bytes=None)
+    response_cache.set(endpoint="PlayByPlayV2", parameters={"game_id": "1"}, value=pd.DataFrame({"EVENTNUM": [1]}))
+    clock.now += 1
+    response_cache.set(endpoint="PlayByPlayV2", parameters={"game_id": "2"},
+                       value=pd.DataFrame({"EVENTNUM": range(10000)}))
+    clock.now += 1
+    response_cache.get(endpoint="PlayByPlayV2", parameters={"game_id": "1"})
+    clock.now += 1
+
+    response_cache.max_size_bytes = sum(os.path.getsize(os.path.join(tmp_path, file_name))
+                                        for file_name in os.listdir(tmp_path) if file_name.endswith(".pickle.gz"))
+    response_cache.set(endpoint="PlayByPlayV2", parameters={"game_id": "3"}, value=pd.DataFrame({"EVENTNUM": [3]}))
+
+    assert response_cache.get(endpoint="PlayByPlayV2", parameters={"game_id": "1"}) is not None
+    assert response_cache.get(endpoint="PlayByPlayV2", parameters={"game_id": "2"}) is None
+    assert response_cache.get(endpoint="PlayByPlayV2", parameters={"game_id": "3"}) is not None
+
+
+@pytest.mark.parametrize("corrupt_content", [
+    b"not gzip",
+    gzip.compress(pickle.dumps(pd.DataFrame({"EVENTNUM": range(1000)})))[:100],
+    gzip.compress(b"not a pickle"),
+], ids=["not_gzip", "truncated", "not_pickle"])
+def test_response_cache_drops_corrupt_entries(tmp_path, corrupt_content):
+    response_cache = ResponseCache(base_path=str(tmp_path))
+    response_cache.set(endpoint="PlayByPlayV2", parameters={"game_id": "1"}, value=pd.DataFrame({"EVENTNUM": [1]}))
+    file_name = f"{ResponseCache.key(endpoint='PlayByPlayV2', parameters={'game_id': '1'})}.pickle.gz"
+    with open(os.path.join(tmp_path, file_name), "wb") as f:
+        f.write(corrupt_content)
+
+    assert response_cache.get(endpoint="PlayByPlayV2", parameters={"game_id": "1"}) is None
+    assert not os.path.exists(os.path.join(tmp_path, file_name))
@@ -0,0 +1,117 @@
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+
+import nba_api_wrapper.generator as generator
+from nba_api_wrapper.data_models import LGFDataNames, LineupPlayByPlaysNames, TeamInPlayLineupNames, ShotPlaysNames
+from nba_api_wrapper.datastructures import PlayByPlay
+from nba_api_wrapper.generator import GameStorer, _remap_lineup_ids
+from nba_api_wrapper.lineup_arrays import lineup_matrix_to_frame, to_lineup_matrix
+from nba_api_wrapper.lineup_registry import LineupRegistry
+from nba_api_wrapper.storer.file_storer import FileStorer
+
+LFG = LGFDataNames
+LPBP = LineupPlayByPlaysNames
+TIPL = TeamInPlayLineupNames
+SP = ShotPlaysNames
+
+GAME_IDS = ["0022100001", "0022100002", "0022100003", "0022100004"]
+
+
+class _BlockingNBAApi:
+
+    def __init__(self, first_game_id: str):
+        self.first_game_id = first_game_id
+        self.release = threading.Event()
+        self.fetched_game_ids = []
+
+    def get_league_game_finder_data(self, min_date: str, max_date: str) -> pd.DataFrame:
+        return pd.DataFrame({LFG.GAME_ID: GAME_IDS, LFG.TEAM_NAME: "Atlanta Hawks", LFG.GAME_DATE: "2021-10-19"})
+
+    def _fetch(self, game_id: str) -> str:
+        if game_id != self.first_game_id:
+            assert self.release.wait(timeout=10), "iter_games waited for the whole batch"
+        self.fetched_game_ids.append(game_id)
+        return game_id
+
+    def get_boxscore_by_game_id(self, game_id: str) -> str:
+        return self._fetch(game_id)
+
+    def boxscore_advanced_v2_by_game_id(self, game_id: str) -> str:
+        return self._fetch(game_id)
+
+    def get_play_by_play_by_game_id(self, game_id: str) -> str:
+        return self._fetch(game_id)
+
+    def get_rotations_by_game_id(self, game_id: str) -> str:
+        return self._fetch(game_id)
+
+
+def _transform_raw_game(raw_game, league_games, lineup_registry):
+    transformed_boxscore = SimpleNamespace(game_teams=None, game_players=None, game=raw_game.game_id)
+    play_by_play = SimpleNamespace(possessions=None, offense_player_play_by_plays=None,
+                                   defense_player_play_by_plays=None, possession_attempts=None, shot_plays=None)
+    return transformed_boxscore, play_by_play
+
+
+def test_iter_games_yields_concurrently_fetched_games_as_they_are_ready(tmp_path, monkeypatch):
+    monkeypatch.setattr(generator, "_transform_raw_game", _transform_raw_game)
+    nba_api = _BlockingNBAApi(first_game_id=GAME_IDS[0])
+    game_storer = GameStorer(storer=FileStorer(base_path=str(tmp_path)), nba_api=nba_api, store_frequency=4,
+                             concurrent_requests=4, supported_team_names=["Atlanta Hawks"])
+
+    games = game_storer.iter_games(min_date="2021-10-19", max_date="2021-10-20")
+    first_game = next(games)
+    assert first_game.game == GAME_IDS[0]
+    assert set(nba_api.fetched_game_ids) == {GAME_IDS[0]}
+
+    nba_api.release.set()
+    assert [first_game.game] + [collected_data.game for collected_data in games] == GAME_IDS
+
+
+def _transform_in_worker(lineup: tuple, lineup_opponent: tuple, next_lineup_id: int) -> tuple[PlayByPlay, pd.DataFrame]:
+    lineup_registry = LineupRegistry(next_lineup_id=next_lineup_id)
+    lineup_id = lineup_registry.get_or_add_lineup_id(lineup)
+    lineup_opponent_id = lineup_registry.get_or_add_lineup_id(lineup_opponent)
+    possessions = pd.DataFrame({LPBP.LINEUP_ID_OFFENSE: [lineup_id], LPBP.LINEUP_ID_DEFENSE: [lineup_opponent_id]})
+    play_by_play = PlayByPlay(
+        play_by_plays=pd.DataFrame(),
+        shot_plays=pd.DataFrame({SP.LINEUP_ID: [lineup_id], SP.LINEUP_ID_OPPONENT: [lineup_opponent_id]}),
+        team_rotations=[],
+        inplay_lineups=pd.DataFrame({TIPL.LINEUP_ID: [lineup_id], TIPL.LINEUP_ID_OPPONENT: [lineup_opponent_id]}),
+        possession_attempts=possessions,
+        offense_player_play_by_plays=pd.DataFrame(),
+        defense_player_play_by_plays=pd.DataFrame(),
+        possessions=possessions,
+        lineups=lineup_registry.to_frame(),
+    )
+    return play_by_play, lineup_registry.export_new_lineups()
+
+
+def test_games_transformed_in_flight_with_the_same_next_lineup_id_are_reconciled():
+    stored_lineup = (1, 2, 3, 4, 5)
+    lineup_registry = LineupRegistry(lineups=lineup_matrix_to_frame(lineup_ids=[1],
+                                                                    lineup_matrix=to_lineup_matrix([stored_lineup])))
+    next_lineup_id = lineup_registry.next_lineup_id
+
+    in_flight_games = [
+        ((stored_lineup, (6, 7, 8, 9, 10)), _transform_in_worker(stored_lineup, (6, 7, 8, 9, 10), next_lineup_id)),
+        (((11, 12, 13, 14, 15), (6, 7, 8, 9, 10)),
+         _transform_in_worker((11, 12, 13, 14, 15), (6, 7, 8, 9, 10), next_lineup_id)),
+    ]
+
+    for (lineup, lineup_opponent), (play_by_play, new_lineups) in in_flight_games:
+        play_by_play = _remap_lineup_ids(play_by_play=play_by_play,
+                                         lineup_id_map=lineup_registry.reconcile_lineups(lineups=new_lineups))
+        for frame, lineup_id_column, lineup_id_opponent_column in (
+                (play_by_play.possessions, LPBP.LINEUP_ID_OFFENSE, LPBP.LINEUP_ID_DEFENSE),
+                (play_by_play.possession_attempts, LPBP.LINEUP_ID_OFFENSE, LPBP.LINEUP_ID_DEFENSE),
+                (play_by_play.inplay_lineups, TIPL.LINEUP_ID, TIPL.LINEUP_ID_OPPONENT),
+                (play_by_play.shot_plays, SP.LINEUP_ID, SP.LINEUP_ID_OPPONENT)):
+            assert lineup_registry.get_lineup(frame[lineup_id_column].iloc[0]) == lineup
+            assert lineup_registry.get_lineup(frame[lineup_id_opponent_column].iloc[0]) == lineup_opponent
+
+    assert [lineup_registry.get_lineup_id(lineup) for lineup in
+            (stored_lineup, (6, 7, 8, 9, 10), (11, 12, 13, 14, 15))] == [1, 2, 3]
+    assert len(lineup_registry) == 3
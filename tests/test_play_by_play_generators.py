@@ -0,0 +1,281 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from nba_api_wrapper.data_models import LineupPlayByPlaysNames, PlayByPlay2Names, RotationNames, \
+    PlayerOffensePlayByPlaysNames, PlayerDefensePlayByPlaysNames
+from nba_api_wrapper.generators.play_by_play_generators import generate_possession_from_attempts, \
+    generate_possession_attempts, generate_inplay_lineups, add_seconds_played, classify_play_types, \
+    generate_offense_player_play_by_plays, generate_defense_player_play_by_plays
+from nba_api_wrapper.lineup_registry import LineupRegistry
+
+LPBP = LineupPlayByPlaysNames
+PBP = PlayByPlay2Names
+RN = RotationNames
+POPBP = PlayerOffensePlayByPlaysNames
+PDPBP = PlayerDefensePlayByPlaysNames
+
+H = 1610612737
+A = 1610612738
+
+PLAY_BY_PLAY_COLUMNS = [PBP.PERIOD, PBP.PCTIMESTRING, PBP.HOMEDESCRIPTION, PBP.NEUTRALDESCRIPTION,
+                        PBP.VISITORDESCRIPTION, PBP.SCORE, PBP.PLAYER1_ID, PBP.PLAYER1_TEAM_ID, PBP.PLAYER2_ID,
+                        PBP.PLAYER2_TEAM_ID, PBP.PLAYER3_ID, PBP.PLAYER3_TEAM_ID]
+
+PLAYS = [
+    (1, "12:00", None, "Start of 1st Period (7:39 PM EST)", None, None, 0, None, 0, None, 0, None),
+    (1, "12:00", "Jump Ball P1 vs. P11: Tip to P2", None, None, None, 1, H, 11, A, 2, H),
+    (1, "11:40", "P1 18' Jump Shot (2 PTS)", None, None, "0 - 2", 1, H, 0, None, 0, None),
+    (1, "11:20", None, None, "MISS P11 25' 3PT Jump Shot", None, 11, A, 0, None, 0, None),
+    (1, "11:18", "P2 REBOUND (Off:0 Def:1)", None, None, None, 2, H, 0, None, 0, None),
+    (1, "11:00", "MISS P3 12' Jump Shot", None, "P13 BLOCK (1 BLK)", None, 3, H, 0, None, 13, A),
+    (1, "10:58", "Hawks Rebound", None, None, None, H, None, 0, None, 0, None),
+    (1, "10:50", "P4 Driving Layup (2 PTS)", None, None, "0 - 4", 4, H, 0, None, 0, None),
+    (1, "10:50", None, None, "P12 S.FOUL (P1.T1) (B.Ref)", None, 12, A, 4, H, 0, None),
+    (1, "10:50", "P4 Free Throw 1 of 1 (3 PTS)", None, None, "0 - 5", 4, H, 0, None, 0, None),
+    (1, "10:30", "P2 STEAL (1 STL)", None, "P11 Bad Pass Turnover (P1.T1)", None, 11, A, 2, H, 0, None),
+    (1, "10:10", "MISS P1 3' Layup", None, None, None, 1, H, 0, None, 0, None),
+    (1, "10:08", None, None, "Celtics Rebound", None, A, None, 0, None, 0, None),
+    (1, "7:00", "SUB: P6 FOR P5", None, None, None, 5, H, 6, H, 0, None),
+    (1, "7:00", "P3 24' 3PT Jump Shot (3 PTS)", None, None, "0 - 8", 3, H, 0, None, 0, None),
+    (1, "6:40", None, None, "MISS P12 Free Throw 1 of 2", None, 12, A, 0, None, 0, None),
+    (1, "6:40", None, None, "P12 Free Throw 2 of 2 (1 PTS)", "1 - 8", 12, A, 0, None, 0, None),
+    (1, "6:20", "P6 Offensive Foul Turnover (P1.T1)", None, None, None, 6, H, 0, None, 0, None),
+    (1, "6:00", None, None, "MISS P14 10' Jump Shot", None, 14, A, 0, None, 0, None),
+    (1, "5:58", None, None, "P14 REBOUND (Off:1 Def:0)", None, 14, A, 0, None, 0, None),
+    (1, "5:50", None, None, "P14 Layup (2 PTS)", "3 - 8", 14, A, 0, None, 0, None),
+    (1, "0:00", None, "End of 1st Period (8:00 PM EST)", None, None, 0, None, 0, None, 0, None),
+    (5, "5:00", None, "Start of 1st OT (9:39 PM EST)", None, None, 0, None, 0, None, 0, None),
+    (5, "5:00", None, None, "P16 Layup (2 PTS)", "5 - 8", 16, A, 0, None, 0, None),
+    (5, "4:30", "MISS P6 20' Jump Shot", None, None, None, 6, H, 0, None, 0, None),
+    (5, "4:28", None, None, "P16 REBOUND (Off:0 Def:1)", None, 16, A, 0, None, 0, None),
+    (5, "0:00", None, "End of 1st OT (9:50 PM EST)", None, None, 0, None, 0, None, 0, None),
+]
+
+STINTS = [
+    (H, 1, 0, 3180), (H, 2, 0, 3180), (H, 3, 0, 3180), (H, 4, 0, 3180), (H, 5, 0, 300), (H, 6, 300, 3180),
+    (A, 11, 0, 3180), (A, 12, 0, 3180), (A, 13, 0, 3180), (A, 14, 0, 3180), (A, 15, 0, 2880), (A, 16, 2880, 3180),
+]
+
+EXPECTED_POSSESSION_IDS = [1, 1, 1, 2, 2, 3, 3, 3, 4, 4, 5, 6, 6, 7, 7, 8, 8, 9, 10, 10, 10, 11, 12, 12, 13, 13, 14]
+EXPECTED_POSSESSION_ATTEMPT_IDS = [1, 1, 1, 2, 3, 4, 5, 5, 6, 6, 7, 8, 9, 10, 10, 11, 12, 13, 14, 15, 15, 16, 17,
+                                   17, 18, 19, 20]
+
+POSSESSION_ATTEMPT_COLUMNS = [LPBP.TEAM_ID_OFFENSE, LPBP.TEAM_ID_DEFENSE, LPBP.POSSESSION_ID,
+                              LPBP.POSSESSION_ATTEMPT_ID, LPBP.LINEUP_ID_OFFENSE, LPBP.LINEUP_ID_DEFENSE,
+                              LPBP.SECONDS_PLAYED_START, LPBP.SECONDS_PLAYED_END, LPBP.FIELD_GOAL_ATTEMPTS,
+                              LPBP.FREE_THROW_ATTEMPTS, LPBP.POINTS, LPBP.SCORE_OFFENSE, LPBP.SCORE_DEFENSE,
+                              LPBP.PLAY_END_REASON]
+
+EXPECTED_POSSESSION_ATTEMPTS = [
+    (H, A, 1, 1, 1, 2, 0, 20, 1, 0, 2, 0, 0, "score"),
+    (A, H, 2, 2, 2, 1, 20, 40, 1, 0, 0, 0, 0, "miss"),
+    (A, H, 2, 3, 2, 1, 40, 42, 0, 0, 0, 0, 0, "rebound"),
+    (H, A, 3, 4, 1, 2, 42, 60, 1, 0, 0, 0, 0, "miss"),
+    (H, A, 3, 5, 1, 2, 60, 70, 1, 0, 2, 2, 0, "score"),
+    (H, A, 4, 6, 1, 2, 70, 70, 0, 1, 1, 4, 0, "score"),
+    (A, H, 5, 7, 2, 1, 70, 90, 0, 0, 0, 4, 0, "steal"),
+    (H, A, 6, 8, 1, 2, 90, 110, 1, 0, 0, 4, 0, "miss"),
+    (H, A, 6, 9, 1, 2, 110, 112, 0, 0, 0, 4, 0, "rebound"),
+    (H, A, 7, 10, 1, 2, 112, 300, 1, 0, 3, 5, 0, "score"),
+    (A, H, 8, 11, 2, 3, 300, 320, 0, 0, 0, 5, 0, "miss"),
+    (A, H, 8, 12, 2, 3, 320, 320, 0, 1, 1, 1, 8, "score"),
+    (H, A, 9, 13, 3, 2, 320, 340, 0, 0, 0, 1, 8, "turnover"),
+    (A, H, 10, 14, 2, 3, 340, 360, 1, 0, 0, 1, 8, "miss"),
+    (A, H, 10, 15, 2, 3, 360, 370, 1, 0, 2, 3, 8, "score"),
+    (A, H, 11, 16, 2, 3, 370, 720, 0, 0, 0, 3, 8, "end"),
+    (A, H, 12, 17, 2, 3, 720, 2880, 1, 0, 2, 5, 8, "score"),
+    (H, A, 13, 18, 3, 4, 2880, 2910, 1, 0, 0, 5, 8, "miss"),
+    (H, A, 13, 19, 3, 4, 2910, 2912, 0, 0, 0, 5, 8, "rebound"),
+    (H, A, 14, 20, 3, 4, 2912, 3180, 0, 0, 0, 5, 8, "end"),
+]
+
+
+def _play_by_plays(game_id: str) -> pd.DataFrame:
+    play_by_plays = pd.DataFrame(PLAYS, columns=PLAY_BY_PLAY_COLUMNS).astype(object)
+    play_by_plays = play_by_plays.where(play_by_plays.notna(), None)
+    play_by_plays.insert(0, PBP.EVENTNUM, range(1, len(play_by_plays) + 1))
+    play_by_plays.insert(0, PBP.GAME_ID, game_id)
+    return add_seconds_played(play_by_plays)
+
+
+def _team_rotations(game_id: str) -> list[pd.DataFrame]:
+    rotations = pd.DataFrame(STINTS, columns=[RN.TEAM_ID, RN.PERSON_ID, RN.IN_TIME_SECONDS_PLAYED,
+                                              RN.OUT_TIME_SECONDS_PLAYED])
+    rotations.insert(0, RN.GAME_ID, game_id)
+    return [rotations[rotations[RN.TEAM_ID] == team_id].reset_index(drop=True) for team_id in (H, A)]
+
+
+def _golden_game() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    inplay_lineups, lineups = generate_inplay_lineups(team_rotations=_team_rotations("0022100001"),
+                                                      lineup_registry=LineupRegistry())
+    possession_attempts, play_by_plays = generate_possession_attempts(
+        play_by_plays=_play_by_plays("0022100001"), inplay_lineups=inplay_lineups, home_team_id=H, away_team_id=A)
+    return play_by_plays, generate_possession_from_attempts(possession_attempts), lineups
+
+
+def _assert_matches_golden_game(possession_attempts: pd.DataFrame, play_by_plays: pd.DataFrame) -> None:
+    assert possession_attempts[POSSESSION_ATTEMPT_COLUMNS].astype(object).values.tolist() == \
+           [list(row) for row in EXPECTED_POSSESSION_ATTEMPTS]
+    assert play_by_plays[LPBP.POSSESSION_ID].tolist() == EXPECTED_POSSESSION_IDS
+    assert play_by_plays[LPBP.POSSESSION_ATTEMPT_ID].tolist() == EXPECTED_POSSESSION_ATTEMPT_IDS
+
+PLAY_TYPE_CASES = [
+    ("MISS P1 25' 3PT Jump Shot", None, "miss"),
+    ("MISS P1 Free Throw 1 of 2", "1 - 2", "miss"),
+    ("MISS P1 Jump Shot REBOUND", None, "miss"),
+    ("Instant Replay - Request: Ref", None, "instant replay"),
+    ("Instant Replay - Request: Ref", "1 - 2", "instant replay"),
+    ("P1 REBOUND (Off:0 Def:1)", None, "rebound"),
+    ("P1 REBOUND (Off:0 Def:1)", "1 - 2", "rebound"),
+    ("Hawks Rebound", None, "rebound"),
+    ("P1 18' 3PT Jump Shot (3 PTS)", "0 - 3", "score"),
+    ("P1 Free Throw 1 of 1 (1 PTS)", "0 - 1", "score"),
+    ("P1 P.FOUL (P1.T1) (B.Ref)", "1 - 2", "score"),
+    ("P1 18' Jump Shot (2 PTS)", None, None),
+    ("End of 1st Period (8:00 PM EST)", "10 - 12", "end"),
+    ("Start of 2nd Period (8:05 PM EST)", "10 - 12", "start"),
+    ("P1 S.FOUL (P1.T1) (B.Ref)", None, "defensive foul"),
+    ("P1 offensive foul", None, "offensive foul"),
+    ("P1 Bad Pass Turnover (P1.T2)", None, "turnover"),
+    ("Hawks Timeout: Regular (Reg.1 Short 0)", None, "timeout"),
+    ("P2 STEAL (1 STL)", None, "steal"),
+    ("P3 BLOCK (1 BLK)", None, "block"),
+    ("SUB: P6 FOR P5", None, "sub"),
+    ("Start of 1st Period (7:39 PM EST)", None, "start"),
+    ("End of 1st Period (8:00 PM EST)", None, "end"),
+    ("Jump Ball P1 vs. P11: Tip to P2", None, "jump ball"),
+    ("P1 Violation: Kicked Ball (B.Ref)", None, None),
+]
+
+
+def _possession_attempts(rows: list[dict]) -> pd.DataFrame:
+    defaults = {
+        LPBP.GAME_ID: "0022100001",
+        LPBP.TEAM_ID_OFFENSE: 1610612737,
+        LPBP.TEAM_ID_DEFENSE: 1610612738,
+        LPBP.POINTS: 0,
+        LPBP.FREE_THROW_ATTEMPTS: 0,
+        LPBP.FIELD_GOAL_ATTEMPTS: 1,
+        LPBP.SCORE_OFFENSE: 0,
+        LPBP.SCORE_DEFENSE: 0,
+    }
+    return pd.DataFrame([{**defaults, **row} for row in rows])
+
+
+def test_possession_spanning_substitution_keeps_first_seen_lineup():
+    possession_attempts = _possession_attempts([
+        {LPBP.POSSESSION_ID: 1, LPBP.LINEUP_ID_OFFENSE: 7, LPBP.LINEUP_ID_DEFENSE: 9,
+         LPBP.SECONDS_PLAYED_START: 10, LPBP.SECONDS_PLAYED_END: 20},
+        {LPBP.POSSESSION_ID: 1, LPBP.LINEUP_ID_OFFENSE: 3, LPBP.LINEUP_ID_DEFENSE: 9,
+         LPBP.SECONDS_PLAYED_START: 20, LPBP.SECONDS_PLAYED_END: 30},
+    ])
+
+    possessions = generate_possession_from_attempts(possession_attempts)
+
+    assert len(possessions) == 1
+    assert possessions[LPBP.LINEUP_ID_OFFENSE].tolist() == [7]
+    assert possessions[LPBP.SECONDS_PLAYED_START].tolist() == [10]
+
+
+def test_possessions_are_ordered_by_game_possession_and_teams():
+    possession_attempts = _possession_attempts([
+        {LPBP.GAME_ID: "0022100002", LPBP.POSSESSION_ID: 1, LPBP.LINEUP_ID_OFFENSE: 1, LPBP.LINEUP_ID_DEFENSE: 2,
+         LPBP.SECONDS_PLAYED_START: 0, LPBP.SECONDS_PLAYED_END: 10},
+        {LPBP.POSSESSION_ID: 2, LPBP.LINEUP_ID_OFFENSE: 5, LPBP.LINEUP_ID_DEFENSE: 6,
+         LPBP.SECONDS_PLAYED_START: 10, LPBP.SECONDS_PLAYED_END: 20},
+        {LPBP.POSSESSION_ID: 1, LPBP.LINEUP_ID_OFFENSE: 4, LPBP.LINEUP_ID_DEFENSE: 3,
+         LPBP.SECONDS_PLAYED_START: 0, LPBP.SECONDS_PLAYED_END: 10},
+    ])
+
+    possessions = generate_possession_from_attempts(possession_attempts)
+
+    assert possessions[LPBP.GAME_ID].astype(str).tolist() == ["0022100002", "0022100001", "0022100001"]
+    assert possessions[LPBP.POSSESSION_ID].tolist() == [1, 1, 2]
+
+
+def test_possession_attempts_match_golden_game():
+    inplay_lineups, _ = generate_inplay_lineups(team_rotations=_team_rotations("0022100001"),
+                                                lineup_registry=LineupRegistry())
+
+    possession_attempts, play_by_plays = generate_possession_attempts(
+        play_by_plays=_play_by_plays("0022100001"), inplay_lineups=inplay_lineups, home_team_id=H, away_team_id=A)
+
+    assert possession_attempts[LPBP.GAME_ID].astype(str).unique().tolist() == ["0022100001"]
+    _assert_matches_golden_game(possession_attempts, play_by_plays)
+
+
+def test_possession_attempts_for_stacked_games_match_golden_game():
+    game_ids = ["0022100001", "0022100002"]
+    inplay_lineups, _ = generate_inplay_lineups(
+        team_rotations=[rotation for game_id in game_ids for rotation in _team_rotations(game_id)],
+        lineup_registry=LineupRegistry())
+
+    possession_attempts, play_by_plays = generate_possession_attempts(
+        play_by_plays=pd.concat([_play_by_plays(game_id) for game_id in game_ids], ignore_index=True),
+        inplay_lineups=inplay_lineups, home_team_id={game_id: H for game_id in game_ids},
+        away_team_id={game_id: A for game_id in game_ids})
+
+    for game_id in game_ids:
+        _assert_matches_golden_game(possession_attempts[possession_attempts[LPBP.GAME_ID] == game_id],
+                                    play_by_plays[play_by_plays[PBP.GAME_ID] == game_id])
+
+
+@pytest.mark.parametrize("description,score,expected_play_type", PLAY_TYPE_CASES)
+def test_classify_play_types(description, score, expected_play_type):
+    play_by_plays = pd.DataFrame({PBP.HOMEDESCRIPTION: [description], PBP.VISITORDESCRIPTION: [None],
+                                  PBP.NEUTRALDESCRIPTION: [None], PBP.SCORE: [score]}, dtype=object)
+
+    play_by_plays = classify_play_types(play_by_plays)
+
+    for play_type_column in (PBP.PLAY_TYPE, PBP.HOME_PLAY_TYPE):
+        play_type = play_by_plays[play_type_column].iloc[0]
+        assert (None if pd.isna(play_type) else play_type) == expected_play_type
+    assert pd.isna(play_by_plays[PBP.VISITOR_PLAY_TYPE].iloc[0])
+
+
+def test_classify_play_types_prefers_home_then_visitor_then_neutral_description():
+    play_by_plays = pd.DataFrame({
+        PBP.HOMEDESCRIPTION: ["P2 STEAL (1 STL)", "", None],
+        PBP.VISITORDESCRIPTION: ["P11 Bad Pass Turnover (P1.T1)", "MISS P11 Layup", None],
+        PBP.NEUTRALDESCRIPTION: [None, None, "End of 1st Period (8:00 PM EST)"],
+        PBP.SCORE: [None, None, None],
+    }, dtype=object)
+
+    play_by_plays = classify_play_types(play_by_plays)
+
+    assert play_by_plays[PBP.DESCRIPTION].tolist() == ["P2 STEAL (1 STL)", "MISS P11 Layup",
+                                                       "End of 1st Period (8:00 PM EST)"]
+    assert play_by_plays[PBP.PLAY_TYPE].astype(object).tolist() == ["steal", "miss", "end"]
+    assert play_by_plays[PBP.VISITOR_PLAY_TYPE].astype(object).tolist()[:2] == ["turnover", "miss"]
+
+
+def test_player_play_by_plays_belong_to_their_side_of_the_possession():
+    play_by_plays, possessions, lineups = _golden_game()
+    team_player_ids = {team_id: {player_id for stint_team_id, player_id, _, _ in STINTS if stint_team_id == team_id}
+                       for team_id in (H, A)}
+
+    offense_player_play_by_plays = generate_offense_player_play_by_plays(play_by_plays, possessions, lineups)
+    defense_player_play_by_plays = generate_defense_player_play_by_plays(play_by_plays, possessions, lineups)
+
+    for player_play_by_plays, names, team_id_column in ((offense_player_play_by_plays, POPBP, LPBP.TEAM_ID_OFFENSE),
+                                                        (defense_player_play_by_plays, PDPBP, LPBP.TEAM_ID_DEFENSE)):
+        assert len(player_play_by_plays) == 5 * len(possessions)
+        possession_team_ids = player_play_by_plays[names.POSSESSION_ID].map(
+            possessions.set_index(LPBP.POSSESSION_ID)[team_id_column])
+        assert (player_play_by_plays[names.TEAM_ID] == possession_team_ids).all()
+        assert all(player_id in team_player_ids[team_id] for player_id, team_id in
+                   zip(player_play_by_plays[names.PLAYER_ID], player_play_by_plays[names.TEAM_ID]))
+
+
+def test_player_play_by_plays_warn_about_possessions_with_unknown_lineups(caplog):
+    play_by_plays, possessions, lineups = _golden_game()
+    possessions = possessions.copy()
+    possessions.loc[possessions.index[0], LPBP.LINEUP_ID_OFFENSE] = 999
+
+    with caplog.at_level(logging.WARNING):
+        offense_player_play_by_plays = generate_offense_player_play_by_plays(play_by_plays, possessions, lineups)
+
+    assert len(offense_player_play_by_plays) == 5 * (len(possessions) - 1)
+    assert "999" in caplog.text
@@ -0,0 +1,316 @@
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from nba_api_wrapper.data_models import GameNames, GameTeamNames, GamePlayerNames, LineupPlayByPlaysNames, \
+    PlayerOffensePlayByPlaysNames, PlayerDefensePlayByPlaysNames, LineupNames
+from nba_api_wrapper.datastructures import CollectedData
+from nba_api_wrapper.lineup_arrays import lineup_matrix_to_frame, to_lineup_matrix
+from nba_api_wrapper.lineup_registry import get_content_lineup_id
+from nba_api_wrapper.schemas import apply_schema, SCHEMAS
+from nba_api_wrapper.storer.base_storer import Storer
+from nba_api_wrapper.storer.file_storer import FileStorer, MIGRATION_SUFFIX
+from nba_api_wrapper.storer.parquet_storer import ParquetStorer, MANIFEST_FILE_NAME
+from nba_api_wrapper.storer.sql_scorer import SQLiteStorer
+
+G = GameNames
+GT = GameTeamNames
+GP = GamePlayerNames
+LPBP = LineupPlayByPlaysNames
+POPBP = PlayerOffensePlayByPlaysNames
+PDPBP = PlayerDefensePlayByPlaysNames
+LN = LineupNames
+
+HOME_TEAM_ID = 1610612737
+AWAY_TEAM_ID = 1610612738
+
+STORERS = {
+    "pickle": lambda path: FileStorer(base_path=str(path)),
+    "feather": lambda path: FileStorer(base_path=str(path), pickle=False),
+    "sqlite": lambda path: SQLiteStorer(database_path=os.path.join(path, "nba.db")),
+    "parquet": lambda path: ParquetStorer(base_path=str(path)),
+}
+
+
+def _collected_data(game_ids: list[str], possessions_per_game: int = 3, start_date: str = "2021-10-19",
+                    lineup_ids: tuple[int, int] = (1, 2)) -> CollectedData:
+    home_lineup_id, away_lineup_id = lineup_ids
+    possessions = pd.DataFrame([
+        {LPBP.GAME_ID: game_id, LPBP.POSSESSION_ID: possession_id,
+         LPBP.TEAM_ID_OFFENSE: HOME_TEAM_ID if possession_id % 2 else AWAY_TEAM_ID,
+         LPBP.TEAM_ID_DEFENSE: AWAY_TEAM_ID if possession_id % 2 else HOME_TEAM_ID,
+         LPBP.LINEUP_ID_OFFENSE: home_lineup_id if possession_id % 2 else away_lineup_id,
+         LPBP.LINEUP_ID_DEFENSE: away_lineup_id if possession_id % 2 else home_lineup_id,
+         LPBP.POINTS: possession_id % 3}
+        for game_id in game_ids for possession_id in range(1, possessions_per_game + 1)
+    ])
+    offense_player_play_by_plays = pd.DataFrame({
+        POPBP.GAME_ID: possessions[LPBP.GAME_ID],
+        POPBP.POSSESSION_ID: possessions[LPBP.POSSESSION_ID],
+        POPBP.TEAM_ID: possessions[LPBP.TEAM_ID_OFFENSE],
+        POPBP.PLAYER_ID: possessions[LPBP.TEAM_ID_OFFENSE].map({HOME_TEAM_ID: 1, AWAY_TEAM_ID: 6}),
+        POPBP.POINTS: possessions[LPBP.POINTS],
+    })
+    defense_player_play_by_plays = pd.DataFrame({
+        PDPBP.GAME_ID: possessions[LPBP.GAME_ID],
+        PDPBP.POSSESSION_ID: possessions[LPBP.POSSESSION_ID],
+        PDPBP.TEAM_ID: possessions[LPBP.TEAM_ID_DEFENSE],
+        PDPBP.PLAYER_ID: possessions[LPBP.TEAM_ID_DEFENSE].map({HOME_TEAM_ID: 2, AWAY_TEAM_ID: 7}),
+        PDPBP.REBOUNDS: 1,
+    })
+    return CollectedData(
+        possession_attempts=possessions,
+        shot_plays=pd.DataFrame(),
+        offense_player_play_by_plays=offense_player_play_by_plays,
+        defense_player_play_by_plays=defense_player_play_by_plays,
+        possessions=possessions,
+        game_teams=pd.DataFrame([
+            {GT.GAME_ID: game_id, GT.TEAM_ID: team_id, GT.SCORE: 100 + possessions_per_game}
+            for game_id in game_ids for team_id in (HOME_TEAM_ID, AWAY_TEAM_ID)
+        ]),
+        game_players=pd.DataFrame([
+            {GP.GAME_ID: game_id, GP.PLAYER_ID: player_id, GP.TEAM_ID: team_id, GP.POINTS: possessions_per_game}
+            for game_id in game_ids for player_id, team_id in ((1, HOME_TEAM_ID), (6, AWAY_TEAM_ID))
+        ]),
+        game=pd.DataFrame({G.GAME_ID: game_ids, G.START_DATE: start_date, G.MINUTES: 48.0, G.SEASON_ID: "22021"}),
+        lineups=lineup_matrix_to_frame(lineup_ids=list(lineup_ids),
+                                       lineup_matrix=to_lineup_matrix([(1, 2, 3, 4, 5), (6, 7, 8, 9, 10)])),
+    )
+
+
+def _normalize(frame: pd.DataFrame, sort_by: list[str]) -> pd.DataFrame:
+    frame = frame.astype({column: str for column in frame.columns
+                          if isinstance(frame[column].dtype, pd.CategoricalDtype) or frame[column].dtype == object})
+    return frame.sort_values(sort_by).reset_index(drop=True)
+
+
+def _assert_stored(loaded: pd.DataFrame, expected: pd.DataFrame, names: type) -> None:
+    sort_by = list(names.PRIMARY_KEY)
+    pd.testing.assert_frame_equal(_normalize(loaded[expected.columns], sort_by), _normalize(expected, sort_by),
+                                  check_dtype=False)
+
+
+@pytest.mark.parametrize("storer_name", STORERS)
+def test_store_round_trip(tmp_path, storer_name):
+    storer = STORERS[storer_name](tmp_path)
+    first = _collected_data(["0022100001", "0022100002"])
+    second = _collected_data(["0022100003"], start_date="2021-10-20")
+    storer.store(first)
+    storer.store(second)
+
+    storer = STORERS[storer_name](tmp_path)
+    _assert_stored(storer.load_games(), pd.concat([first.game, second.game]), G)
+    _assert_stored(storer.load_possessions(), pd.concat([first.possessions, second.possessions]), LPBP)
+    _assert_stored(storer.load_game_teams(), pd.concat([first.game_teams, second.game_teams]), GT)
+    _assert_stored(storer.load_game_players(), pd.concat([first.game_players, second.game_players]), GP)
+    _assert_stored(storer.load_offense_player_play_by_plays(),
+                   pd.concat([first.offense_player_play_by_plays, second.offense_player_play_by_plays]), POPBP)
+    _assert_stored(storer.load_defense_player_play_by_plays(),
+                   pd.concat([first.defense_player_play_by_plays, second.defense_player_play_by_plays]), PDPBP)
+    _assert_stored(storer.load_lineups(), first.lineups, LN)
+
+    _assert_stored(storer.load_possessions(game_ids=["0022100003"]), second.possessions, LPBP)
+
+
+def _apply_schemas(collected_data: CollectedData) -> CollectedData:
+    collected_data.possessions = apply_schema(collected_data.possessions, LPBP)
+    collected_data.game = apply_schema(collected_data.game, G)
+    return collected_data
+
+
+@pytest.mark.parametrize("storer_name", STORERS)
+def test_loaded_tables_keep_their_schema_dtypes(tmp_path, storer_name):
+    storer = STORERS[storer_name](tmp_path)
+    first = _apply_schemas(_collected_data(["0022100001"]))
+    second = _apply_schemas(_collected_data(["0022100002"], start_date="2021-10-20"))
+    storer.store(first)
+    storer.store(second)
+
+    storer = STORERS[storer_name](tmp_path)
+    for loaded, expected, names in (
+            (storer.load_possessions(), pd.concat([first.possessions, second.possessions]), LPBP),
+            (storer.load_games(), pd.concat([first.game, second.game]), G)):
+        assert loaded[expected.columns].dtypes.astype(str).to_dict() == {
+            column: SCHEMAS[names].get(column, str(dtype)) for column, dtype in expected.dtypes.items()}
+        assert sorted(loaded[names.GAME_ID].cat.categories) == ["0022100001", "0022100002"]
+        _assert_stored(loaded, expected, names)
+
+
+@pytest.mark.parametrize("storer_name", STORERS)
+def test_restoring_a_game_replaces_all_of_its_rows(tmp_path, storer_name):
+    storer = STORERS[storer_name](tmp_path)
+    storer.store(_collected_data(["0022100001", "0022100002"], possessions_per_game=3))
+    refetched = _collected_data(["0022100001"], possessions_per_game=1)
+    storer.store(refetched)
+
+    storer = STORERS[storer_name](tmp_path)
+    kept = _collected_data(["0022100002"], possessions_per_game=3)
+    _assert_stored(storer.load_games(), pd.concat([refetched.game, kept.game]), G)
+    _assert_stored(storer.load_possessions(), pd.concat([refetched.possessions, kept.possessions]), LPBP)
+    _assert_stored(storer.load_game_teams(), pd.concat([refetched.game_teams, kept.game_teams]), GT)
+    _assert_stored(storer.load_game_players(), pd.concat([refetched.game_players, kept.game_players]), GP)
+    _assert_stored(storer.load_offense_player_play_by_plays(),
+                   pd.concat([refetched.offense_player_play_by_plays, kept.offense_player_play_by_plays]), POPBP)
+    _assert_stored(storer.load_defense_player_play_by_plays(),
+                   pd.concat([refetched.defense_player_play_by_plays, kept.defense_player_play_by_plays]), PDPBP)
+    _assert_stored(storer.load_possessions(game_ids=["0022100001"]), refetched.possessions, LPBP)
+
+
+@pytest.mark.parametrize("storer_name", STORERS)
+def test_load_without_matching_games_returns_empty_table(tmp_path, storer_name):
+    storer = STORERS[storer_name](tmp_path)
+    collected_data = _collected_data(["0022100001"])
+    storer.store(collected_data)
+
+    possessions = storer.load_possessions(game_ids=["0022199999"])
+    assert len(possessions) == 0
+    assert list(possessions.columns) == list(collected_data.possessions.columns)
+
+
+def test_sqlite_storer_rejects_unknown_columns(tmp_path):
+    storer = SQLiteStorer(database_path=os.path.join(tmp_path, "nba.db"))
+    storer.store(_collected_data(["0022100001"]))
+
+    with pytest.raises(ValueError):
+        storer.load_possessions(columns=[LPBP.GAME_ID, "points; DROP TABLE possessions"])
+    assert len(storer.load_possessions(columns=[LPBP.GAME_ID])) == 3
+
+
+def test_storer_without_table_reads_only_fails_on_typed_loaders():
+    class GamesOnlyStorer(Storer):
+
+        def store(self, collected_data: CollectedData):
+            pass
+
+        def load_lineups(self) -> pd.DataFrame:
+            return pd.DataFrame()
+
+        def load_games(self) -> pd.DataFrame:
+            return pd.DataFrame({G.GAME_ID: []})
+
+    storer = GamesOnlyStorer()
+    assert len(storer.load_games()) == 0
+    with pytest.raises(NotImplementedError):
+        storer.load_possessions()
+
+
+def _content_lineup_ids() -> tuple[int, int]:
+    return get_content_lineup_id((1, 2, 3, 4, 5)), get_content_lineup_id((6, 7, 8, 9, 10))
+
+
+@pytest.mark.parametrize("storer_name", STORERS)
+def test_migrate_to_content_lineup_ids(tmp_path, storer_name):
+    storer = STORERS[storer_name](tmp_path)
+    first = _collected_data(["0022100001", "0022100002"])
+    second = _collected_data(["0022100003"], start_date="2021-10-20")
+    storer.store(first)
+    storer.store(second)
+    storer.store(_collected_data(["0022100001"], possessions_per_game=1))
+
+    storer.migrate_to_content_lineup_ids()
+    storer.migrate_to_content_lineup_ids()
+
+    storer = STORERS[storer_name](tmp_path)
+    lineup_ids = _content_lineup_ids()
+    migrated = _collected_data(["0022100001"], possessions_per_game=1, lineup_ids=lineup_ids)
+    kept = _collected_data(["0022100002"], lineup_ids=lineup_ids)
+    later = _collected_data(["0022100003"], start_date="2021-10-20", lineup_ids=lineup_ids)
+    _assert_stored(storer.load_lineups(), migrated.lineups, LN)
+    _assert_stored(storer.load_possessions(),
+                   pd.concat([migrated.possessions, kept.possessions, later.possessions]), LPBP)
+    assert list(storer.load_possessions().columns) == list(first.possessions.columns)
+    _assert_stored(storer.load_games(), pd.concat([migrated.game, kept.game, later.game]), G)
+
+
+def test_file_storer_finishes_interrupted_migration(tmp_path, monkeypatch):
+    storer = FileStorer(base_path=str(tmp_path))
+    collected_data = _collected_data(["0022100001"])
+    storer.store(collected_data)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(FileStorer, "_recover_migration", lambda self: False)
+        storer.migrate_to_content_lineup_ids()
+    assert os.path.exists(tmp_path / f"lineups.pickle{MIGRATION_SUFFIX}")
+    _assert_stored(storer.load_possessions(), collected_data.possessions, LPBP)
+
+    FileStorer(base_path=str(tmp_path)).migrate_to_content_lineup_ids()
+    migrated = _collected_data(["0022100001"], lineup_ids=_content_lineup_ids())
+    _assert_stored(storer.load_possessions(), migrated.possessions, LPBP)
+    _assert_stored(storer.load_lineups(), migrated.lineups, LN)
+    assert not os.path.exists(tmp_path / f"possessions.pickle{MIGRATION_SUFFIX}")
+
+
+def test_file_storer_discards_partially_staged_migration(tmp_path):
+    storer = FileStorer(base_path=str(tmp_path))
+    collected_data = _collected_data(["0022100001"])
+    storer.store(collected_data)
+    storer._write_file(collected_data.possessions.iloc[:1], path=storer._get_path("possessions") + MIGRATION_SUFFIX)
+
+    storer.store(_collected_data(["0022100002"]))
+    assert not os.path.exists(tmp_path / f"possessions.pickle{MIGRATION_SUFFIX}")
+    _assert_stored(storer.load_possessions(game_ids=["0022100001"]), collected_data.possessions, LPBP)
+
+
+@pytest.mark.parametrize("storer_name", STORERS)
+def test_loaded_tables_are_writable(tmp_path, storer_name):
+    storer = STORERS[storer_name](tmp_path)
+    storer.store(_collected_data(["0022100001", "0022100002"]))
+
+    for table in [storer.load_possessions(), storer.load_games(), storer.load_lineups()]:
+        for column in table.columns:
+            table.loc[0, column] = table[column].iloc[1]
+
+
+def test_feather_storer_can_return_read_only_memory_mapped_tables(tmp_path):
+    storer = FileStorer(base_path=str(tmp_path), pickle=False, writable=False)
+    storer.store(_collected_data(["0022100001"]))
+
+    possessions = storer.load_possessions()
+    with pytest.raises(ValueError):
+        possessions.loc[0, LPBP.POINTS] = 3
+
+
+def test_parquet_storer_ignores_partially_written_manifest_line(tmp_path):
+    storer = ParquetStorer(base_path=str(tmp_path))
+    first = _collected_data(["0022100001"])
+    storer.store(first)
+    with open(tmp_path / MANIFEST_FILE_NAME, "ab") as f:
+        f.write(b'{"part": 1, "files": [{"table": "ga')
+
+    storer = ParquetStorer(base_path=str(tmp_path))
+    _assert_stored(storer.load_games(), first.game, G)
+
+    second = _collected_data(["0022100002"])
+    storer.store(second)
+    _assert_stored(ParquetStorer(base_path=str(tmp_path)).load_games(), pd.concat([first.game, second.game]), G)
+
+
+def test_parquet_storers_on_the_same_base_path_take_turns_writing(tmp_path):
+    storer = ParquetStorer(base_path=str(tmp_path))
+    other_storer = ParquetStorer(base_path=str(tmp_path))
+    writing, release = threading.Event(), threading.Event()
+    write_file = storer._write_file
+
+    def _write_file_after_release(table: pd.DataFrame, path: str) -> None:
+        writing.set()
+        assert release.wait(timeout=10)
+        write_file(table, path=path)
+
+    storer._write_file = _write_file_after_release
+    first, second = _collected_data(["0022100001"]), _collected_data(["0022100002"])
+    store = threading.Thread(target=storer.store, args=(first,))
+    other_store = threading.Thread(target=other_storer.store, args=(second,))
+    store.start()
+    assert writing.wait(timeout=10)
+    other_store.start()
+    other_store.join(timeout=0.5)
+    release.set()
+    store.join()
+    other_store.join()
+
+    with open(tmp_path / MANIFEST_FILE_NAME, "rb") as f:
+        assert [json.loads(line)["part"] for line in f] == [0, 1]
+    _assert_stored(ParquetStorer(base_path=str(tmp_path)).load_games(), pd.concat([first.game, second.game]), G)